@@ -0,0 +1,115 @@
+# benchmarks/bench_bloat_finder.py
+#
+# Mide find_bloat sobre un proyecto sintético con dependencias pesadas
+# (node_modules, .venv, __pycache__, dist) y comprueba que los tamaños
+# coinciden con un recorrido secuencial de referencia (os.walk + matcher).
+#
+#     python -m benchmarks.bench_bloat_finder --packages 2000
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from typing import Dict
+
+from benchmarks.synthetic_trees import _touch, benchmark_root
+from src.core.ignore_matcher import GitignoreMatcher
+from src.core.use_cases import generate_gitignore_content
+from src.infrastructure.bloat_finder import find_bloat
+from src.infrastructure.template_loader import get_template_content
+
+
+def make_bloated_project(root: str, packages: int, files_per_package: int = 12) -> str:
+    """A Node + Python project carrying its dependencies and build outputs."""
+    os.makedirs(root, exist_ok=True)
+    _touch(os.path.join(root, 'package.json'), '{}')
+    _touch(os.path.join(root, 'requirements.txt'), 'django\n')
+    _touch(os.path.join(root, 'manage.py'))
+    for p in range(packages):
+        package = os.path.join(root, 'node_modules', f'pkg_{p}', 'lib')
+        os.makedirs(package)
+        for i in range(files_per_package):
+            _touch(os.path.join(package, f'f{i}.js'), 'x' * (p % 7 * 100 + i))
+    for p in range(packages // 10):
+        site = os.path.join(root, '.venv', 'lib', 'site-packages', f'mod_{p}')
+        os.makedirs(site)
+        _touch(os.path.join(site, '__init__.py'), 'y' * 500)
+    for app in range(20):
+        source = os.path.join(root, 'apps', f'app_{app}')
+        os.makedirs(os.path.join(source, '__pycache__'))
+        for i in range(10):
+            _touch(os.path.join(source, f'm{i}.py'), 'z' * 50)
+            _touch(os.path.join(source, '__pycache__', f'm{i}.cpython-312.pyc'), 'c' * 200)
+    os.makedirs(os.path.join(root, 'dist'))
+    _touch(os.path.join(root, 'dist', 'bundle.js'), 'b' * 100_000)
+    _touch(os.path.join(root, 'debug.log'), 'l' * 1234)
+    return root
+
+
+def reference_sizes(root: str, technologies) -> Dict[str, int]:
+    """Sequential reference: os.walk, pruning ignorable directories."""
+    matcher = GitignoreMatcher.from_text(generate_gitignore_content(technologies, get_template_content))
+    sizes: Dict[str, int] = {}
+    for current, dirs, files in os.walk(root):
+        relative_dir = os.path.relpath(current, root).replace(os.sep, '/')
+        relative_dir = '' if relative_dir == '.' else relative_dir
+        for name in list(dirs):
+            relative = f"{relative_dir}/{name}" if relative_dir else name
+            if name == '.git':
+                dirs.remove(name)
+            elif matcher.match(relative, True) is True:
+                dirs.remove(name)
+                total = 0
+                for sub, _, sub_files in os.walk(os.path.join(current, name)):
+                    total += sum(os.lstat(os.path.join(sub, f)).st_size for f in sub_files)
+                sizes[relative] = total
+        for name in files:
+            relative = f"{relative_dir}/{name}" if relative_dir else name
+            if matcher.match(relative, False) is True:
+                sizes[relative] = os.lstat(os.path.join(current, name)).st_size
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=2000)
+    parser.add_argument('--path', help='Mide un proyecto existente en lugar del sintético.')
+    args = parser.parse_args()
+
+    root = None
+    if args.path:
+        project = args.path
+    else:
+        root = benchmark_root()
+        project = make_bloated_project(os.path.join(root, 'project'), args.packages)
+    try:
+        results = {}
+        for label, workers in (('1 hilo', 1), ('paralelo', None)):
+            started = time.perf_counter()
+            report = find_bloat(project, top=10**9, max_workers=workers)
+            results[label] = (report, time.perf_counter() - started)
+            print(f"{label:>9}: {report.elapsed * 1000:8.1f} ms  "
+                  f"{report.entries} entradas, {report.directories_scanned} carpetas, "
+                  f"{report.offender_count} rutas, {report.total_size / 1e6:.1f} MB")
+
+        report = results['paralelo'][0]
+        started = time.perf_counter()
+        expected = reference_sizes(project, report.technologies)
+        reference_time = time.perf_counter() - started
+        print(f"referencia: {reference_time * 1000:8.1f} ms  (os.walk secuencial)")
+
+        found = {entry.path: entry.size for entry in report.offenders}
+        if found != expected or results['1 hilo'][0].total_size != report.total_size:
+            missing = set(expected) ^ set(found)
+            print(f"DIFERENCIAS: {sorted(missing)[:10]}", file=sys.stderr)
+            sys.exit(1)
+        print(f"OK: {len(found)} rutas, tamaños idénticos a la referencia "
+              f"({report.technologies})")
+    finally:
+        if root:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
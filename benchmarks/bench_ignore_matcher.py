@@ -0,0 +1,100 @@
+# benchmarks/bench_ignore_matcher.py
+#
+# Compara GitignoreMatcher con un bucle ingenuo de fnmatch sobre rutas
+# sintéticas, usando todas las plantillas combinadas como .gitignore.
+#
+#     python -m benchmarks.bench_ignore_matcher --paths 200000
+
+import argparse
+import fnmatch
+import random
+import time
+from typing import List, Tuple
+
+from src.core.ignore_matcher import GitignoreMatcher, parse_rule
+from src.infrastructure.template_loader import get_template_repository
+
+_COMPONENTS = [
+    'src', 'lib', 'app', 'tests', 'docs', 'node_modules', 'build', 'dist',
+    '__pycache__', '.venv', 'target', 'vendor', '.idea', 'assets', 'pkg',
+]
+_FILES = [
+    'main.py', 'mod.pyc', 'index.js', 'app.ts', 'lib.rs', 'main.go', 'App.java',
+    'Main.class', 'debug.log', '.env', '.DS_Store', 'data.db', 'README.md',
+    'package-lock.json', 'photo.png', 'notes.txt', 'build.o', 'x.swp',
+]
+
+
+def synthetic_paths(count: int, seed: int = 0) -> List[Tuple[str, bool]]:
+    """(path, is_dir) pairs resembling a mixed-stack project tree."""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        depth = rng.randint(0, 5)
+        parts = [rng.choice(_COMPONENTS) for _ in range(depth)]
+        if rng.random() < 0.15 and parts:
+            paths.append(('/'.join(parts), True))
+        else:
+            paths.append(('/'.join(parts + [rng.choice(_FILES)]), False))
+    return paths
+
+
+def naive_is_ignored(rules, path: str, is_dir: bool) -> bool:
+    """Reference loop: fnmatch every rule against the path and its parents."""
+    parts = path.split('/')
+    for depth in range(1, len(parts) + 1):
+        candidate = '/'.join(parts[:depth])
+        candidate_is_dir = is_dir or depth < len(parts)
+        decision = None
+        for rule in rules:
+            if rule.dir_only and not candidate_is_dir:
+                continue
+            target = candidate if rule.anchored else parts[depth - 1]
+            if fnmatch.fnmatchcase(target, rule.body):
+                decision = not rule.negated
+        if decision:
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--paths', type=int, default=200_000)
+    parser.add_argument('--naive-sample', type=int, default=5_000,
+                        help='Rutas evaluadas con el bucle ingenuo (es lento).')
+    args = parser.parse_args()
+
+    repo = get_template_repository()
+    text = '\n'.join(repo.get(name) for name in repo.names())
+    paths = synthetic_paths(args.paths)
+
+    started = time.perf_counter()
+    matcher = GitignoreMatcher.from_text(text)
+    compile_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ignored = matcher.filter_ignored(paths)
+    matcher_time = time.perf_counter() - started
+
+    rules = [r for r in (parse_rule(line) for line in text.splitlines()) if r]
+    sample = paths[:args.naive_sample]
+    started = time.perf_counter()
+    naive_ignored = [p for p, d in sample if naive_is_ignored(rules, p, d)]
+    naive_time = time.perf_counter() - started
+
+    naive_per_path = naive_time / max(1, len(sample))
+    matcher_per_path = matcher_time / max(1, len(paths))
+    print(f"Reglas: {len(matcher.rules)}  compilación: {compile_time * 1000:.1f} ms")
+    print(f"GitignoreMatcher: {len(paths)} rutas en {matcher_time:.3f} s "
+          f"({len(paths) / matcher_time:,.0f} rutas/s), {len(ignored)} ignoradas")
+    print(f"fnmatch ingenuo:  {len(sample)} rutas en {naive_time:.3f} s "
+          f"({len(sample) / naive_time:,.0f} rutas/s), {len(naive_ignored)} ignoradas")
+    print(f"Aceleración: x{naive_per_path / matcher_per_path:.0f}")
+
+    sample_ignored = set(p for p, d in sample if matcher.is_ignored(p, d))
+    agree = sample_ignored == set(naive_ignored)
+    print(f"Resultados idénticos en la muestra: {'sí' if agree else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_pattern_optimizer.py
+#
+# Verifica que la mezcla optimizada ignora exactamente las mismas rutas que
+# la concatenación original, para todos los pares de plantillas y varias
+# selecciones aleatorias, y muestra cuántas reglas elimina.
+#
+#     python -m benchmarks.bench_pattern_optimizer --random-selections 200
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from typing import List, Tuple
+
+from benchmarks.bench_ignore_matcher import synthetic_paths
+from src.core.ignore_matcher import GitignoreMatcher
+from src.core.pattern_optimizer import optimize_gitignore
+from src.core.use_cases import generate_gitignore_content
+from src.infrastructure.template_loader import get_template_repository
+
+
+def rule_paths(matcher: GitignoreMatcher) -> List[Tuple[str, bool]]:
+    """Paths built from the rules themselves, at the root and nested."""
+    paths = []
+    for rule in matcher.rules:
+        body = rule.body.replace('**/', '').replace('/**', '')
+        for candidate in {body, body.replace('*', 'x'), body.replace('*', '')}:
+            if not candidate or any(c in candidate for c in '?[\\'):
+                continue
+            for prefix in ('', 'src/', 'a/b/'):
+                paths.append((prefix + candidate, True))
+                paths.append((prefix + candidate, False))
+                paths.append((prefix + candidate + '/inner.txt', False))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--random-selections', type=int, default=100)
+    parser.add_argument('--paths', type=int, default=20_000)
+    args = parser.parse_args()
+
+    repo = get_template_repository()
+    names = repo.names()
+    rng = random.Random(0)
+    selections = [list(pair) for pair in itertools.combinations(names, 2)]
+    selections += [rng.sample(names, rng.randint(3, len(names)))
+                   for _ in range(args.random_selections)]
+    selections.append(names)
+    corpus = synthetic_paths(args.paths)
+
+    total_rules = total_removed = mismatches = 0
+    optimize_time = 0.0
+    for selection in selections:
+        text = generate_gitignore_content(selection, repo.get)
+        started = time.perf_counter()
+        result = optimize_gitignore(text)
+        optimize_time += time.perf_counter() - started
+
+        original = GitignoreMatcher.from_text(text)
+        optimized = GitignoreMatcher.from_text(result.text)
+        total_rules += len(original.rules)
+        total_removed += result.removed_count
+        for path, is_dir in corpus + rule_paths(original):
+            if original.is_ignored(path, is_dir) != optimized.is_ignored(path, is_dir):
+                mismatches += 1
+                print(f"DIFERENCIA {selection}: {path} (dir={is_dir})", file=sys.stderr)
+
+    print(f"Selecciones: {len(selections)}  reglas: {total_rules}  "
+          f"eliminadas: {total_removed} ({total_removed / max(1, total_rules):.1%})")
+    print(f"Optimización: {optimize_time / len(selections) * 1000:.2f} ms por selección")
+    full = optimize_gitignore(generate_gitignore_content(names, repo.get))
+    print(f"Todas las plantillas: {full.removed_count} reglas eliminadas")
+    print(f"Resultados idénticos: {'sí' if mismatches == 0 else f'NO ({mismatches} diferencias)'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
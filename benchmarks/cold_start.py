@@ -0,0 +1,137 @@
+# benchmarks/cold_start.py
+#
+# Mide el arranque en frío, cada vez en un proceso nuevo:
+#
+#   * core: importar lo que la ventana necesita para dibujarse (catálogo,
+#     índice de búsqueda, generador, resaltado) y construir el catálogo,
+#     con las plantillas sueltas y con el paquete de plantillas.
+#   * ventana: lanzar la app (o el ejecutable con --exe) hasta que dibuja la
+#     primera ventana, vía GITIGNORE_GENIUS_STARTUP_PROBE (ver main.py):
+#     tiempo de import de la GUI, primera ventana y tiempo total de pared.
+#
+#     python -m benchmarks.cold_start --runs 5
+#     python -m benchmarks.cold_start --exe dist/GitIgnoreGenius.exe
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from src.infrastructure.template_pack import PACK_ENV_VAR
+from tools.build_template_pack import build
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET_SECONDS = 1.0
+
+# Lo mismo que importa src/interface/app.py antes de crear la ventana,
+# sin customtkinter ni tkinterdnd2.
+CORE_SNIPPET = """
+import json, sys, time
+started = time.perf_counter()
+from src.infrastructure.template_catalog import build_search_index, build_template_catalog
+from src.infrastructure.template_loader import get_template_content, get_template_version
+from src.core.use_cases import IncrementalGitignoreGenerator
+from src.interface.syntax_highlighting import HIGHLIGHT_TAGS, tag_ranges
+imported = time.perf_counter()
+build_search_index(build_template_catalog())
+print(json.dumps({
+    "import_s": imported - started,
+    "catalog_s": time.perf_counter() - imported,
+    "rules_imported": "src.infrastructure.file_analyzer" in sys.modules,
+}))
+"""
+
+
+def _median(samples: List[dict], key: str) -> float:
+    return statistics.median(sample[key] for sample in samples) * 1000
+
+
+def measure_core(runs: int, pack_path: Optional[str]) -> List[dict]:
+    env = dict(os.environ)
+    env.pop(PACK_ENV_VAR, None)
+    if pack_path:
+        env[PACK_ENV_VAR] = pack_path
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", CORE_SNIPPET], cwd=ROOT, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        sample = json.loads(output)
+        sample["process_s"] = time.perf_counter() - started
+        samples.append(sample)
+    return samples
+
+
+def measure_window(runs: int, command: List[str], pack_path: Optional[str],
+                   timeout: float) -> List[dict]:
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as directory:
+            probe = os.path.join(directory, "startup.json")
+            env = dict(os.environ, GITIGNORE_GENIUS_STARTUP_PROBE=probe)
+            if pack_path:
+                env[PACK_ENV_VAR] = pack_path
+            started = time.perf_counter()
+            process = subprocess.run(command, cwd=ROOT, env=env, capture_output=True,
+                                     text=True, timeout=timeout)
+            wall = time.perf_counter() - started
+            if not os.path.exists(probe):
+                error = (process.stderr.strip().splitlines() or ["sin salida"])[-1]
+                raise RuntimeError(f"la app no llegó a dibujar la ventana: {error}")
+            with open(probe, encoding='utf-8') as f:
+                sample = json.load(f)
+        sample["wall_s"] = wall
+        samples.append(sample)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de GitIgnore Genius.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--exe', help='Ejecutable compilado a medir en lugar de main.py.')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pack_path = os.path.join(directory, "templates.pack")
+        build(pack_path, os.path.join(ROOT, "src", "infrastructure", "templates"))
+
+        print("core (imports de la ventana + catálogo), mediana de "
+              f"{args.runs} procesos:")
+        results: Dict[str, List[dict]] = {}
+        for label, pack in (("sueltas", None), ("paquete", pack_path)):
+            samples = measure_core(args.runs, pack)
+            results[label] = samples
+            print(f"  {label:>8}: import {_median(samples, 'import_s'):6.1f} ms  "
+                  f"catálogo {_median(samples, 'catalog_s'):5.1f} ms  "
+                  f"proceso {_median(samples, 'process_s'):6.1f} ms  "
+                  f"reglas importadas: {samples[0]['rules_imported']}")
+
+        command = [args.exe] if args.exe else [sys.executable, os.path.join(ROOT, "main.py")]
+        # El ejecutable usa el paquete que lleva dentro; main.py, el recién generado.
+        window_pack = None if args.exe else pack_path
+        try:
+            samples = measure_window(args.runs, command, window_pack, args.timeout)
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"ventana: no medida ({e})")
+            return
+
+    first_window = _median(samples, 'first_window_s')
+    wall = _median(samples, 'wall_s')
+    print(f"ventana ({'exe' if args.exe else 'main.py'}), mediana de {args.runs} arranques:")
+    print(f"  import GUI {_median(samples, 'import_s'):6.1f} ms  "
+          f"primera ventana {first_window:6.1f} ms  total (pared) {wall:6.1f} ms")
+    verdict = "OK" if wall / 1000 < TARGET_SECONDS else "POR ENCIMA"
+    print(f"  objetivo < {TARGET_SECONDS:.0f} s: {verdict}")
+    sys.exit(0 if verdict == "OK" else 1)
+
+
+if __name__ == '__main__':
+    main()
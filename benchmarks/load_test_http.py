@@ -0,0 +1,114 @@
+# benchmarks/load_test_http.py
+#
+# Prueba de carga del modo servidor (python main.py serve). Lanza el
+# servidor en un subproceso (o usa --url) y N procesos cliente, cada uno con
+# una conexión keep-alive, que piden selecciones aleatorias durante unos
+# segundos. Una parte de las peticiones repite el ETag recibido (304).
+#
+#     python -m benchmarks.load_test_http --clients 8 --duration 10
+
+import argparse
+import http.client
+import multiprocessing
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from src.infrastructure.template_loader import get_template_repository
+
+
+def _selections(count: int, seed: int = 0) -> List[str]:
+    names = get_template_repository().names()
+    rng = random.Random(seed)
+    return [','.join(rng.sample(names, rng.randint(1, 6))) for _ in range(count)]
+
+
+def _client(args: Tuple[str, List[str], float, float, bool, int]) -> Tuple[int, Dict[int, int], List[float]]:
+    url, selections, duration, conditional_ratio, use_gzip, seed = args
+    target = urlsplit(url)
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(target.hostname, target.port, timeout=10)
+    etags: Dict[str, str] = {}
+    statuses: Dict[int, int] = {}
+    latencies: List[float] = []
+    count = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        selection = rng.choice(selections)
+        headers = {"Accept-Encoding": "gzip"} if use_gzip else {}
+        if selection in etags and rng.random() < conditional_ratio:
+            headers["If-None-Match"] = etags[selection]
+        started = time.perf_counter()
+        conn.request("GET", f"/api/{selection}", headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        if response.getheader("ETag"):
+            etags[selection] = response.getheader("ETag")
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        count += 1
+    conn.close()
+    return count, statuses, latencies
+
+
+def _start_server() -> Tuple[subprocess.Popen, str]:
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "serve", "--port", "0"],
+        stderr=subprocess.PIPE, text=True
+    )
+    line = process.stderr.readline()
+    match = re.search(r"http://([\d.]+):(\d+)", line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"No se pudo iniciar el servidor: {line}")
+    return process, f"http://{match.group(1)}:{match.group(2)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Servidor ya iniciado (por defecto se lanza uno).")
+    parser.add_argument("--clients", type=int, default=4, help="Procesos cliente concurrentes.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Segundos de carga.")
+    parser.add_argument("--selections", type=int, default=200,
+                        help="Selecciones distintas que se piden (afecta al acierto del LRU).")
+    parser.add_argument("--conditional", type=float, default=0.3,
+                        help="Fracción de peticiones repetidas con If-None-Match.")
+    parser.add_argument("--no-gzip", action="store_true")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = _start_server()
+    try:
+        selections = _selections(args.selections)
+        jobs = [(url, selections, args.duration, args.conditional, not args.no_gzip, seed)
+                for seed in range(args.clients)]
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(_client, jobs)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    total = sum(count for count, _, _ in results)
+    statuses: Dict[int, int] = {}
+    for _, client_statuses, _ in results:
+        for status, count in client_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    latencies = sorted(l for _, _, client_latencies in results for l in client_latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+
+    print(f"{url}  clientes: {args.clients}  duración: {args.duration:.0f}s")
+    print(f"Peticiones: {total}  ({total / args.duration:,.0f} req/s)")
+    print(f"Latencia: p50 {statistics.median(latencies) * 1000:.2f} ms  p99 {p99 * 1000:.2f} ms")
+    print("Estados: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
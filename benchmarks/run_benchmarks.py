@@ -0,0 +1,205 @@
+# benchmarks/run_benchmarks.py
+#
+# Suite de benchmarks del analizador y el generador. Mide cada etapa por
+# separado y de punta a punta sobre árboles sintéticos, y compara contra
+# una línea base guardada (benchmarks/baselines.json, versionada): falla
+# (código 1) si alguna etapa empeora más que el umbral y más que el piso de
+# ruido en ms absolutos, y (código 2) si no hay línea base o le falta
+# alguna de las etapas medidas. Cada ejecución mide también una etapa de
+# calibración (Python puro) y escala los tiempos de la base por lo que
+# ésta cambió, para absorber la frecuencia de la CPU y la carga del
+# equipo. Una línea base de otra máquina sólo avisa.
+#
+#     python -m benchmarks.run_benchmarks                   # medir y comparar
+#     python -m benchmarks.run_benchmarks --save-baseline   # fijar la línea base
+#     python -m benchmarks.run_benchmarks --only detect     # sólo algunas etapas
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic_trees import build_trees, remove_trees
+from src.core.use_cases import IncrementalGitignoreGenerator, generate_gitignore_content
+from src.infrastructure.file_analyzer import detect_technologies
+from src.infrastructure.template_loader import TemplateRepository
+from src.infrastructure.tree_scanner import scan_tree
+from src.interface.syntax_highlighting import tag_ranges
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+DEFAULT_THRESHOLD = 0.30
+# Diferencias por debajo de esto (ms) son ruido del temporizador en las
+# etapas de décimas de milisegundo, por grande que sea el porcentaje.
+DEFAULT_NOISE_FLOOR_MS = 0.5
+
+
+def calibration_workload():
+    """Fixed pure-Python work (hashing, sorting, string ops) used as the unit of speed."""
+    words = [f"{i * 7919 % 10007:05d}/src/module_{i % 97}.py" for i in range(20000)]
+    words.sort()
+    return sum(len(w.split('/')) for w in words if w.endswith('.py'))
+
+
+def machine_description() -> str:
+    return f"{platform.system()} {platform.machine()} / Python {platform.python_version()}"
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Median wall time of 'repeat' calls, in milliseconds (after one warm-up)."""
+    func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def define_stages(trees: Dict[str, str]) -> Dict[str, Callable[[], object]]:
+    repository = TemplateRepository()
+    names = repository.names()
+    repository.warm_up()
+    selection = names[:25]
+    big_output = generate_gitignore_content(names, repository.get)
+    big_lines = big_output.split('\n')
+
+    generator = IncrementalGitignoreGenerator(repository.get, repository.version)
+    toggle = {'on': False}
+
+    def incremental_toggle():
+        toggle['on'] = not toggle['on']
+        generator.generate(selection + ([names[-1]] if toggle['on'] else []))
+
+    def highlight_full():
+        tag_ranges(big_lines)
+
+    # Lo mismo que App.update_ui_with_result: el textbox conserva la salida
+    # anterior, se le aplican los last_edits del generador y sólo se
+    # resaltan las líneas insertadas.
+    editor_generator = IncrementalGitignoreGenerator(repository.get, repository.version)
+    editor = {'lines': editor_generator.generate(selection).split('\n'), 'on': False}
+
+    def highlight_incremental():
+        editor['on'] = not editor['on']
+        editor_generator.generate(selection + ([names[-1]] if editor['on'] else []))
+        lines = editor['lines']
+        for edit in editor_generator.last_edits:
+            inserted = edit.text.split('\n')[:-1]
+            lines[edit.line:edit.line + edit.delete] = inserted
+            if inserted:
+                tag_ranges(inserted, edit.line + 1)
+
+    def end_to_end():
+        detected, _ = detect_technologies(trees['mixed'])
+        text = generate_gitignore_content(detected, repository.get)
+        tag_ranges(text.split('\n'))
+
+    return {
+        'detect.flat_10k': lambda: detect_technologies(trees['flat_10k']),
+        'detect.mixed': lambda: detect_technologies(trees['mixed']),
+        'scan_tree.monorepo': lambda: scan_tree(trees['monorepo'], time_limit=None),
+        'templates.get_all': lambda: [repository.get(n) for n in names],
+        'generate.all_templates': lambda: generate_gitignore_content(names, repository.get),
+        'generate.incremental_toggle': incremental_toggle,
+        'highlight.full': highlight_full,
+        'highlight.incremental_edit': highlight_incremental,
+        'end_to_end.mixed': end_to_end,
+    }
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            threshold: float, noise_floor_ms: float = DEFAULT_NOISE_FLOOR_MS) -> List[str]:
+    """
+    Names of the stages slower than baseline * (1 + threshold) by more
+    than 'noise_floor_ms' milliseconds.
+    """
+    return [stage for stage, value in results.items()
+            if stage in baseline and value > baseline[stage] * (1 + threshold)
+            and value - baseline[stage] > noise_floor_ms]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks de GitIgnore Genius.')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Empeoramiento relativo tolerado (0.30 = 30%%).')
+    parser.add_argument('--noise-floor', type=float, default=DEFAULT_NOISE_FLOOR_MS,
+                        help='Empeoramiento absoluto (ms) por debajo del cual no hay regresión.')
+    parser.add_argument('--only', nargs='*', default=None,
+                        help='Prefijos de las etapas a ejecutar.')
+    args = parser.parse_args(argv)
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        print(f"No hay línea base en {args.baseline}: genérala con --save-baseline.",
+              file=sys.stderr)
+        return 2
+
+    trees = build_trees()
+    try:
+        stages = define_stages(trees)
+        if args.only:
+            stages = {k: v for k, v in stages.items()
+                      if any(k.startswith(prefix) for prefix in args.only)}
+        # Antes y después de las etapas: se queda con la más rápida.
+        calibration = measure(calibration_workload, args.repeat)
+        results = {name: measure(func, args.repeat) for name, func in stages.items()}
+        calibration = min(calibration, measure(calibration_workload, args.repeat))
+    finally:
+        remove_trees(trees)
+
+    baseline, baseline_machine = {}, None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            data = json.load(f)
+        baseline, baseline_machine = data.get('stages', {}), data.get('machine')
+        baseline_calibration = data.get('calibration_ms')
+        if baseline_calibration:
+            # Base expresada en la velocidad de esta ejecución.
+            scale = calibration / baseline_calibration
+            print(f"calibración {calibration:.3f} ms (base {baseline_calibration:.3f} ms, "
+                  f"escala x{scale:.2f})")
+            baseline = {name: value * scale for name, value in baseline.items()}
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        reference = baseline.get(name)
+        delta = f"{(value / reference - 1) * 100:+6.1f}%" if reference else "   (sin base)"
+        print(f"{name:<{width}}  {value:10.3f} ms  {delta}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'machine': machine_description(),
+                'calibration_ms': calibration,
+                'stages': {**baseline, **results},
+            }, f, indent=2, sort_keys=True)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+
+    missing = [name for name in results if name not in baseline]
+    if missing:
+        # Una etapa sin base nunca fallaría: se trata como error, no como pase.
+        print(f"Etapas sin línea base: {', '.join(missing)} (usa --save-baseline)",
+              file=sys.stderr)
+        return 2
+
+    regressions = compare(results, baseline, args.threshold, args.noise_floor)
+    if not regressions:
+        return 0
+    summary = f"(> {args.threshold:.0%} y > {args.noise_floor} ms): {', '.join(regressions)}"
+    if baseline_machine != machine_description():
+        # Tiempos absolutos de otra máquina: no son comparables, sólo orientan.
+        print(f"AVISO: línea base de otra máquina ({baseline_machine}); "
+              f"más lento {summary}", file=sys.stderr)
+        return 0
+    print(f"REGRESIÓN {summary}", file=sys.stderr)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
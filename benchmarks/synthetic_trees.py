@@ -0,0 +1,108 @@
+# benchmarks/synthetic_trees.py
+#
+# Generadores de árboles de proyecto sintéticos para los benchmarks. Se
+# crean en tmpfs (/dev/shm) cuando está disponible, para medir CPU y
+# llamadas al sistema y no la velocidad del disco.
+
+import os
+import random
+import shutil
+import tempfile
+from typing import Callable, Dict
+
+
+def benchmark_root() -> str:
+    """A fresh temporary directory, on tmpfs when the platform has one."""
+    shm = '/dev/shm'
+    base = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None
+    return tempfile.mkdtemp(prefix='gig-bench-', dir=base)
+
+
+def _touch(path: str, content: str = ''):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def make_flat_tree(root: str, files: int = 10_000, seed: int = 0) -> str:
+    """A single folder with 'files' entries plus a few manifests."""
+    rng = random.Random(seed)
+    extensions = ['.txt', '.md', '.json', '.png', '.csv', '.log', '.py', '.js']
+    for i in range(files):
+        _touch(os.path.join(root, f'file_{i}{rng.choice(extensions)}'))
+    for manifest in ('package.json', 'requirements.txt', '.env'):
+        _touch(os.path.join(root, manifest), '{}')
+    return root
+
+
+def make_monorepo(root: str, services: int = 60, files_per_dir: int = 40,
+                  depth: int = 3, seed: int = 0) -> str:
+    """
+    A deep monorepo: services/*/ in several stacks, each with nested
+    source folders and a heavy node_modules that the scan must prune.
+    """
+    rng = random.Random(seed)
+    stacks = [
+        ('go.mod', '.go'), ('Cargo.toml', '.rs'), ('package.json', '.ts'),
+        ('requirements.txt', '.py'), ('pom.xml', '.java'), ('composer.json', '.php'),
+    ]
+    for s in range(services):
+        manifest, ext = rng.choice(stacks)
+        service = os.path.join(root, 'services', f'svc_{s}')
+        current = service
+        for level in range(depth):
+            os.makedirs(current, exist_ok=True)
+            for i in range(files_per_dir):
+                _touch(os.path.join(current, f'mod_{level}_{i}{ext}'))
+            current = os.path.join(current, f'pkg_{level}')
+        _touch(os.path.join(service, manifest), '{}')
+        if manifest == 'package.json':
+            modules = os.path.join(service, 'node_modules', 'dep')
+            os.makedirs(modules, exist_ok=True)
+            for i in range(files_per_dir * 5):
+                _touch(os.path.join(modules, f'm{i}.js'))
+    os.makedirs(os.path.join(root, 'web', 'src'), exist_ok=True)
+    _touch(os.path.join(root, 'web', 'package.json'), '{}')
+    _touch(os.path.join(root, 'web', 'tsconfig.json'), '{}')
+    os.makedirs(os.path.join(root, 'ml'), exist_ok=True)
+    _touch(os.path.join(root, 'ml', 'requirements.txt'), 'numpy\n')
+    return root
+
+
+def make_mixed_repo(root: str, files: int = 500, seed: int = 0) -> str:
+    """A top-level folder mixing many stacks, IDE folders and secrets."""
+    rng = random.Random(seed)
+    for name in ('package.json', 'tsconfig.json', 'Cargo.toml', 'go.mod',
+                 'requirements.txt', 'manage.py', 'composer.json', 'Gemfile',
+                 'pubspec.yaml', 'angular.json', '.env', '.env.local', 'app.db'):
+        _touch(os.path.join(root, name), '{}')
+    for folder in ('.idea', '.vscode', 'prisma', 'public', 'src'):
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+    _touch(os.path.join(root, 'public', 'index.html'))
+    _touch(os.path.join(root, 'src', 'index.js'))
+    extensions = ['.py', '.ts', '.go', '.rs', '.php', '.kt', '.swift', '.cpp']
+    for i in range(files):
+        _touch(os.path.join(root, 'src', f'unit_{i}{rng.choice(extensions)}'))
+    return root
+
+
+TREES: Dict[str, Callable[[str], str]] = {
+    'flat_10k': make_flat_tree,
+    'monorepo': make_monorepo,
+    'mixed': make_mixed_repo,
+}
+
+
+def build_trees() -> Dict[str, str]:
+    """Creates every synthetic tree under a fresh root; returns name -> path."""
+    root = benchmark_root()
+    paths = {}
+    for name, factory in TREES.items():
+        path = os.path.join(root, name)
+        os.makedirs(path)
+        paths[name] = factory(path)
+    paths['_root'] = root
+    return paths
+
+
+def remove_trees(paths: Dict[str, str]):
+    shutil.rmtree(paths['_root'], ignore_errors=True)
@@ -1,7 +1,53 @@
 # main.py
 
-from src.interface.app import App
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+# Si está definida, la app escribe sus tiempos de arranque en ese archivo
+# (JSON) en cuanto dibuja la primera ventana, y se cierra: la usa
+# benchmarks/cold_start.py, también contra el ejecutable compilado.
+STARTUP_PROBE_ENV = "GITIGNORE_GENIUS_STARTUP_PROBE"
+
+# Sólo estos argumentos llevan al modo CLI (src/interface/cli.py). Cualquier
+# otro (p.ej. una carpeta soltada sobre el .exe) abre la GUI: en el build
+# --noconsole no hay stdout/stderr donde argparse pueda mostrar un error.
+CLI_COMMANDS = frozenset({"analyze", "watch", "bloat", "serve"})
+CLI_FLAGS = frozenset({"-h", "--help"})
+
+
+def _wants_cli(argv) -> bool:
+    return len(argv) > 1 and (argv[1] in CLI_COMMANDS or argv[1] in CLI_FLAGS)
+
+
+def _report_startup(app, probe_path: str, imported: float):
+    import json
+    app.update()  # fuerza el primer dibujado de la ventana
+    with open(probe_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "import_s": imported - STARTED,
+            "first_window_s": time.perf_counter() - STARTED,
+        }, f)
+    app.on_close()
+
 
 if __name__ == "__main__":
+    if _wants_cli(sys.argv):
+        # Modo headless: no importa la GUI (customtkinter, tkinterdnd2, pyperclip).
+        from src.interface.cli import main
+        sys.exit(main(sys.argv[1:]))
+
+    import os
+    from src.interface.app import App
+    imported = time.perf_counter()
     app = App()
-    app.mainloop()
\ No newline at end of file
+    if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]):
+        # Carpeta pasada al ejecutable (o soltada sobre él): se analiza al abrir.
+        project_path = os.path.abspath(sys.argv[1])
+        app.after_idle(lambda: app.process_project_path(project_path))
+    probe_path = os.environ.get(STARTUP_PROBE_ENV)
+    if probe_path:
+        _report_startup(app, probe_path, imported)
+    else:
+        app.mainloop()
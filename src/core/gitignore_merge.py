@@ -0,0 +1,192 @@
+# src/core/gitignore_merge.py
+
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from src.core.use_cases import render_header, render_section
+
+# Formato que emite generate_gitignore_content:
+#   # Generated by GitIgnore Genius          <- cabecera (3 líneas + línea vacía)
+#   # Selected technologies: A, B
+#   #=====...
+#
+#   # Begin: A                               <- una sección por tecnología
+#   #-----...
+#   <plantilla>
+#
+SECTION_PREFIX = "# Begin: "
+HEADER_FIRST_LINE = "# Generated by GitIgnore Genius"
+
+
+class ParsedSection(NamedTuple):
+    technology: str
+    text: str       # desde '# Begin:' hasta la siguiente sección o el final
+
+
+class ParsedGitignore(NamedTuple):
+    has_header: bool
+    preamble: str                   # líneas propias antes de la primera sección
+    sections: List[ParsedSection]
+    newline: str = '\n'             # fin de línea del archivo ('\n' o '\r\n')
+
+
+class MergeResult(NamedTuple):
+    text: str
+    added: List[str]
+    removed: List[str]
+    updated: List[str]      # secciones existentes cuyo contenido cambió
+    unchanged: List[str]
+    newline: str = '\n'     # fin de línea del archivo original, usado en 'text'
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.updated)
+
+
+def detect_newline(text: str) -> str:
+    """'\r\n' if most lines of 'text' end in CRLF (e.g. Windows + autocrlf), else '\n'."""
+    crlf = text.count('\r\n')
+    return '\r\n' if crlf and crlf * 2 >= text.count('\n') else '\n'
+
+
+def normalize_newlines(text: str) -> str:
+    return text.replace('\r\n', '\n')
+
+
+def with_newline(text: str, newline: str) -> str:
+    """Converts LF-only 'text' to the given line ending."""
+    return text.replace('\n', newline) if newline != '\n' else text
+
+
+def _is_section_start(lines: List[str], i: int) -> bool:
+    return (lines[i].startswith(SECTION_PREFIX)
+            and i + 1 < len(lines) and lines[i + 1].startswith("#-"))
+
+
+def parse_gitignore(text: str) -> ParsedGitignore:
+    """
+    Splits a .gitignore into header, preamble and '# Begin: <tech>' sections.
+    The parts are returned with '\n' line endings; the file's own ending is
+    kept in 'newline'.
+    """
+    newline = detect_newline(text)
+    lines = normalize_newlines(text).splitlines(keepends=True)
+    i = 0
+    has_header = False
+    if (len(lines) >= 3 and lines[0].rstrip('\r\n') == HEADER_FIRST_LINE
+            and lines[1].startswith("# Selected technologies:") and lines[2].startswith("#=")):
+        has_header = True
+        i = 3
+        if i < len(lines) and not lines[i].strip():
+            i += 1
+
+    start = i
+    while i < len(lines) and not _is_section_start(lines, i):
+        i += 1
+    preamble = ''.join(lines[start:i])
+
+    sections: List[ParsedSection] = []
+    while i < len(lines):
+        begin = i
+        technology = lines[i][len(SECTION_PREFIX):].strip()
+        i += 2
+        while i < len(lines) and not _is_section_start(lines, i):
+            i += 1
+        sections.append(ParsedSection(technology, ''.join(lines[begin:i])))
+    return ParsedGitignore(has_header, preamble, sections, newline)
+
+
+def _custom_lines(old_section: str, rendered: Optional[str]) -> List[str]:
+    """
+    Rules of an existing section that the current template does not have:
+    lines written by hand inside or right after the section. They are kept
+    (after the section) so an update never loses them.
+    """
+    template_lines = set(line.rstrip() for line in (rendered or '').splitlines())
+    custom = []
+    for line in old_section.splitlines()[2:]:
+        stripped = line.rstrip()
+        if stripped and not stripped.startswith('#') and stripped not in template_lines:
+            custom.append(stripped)
+    return custom
+
+
+def _with_custom(rendered: str, custom: List[str]) -> str:
+    if not custom:
+        return rendered
+    return rendered + '\n'.join(custom) + '\n\n'
+
+
+def merge_gitignore(
+    existing_text: str,
+    selected_technologies: List[str],
+    template_loader_func: Callable[[str], str],
+) -> MergeResult:
+    """
+    Updates an existing .gitignore to 'selected_technologies' in place.
+
+    Sections whose template did not change are kept byte for byte; changed
+    ones are re-rendered; deselected ones are removed and new ones are
+    appended after the last section. Everything that is not part of a
+    generated section (a hand-written preamble, rules added inside or
+    after a section) is preserved. Files without any section keep their
+    whole content and get the new sections appended. Sections are compared
+    with normalized line endings and the result keeps the file's own
+    ending, so an unchanged CRLF file comes back byte for byte.
+
+    Raises:
+        FileNotFoundError: If a template file cannot be found by the loader.
+    """
+    parsed = parse_gitignore(existing_text)
+    wanted = list(dict.fromkeys(selected_technologies))
+    wanted_set = set(wanted)
+
+    added: List[str] = []
+    removed: List[str] = []
+    updated: List[str] = []
+    unchanged: List[str] = []
+    parts: List[Tuple[str, Optional[str]]] = []     # (texto, tecnología)
+    seen = set()
+
+    for section in parsed.sections:
+        tech = section.technology
+        if tech in wanted_set and tech not in seen:
+            seen.add(tech)
+            rendered = render_section(tech, template_loader_func(tech))
+            if section.text == rendered:
+                unchanged.append(tech)
+                parts.append((section.text, tech))
+                continue
+            new_text = _with_custom(rendered, _custom_lines(section.text, rendered))
+            (unchanged if new_text == section.text else updated).append(tech)
+            parts.append((new_text, tech))
+        else:
+            # Sección desmarcada (o repetida): sólo sobreviven las líneas propias.
+            removed.append(tech)
+            template = None
+            try:
+                template = render_section(tech, template_loader_func(tech))
+            except FileNotFoundError:
+                pass
+            custom = _custom_lines(section.text, template)
+            if custom:
+                parts.append(('\n'.join(custom) + '\n\n', None))
+
+    for tech in wanted:
+        if tech not in seen:
+            added.append(tech)
+            parts.append((render_section(tech, template_loader_func(tech)), tech))
+
+    has_sections = any(tech is not None for _, tech in parts)
+    preamble = parsed.preamble
+    if preamble and has_sections and not parsed.sections and not preamble.endswith('\n\n'):
+        # .gitignore escrito a mano: separa sus reglas de las secciones nuevas.
+        preamble = preamble.rstrip('\n') + '\n\n'
+
+    header = ''
+    if has_sections and (parsed.has_header or not existing_text.strip()):
+        header = render_header([tech for _, tech in parts if tech is not None])
+
+    text = with_newline(header + preamble + ''.join(part for part, _ in parts), parsed.newline)
+    if not parsed.sections and not added:
+        text = existing_text
+    return MergeResult(text, added, removed, updated, unchanged, parsed.newline)
@@ -0,0 +1,261 @@
+# src/core/ignore_matcher.py
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Motor de patrones .gitignore. Semántica implementada (la de git):
+#   - Líneas vacías y comentarios ('#') se ignoran; '\#' y '\!' escapan.
+#   - Espacios finales se eliminan salvo que estén escapados ('\ ').
+#   - '!' niega el patrón; gana la ÚLTIMA regla que coincide.
+#   - '/' final: sólo directorios. '/' al inicio o en medio: anclado a la
+#     raíz; si no, el patrón se compara con el nombre a cualquier nivel.
+#   - '*', '?', '[...]' no cruzan '/'; '**/', '/**' y '/**/' como en git.
+#   - Si un directorio está ignorado, nada de su interior puede re-incluirse.
+
+_GLOB_CHARS = set('*?[\\')
+
+
+class IgnoreRule(NamedTuple):
+    """One compiled line of a .gitignore."""
+    index: int
+    pattern: str        # línea original (sin espacios finales)
+    negated: bool
+    dir_only: bool
+    anchored: bool
+    body: str           # patrón sin '!', sin '/' inicial ni final
+    regex: str          # expresión regular sobre la ruta relativa completa
+
+    def matches(self, path: str, is_dir: bool = False) -> bool:
+        """Matches this single rule (no precedence, no parent handling)."""
+        if self.dir_only and not is_dir:
+            return False
+        return re.fullmatch(self.regex, path) is not None
+
+
+def _strip_trailing_spaces(line: str) -> str:
+    while line.endswith(' ') and not line.endswith('\\ '):
+        line = line[:-1]
+    return line
+
+
+def _translate_segment(segment: str) -> str:
+    """Translates one path segment of a glob into a regex (never crosses '/')."""
+    out: List[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        if c == '*':
+            while i + 1 < n and segment[i + 1] == '*':
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(segment[i]))
+        elif c == '[':
+            j = i + 1
+            if j < n and segment[j] in '!^':
+                j += 1
+            if j < n and segment[j] == ']':
+                j += 1
+            while j < n and segment[j] != ']':
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                stuff = segment[i + 1:j]
+                if stuff[:1] in ('!', '^'):
+                    stuff = '^' + stuff[1:]
+                stuff = stuff.replace('\\', '\\\\')
+                out.append(f'[{stuff}]')
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def glob_to_regex(body: str, anchored: bool) -> str:
+    """Translates a normalized pattern body into a regex over relative paths."""
+    parts = body.split('/')
+    if not anchored:
+        return '(?:.*/)?' + _translate_segment(parts[0])
+
+    regex = ''
+    last = len(parts) - 1
+    for idx, part in enumerate(parts):
+        if part == '**':
+            if last == 0:
+                regex += '.*'
+            elif idx == 0:
+                regex += '(?:.*/)?'
+            elif idx == last:
+                regex += '/.*'
+            else:
+                regex += '(?:/.*)?/'
+            continue
+        if idx > 0 and parts[idx - 1] != '**':
+            regex += '/'
+        regex += _translate_segment(part)
+    return regex
+
+
+def parse_rule(line: str, index: int = 0) -> Optional[IgnoreRule]:
+    """Parses one .gitignore line; returns None for blanks and comments."""
+    line = line.rstrip('\r\n')
+    if not line.strip() or line.startswith('#'):
+        return None
+    line = _strip_trailing_spaces(line)
+    original = line
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+
+    dir_only = line.endswith('/') and not line.endswith('\\/')
+    if dir_only:
+        line = line.rstrip('/')
+    anchored = '/' in line
+    body = line.lstrip('/')
+    if not body:
+        return None
+    return IgnoreRule(index, original, negated, dir_only, anchored, body,
+                      glob_to_regex(body, anchored))
+
+
+def _literal(body: str) -> Optional[str]:
+    return body if not (_GLOB_CHARS & set(body)) else None
+
+
+def _extension(body: str) -> Optional[str]:
+    """'.ext' for unanchored '*.ext' patterns without other glob chars."""
+    if body.startswith('*.') and '/' not in body and not (_GLOB_CHARS & set(body[1:])):
+        return body[1:]
+    return None
+
+
+class GitignoreMatcher:
+    """
+    A .gitignore compiled for bulk evaluation.
+
+    Rules are split into fast paths: unanchored literal names and '*.ext'
+    patterns live in hash tables keyed by basename / extension, anchored
+    literal paths in a table keyed by path, and everything else in one
+    combined regex whose alternatives are ordered from the last rule to
+    the first, so the first alternative that matches is the winning rule.
+    Each query is a few dict lookups plus at most one regex match.
+    """
+
+    def __init__(self, rules: List[IgnoreRule]):
+        self.rules = rules
+        # clave -> [(índice de regla, sólo directorios)]
+        self._names: Dict[str, List[Tuple[int, bool]]] = {}
+        self._extensions: Dict[str, List[Tuple[int, bool]]] = {}
+        self._paths: Dict[str, List[Tuple[int, bool]]] = {}
+        regex_rules: List[IgnoreRule] = []
+
+        for rule in rules:
+            literal = _literal(rule.body)
+            extension = _extension(rule.body) if not rule.anchored else None
+            if literal is not None and not rule.anchored:
+                self._names.setdefault(literal, []).append((rule.index, rule.dir_only))
+            elif literal is not None:
+                self._paths.setdefault(literal, []).append((rule.index, rule.dir_only))
+            elif extension is not None:
+                self._extensions.setdefault(extension, []).append((rule.index, rule.dir_only))
+            else:
+                regex_rules.append(rule)
+
+        self._file_regex, self._file_groups = self._combine(
+            [r for r in regex_rules if not r.dir_only])
+        self._dir_regex, self._dir_groups = self._combine(regex_rules)
+        self._dir_cache: Dict[str, bool] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> "GitignoreMatcher":
+        return cls.from_lines(text.splitlines())
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "GitignoreMatcher":
+        rules: List[IgnoreRule] = []
+        for line in lines:
+            rule = parse_rule(line, len(rules))
+            if rule is not None:
+                rules.append(rule)
+        return cls(rules)
+
+    @staticmethod
+    def _combine(rules: List[IgnoreRule]):
+        """One regex with a capture group per rule, last rule first."""
+        if not rules:
+            return None, []
+        ordered = sorted(rules, key=lambda r: r.index, reverse=True)
+        pattern = '|'.join(f'({r.regex})' for r in ordered)
+        # Grupos de captura internos no existen: _translate_segment no los
+        # genera, así que el grupo N corresponde a ordered[N - 1].
+        return re.compile(pattern), [r.index for r in ordered]
+
+    # --- Consultas ---
+
+    def winning_rule(self, path: str, is_dir: bool = False) -> Optional[IgnoreRule]:
+        """The last rule matching 'path' itself (parents not considered)."""
+        best = -1
+        basename = path.rsplit('/', 1)[-1]
+
+        for table, key in ((self._names, basename), (self._paths, path)):
+            for index, dir_only in table.get(key, ()):
+                if index > best and (is_dir or not dir_only):
+                    best = index
+
+        dot = basename.find('.')
+        while dot != -1:
+            for index, dir_only in self._extensions.get(basename[dot:], ()):
+                if index > best and (is_dir or not dir_only):
+                    best = index
+            dot = basename.find('.', dot + 1)
+
+        regex, groups = (self._dir_regex, self._dir_groups) if is_dir else \
+                        (self._file_regex, self._file_groups)
+        if regex is not None:
+            m = regex.fullmatch(path)
+            if m is not None and groups[m.lastindex - 1] > best:
+                best = groups[m.lastindex - 1]
+        return self.rules[best] if best >= 0 else None
+
+    def match(self, path: str, is_dir: bool = False) -> Optional[bool]:
+        """
+        Decision of the rules for 'path' itself: True (ignored), False
+        (re-included by a negation) or None (no rule matches).
+        """
+        rule = self.winning_rule(path, is_dir)
+        return None if rule is None else not rule.negated
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """
+        True if git would ignore 'path' (relative, '/'-separated), taking
+        ignored parent directories into account. Directory results are
+        cached, so evaluating many paths under the same folders is cheap.
+        """
+        path = path.strip('/')
+        slash = path.rfind('/')
+        if slash != -1 and self._dir_ignored(path[:slash]):
+            return True
+        if is_dir:
+            return self._dir_ignored(path)
+        return self.match(path, False) is True
+
+    def _dir_ignored(self, path: str) -> bool:
+        cached = self._dir_cache.get(path)
+        if cached is None:
+            slash = path.rfind('/')
+            cached = (slash != -1 and self._dir_ignored(path[:slash])) or \
+                     self.match(path, True) is True
+            self._dir_cache[path] = cached
+        return cached
+
+    def filter_ignored(self, paths: Iterable[Tuple[str, bool]]) -> List[str]:
+        """Returns the paths of (path, is_dir) pairs that would be ignored."""
+        return [path for path, is_dir in paths if self.is_ignored(path, is_dir)]
@@ -0,0 +1,122 @@
+# src/core/pattern_optimizer.py
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.core.ignore_matcher import GitignoreMatcher, IgnoreRule, parse_rule
+
+# Una regla anterior nunca decide nada si otra POSTERIOR coincide con todas
+# las rutas con las que coincide ella: gana la última regla que coincide,
+# sea cual sea su signo. Eliminar esas reglas no cambia ninguna decisión
+# (ni siquiera las de re-inclusión con '!'), sólo hace el archivo más corto.
+
+_ANY_DEPTH = '(?:.*/)?'
+
+
+class RemovedRule(NamedTuple):
+    line_number: int    # 1-based, en el texto original
+    pattern: str
+    reason: str         # 'duplicate' | 'subsumed'
+    kept_pattern: str   # regla posterior que la cubre
+
+
+class OptimizationResult(NamedTuple):
+    text: str
+    removed: List[RemovedRule]
+
+    @property
+    def removed_count(self) -> int:
+        return len(self.removed)
+
+
+def _has_glob(body: str) -> bool:
+    return any(c in body for c in '*?[\\')
+
+
+def _basename_segment(rule: IgnoreRule) -> Optional[str]:
+    """
+    The single-segment regex of rules that match a basename at any depth
+    ('name', '*.log', '**/name'), else None.
+    """
+    if rule.regex.startswith(_ANY_DEPTH) and '/' not in rule.regex[len(_ANY_DEPTH):]:
+        return rule.regex[len(_ANY_DEPTH):]
+    return None
+
+
+def optimize_gitignore(text: str) -> OptimizationResult:
+    """
+    Removes the rules of a .gitignore that can never be the winning rule:
+
+    - duplicates: an identical rule (same compiled regex and directory
+      flag, after normalizing trailing spaces, leading '**/' and the like)
+      appears later, with either sign;
+    - subsumed literals: a literal path or name ('/build', 'Thumbs.db')
+      that a later, broader rule ('build', '*.db', 'build/' for a
+      directory-only literal) also matches everywhere it applies.
+
+    Comments, blank lines and every other rule are kept in place, so the
+    result ignores exactly the same paths as the input.
+    """
+    lines = text.splitlines(keepends=True)
+    parsed: List[Tuple[int, IgnoreRule]] = []
+    for line_index, line in enumerate(lines):
+        rule = parse_rule(line, len(parsed))
+        if rule is not None:
+            parsed.append((line_index, rule))
+    rules = [rule for _, rule in parsed]
+
+    # Última aparición de cada regla normalizada.
+    last_by_key: Dict[Tuple[str, bool], int] = {}
+    for rule in rules:
+        last_by_key[(rule.regex, rule.dir_only)] = rule.index
+
+    # Matchers de referencia: todas las reglas (para rutas literales
+    # ancladas) y sólo las que comparan el nombre a cualquier profundidad
+    # (para nombres literales sin anclar).
+    full = GitignoreMatcher(rules)
+    basename_rules = [
+        rule._replace(index=i) for i, rule in enumerate(
+            r for r in rules if _basename_segment(r) is not None
+        )
+    ]
+    basename_origin = [r.index for r in rules if _basename_segment(r) is not None]
+    by_basename = GitignoreMatcher(basename_rules)
+
+    def covered_after(matcher: GitignoreMatcher, origin: Optional[List[int]],
+                      rule: IgnoreRule, path: str) -> Optional[IgnoreRule]:
+        """A later rule matching 'path' for every type 'rule' applies to."""
+        winners = []
+        for is_dir in ((True,) if rule.dir_only else (True, False)):
+            winner = matcher.winning_rule(path, is_dir)
+            if winner is None:
+                return None
+            index = origin[winner.index] if origin is not None else winner.index
+            if index <= rule.index:
+                return None
+            winners.append(rules[index])
+        return min(winners, key=lambda r: r.index)
+
+    removed: List[RemovedRule] = []
+    drop = set()
+    for line_index, rule in parsed:
+        last = last_by_key[(rule.regex, rule.dir_only)]
+        if last != rule.index:
+            removed.append(RemovedRule(line_index + 1, rule.pattern, 'duplicate',
+                                       rules[last].pattern))
+            drop.add(line_index)
+            continue
+        if _has_glob(rule.body):
+            continue
+
+        if rule.anchored and _basename_segment(rule) is None:
+            cover = covered_after(full, None, rule, rule.body)
+        elif not rule.anchored:
+            cover = covered_after(by_basename, basename_origin, rule, rule.body)
+        else:
+            cover = None
+        if cover is not None:
+            removed.append(RemovedRule(line_index + 1, rule.pattern, 'subsumed',
+                                       cover.pattern))
+            drop.add(line_index)
+
+    optimized = ''.join(line for i, line in enumerate(lines) if i not in drop)
+    return OptimizationResult(optimized, removed)
@@ -0,0 +1,117 @@
+# src/core/template_search.py
+
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+# Cuántos candidatos por trigramas se re-puntúan con SequenceMatcher.
+FUZZY_CANDIDATES = 40
+# Similitud mínima para aceptar un resultado aproximado (errores de tipeo).
+FUZZY_MIN_RATIO = 0.8
+
+
+class SearchEntry(NamedTuple):
+    """A searchable template: its name, category and alternative names."""
+    name: str
+    category: str
+    aliases: Tuple[str, ...] = ()
+
+
+class SearchResult(NamedTuple):
+    entry: SearchEntry
+    score: float
+    matched: str        # término que produjo la coincidencia
+
+
+def normalize(text: str) -> str:
+    """Lowercase, without accents, keeping only letters, digits and '+', '#'."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if c.isalnum() or c in '+#')
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TemplateSearchIndex:
+    """
+    Precomputed index over template names, aliases and categories.
+
+    Every normalized term is stored in a sorted list (prefix queries with
+    bisect) and in a trigram posting table (substring and typo-tolerant
+    queries). A query touches only the postings of its own trigrams and
+    re-scores a bounded number of candidates, so its cost does not grow
+    with the size of the library.
+
+    Ranking, best first: exact name, exact alias, name prefix, alias
+    prefix, substring of a name/alias, category match, fuzzy match.
+    """
+
+    def __init__(self, entries: Iterable[SearchEntry]):
+        self.entries: List[SearchEntry] = list(entries)
+        # (término normalizado, id de entrada, tipo: 'name' | 'alias' | 'category')
+        terms: List[Tuple[str, int, str]] = []
+        for entry_id, entry in enumerate(self.entries):
+            terms.append((normalize(entry.name), entry_id, 'name'))
+            for alias in entry.aliases:
+                terms.append((normalize(alias), entry_id, 'alias'))
+            for word in entry.category.split():
+                if len(normalize(word)) > 2:
+                    terms.append((normalize(word), entry_id, 'category'))
+
+        self._terms = sorted(t for t in terms if t[0])
+        self._sorted_keys = [t[0] for t in self._terms]
+        self._postings: Dict[str, List[int]] = {}
+        for term_id, (term, _, _) in enumerate(self._terms):
+            for gram in trigrams(term):
+                self._postings.setdefault(gram, []).append(term_id)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, limit: int = 30) -> List[SearchResult]:
+        """Returns up to 'limit' entries matching 'query', best first."""
+        q = normalize(query)
+        if not q:
+            return []
+
+        best: Dict[int, Tuple[float, str]] = {}
+
+        def offer(entry_id: int, score: float, term: str):
+            if score > best.get(entry_id, (-1.0, ''))[0]:
+                best[entry_id] = (score, term)
+
+        # 1. Prefijos (incluye coincidencias exactas).
+        i = bisect_left(self._sorted_keys, q)
+        while i < len(self._terms) and self._sorted_keys[i].startswith(q):
+            term, entry_id, kind = self._terms[i]
+            exact = term == q
+            base = {'name': 100.0, 'alias': 90.0, 'category': 40.0}[kind]
+            offer(entry_id, base if exact else base - 20 - len(term) / 100, term)
+            i += 1
+
+        # 2. Trigramas: subcadenas y errores de tipeo.
+        grams = trigrams(q)
+        counts: Counter = Counter()
+        for gram in grams:
+            for term_id in self._postings.get(gram, ()):
+                counts[term_id] += 1
+        for term_id, shared in counts.most_common(FUZZY_CANDIDATES):
+            term, entry_id, kind = self._terms[term_id]
+            if kind == 'category':
+                if q in term:
+                    offer(entry_id, 30.0, term)
+                continue
+            if q in term:
+                offer(entry_id, 50.0 - len(term) / 100, term)
+                continue
+            ratio = SequenceMatcher(None, q, term).ratio()
+            if ratio >= FUZZY_MIN_RATIO:
+                offer(entry_id, 10.0 * ratio, term)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], self.entries[item[0]].name))
+        return [SearchResult(self.entries[entry_id], score, term)
+                for entry_id, (score, term) in ranked[:limit]]
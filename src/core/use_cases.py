@@ -1,6 +1,28 @@
 # src/core/use_cases.py
 
-from typing import List, Callable, Dict
+from bisect import bisect_left
+from typing import List, Callable, Dict, NamedTuple, Optional, Tuple, Any
+
+EMPTY_SELECTION_MESSAGE = (
+    "# No se seleccionó ninguna plantilla.\n"
+    "# Marca las tecnologías en la lista de la izquierda para generar un .gitignore."
+)
+
+
+def render_header(selected_technologies: List[str]) -> str:
+    """Renders the banner that opens every generated .gitignore."""
+    return (
+        f"# Generated by GitIgnore Genius\n"
+        f"# Selected technologies: {', '.join(selected_technologies)}\n"
+        "#" + "="*78 + "\n\n"
+    )
+
+
+def render_section(technology: str, content: str) -> str:
+    """Renders one '# Begin: <tech>' section from a template's content."""
+    section_header = f"# Begin: {technology}\n" + "#" + "-"*78 + "\n"
+    return section_header + content.strip() + "\n\n"
+
 
 def generate_gitignore_content(
     selected_technologies: List[str],
@@ -21,25 +43,207 @@ def generate_gitignore_content(
         FileNotFoundError: If a template file cannot be found by the loader.
     """
     if not selected_technologies:
-        return (
-            "# No se seleccionó ninguna plantilla.\n"
-            "# Marca las tecnologías en la lista de la izquierda para generar un .gitignore."
-        )
+        return EMPTY_SELECTION_MESSAGE
 
-    header = (
-        f"# Generated by GitIgnore Genius\n"
-        f"# Selected technologies: {', '.join(selected_technologies)}\n"
-        "#" + "="*78 + "\n\n"
-    )
-
-    all_content_parts = [header]
+    all_content_parts = [render_header(selected_technologies)]
 
     for tech in selected_technologies:
-        section_header = f"# Begin: {tech}\n" + "#" + "-"*78 + "\n"
-        all_content_parts.append(section_header)
-        
-        content = template_loader_func(tech)
-        all_content_parts.append(content.strip() + "\n\n")
+        all_content_parts.append(render_section(tech, template_loader_func(tech)))
 
     return "".join(all_content_parts)
 
+
+class SectionChange(NamedTuple):
+    """
+    A section-level difference between two generated outputs.
+
+    kind is 'added', 'removed', 'moved' or 'changed' (same technology, new
+    template version, same place). A moved section may also have a new
+    template version: its current text is always the one in 'sections'.
+    Indexes refer to the section list before/after the change; the one that
+    does not apply is None.
+    """
+    kind: str
+    technology: str
+    old_index: Optional[int]
+    new_index: Optional[int]
+
+
+class LineEdit(NamedTuple):
+    """
+    One patch to turn the previous output into the new one: at 0-based
+    line 'line', delete 'delete' whole lines and insert 'text' (whole
+    lines, each ending in a newline). Edits apply in order, each to the
+    result of the previous one.
+    """
+    line: int
+    delete: int
+    text: str
+
+
+def _line_count(text: str) -> int:
+    return text.count("\n")
+
+
+def _stable_positions(sequence: List[int]) -> set:
+    """Positions of a longest increasing subsequence of 'sequence'."""
+    tails: List[int] = []        # valor final de cada longitud
+    tails_pos: List[int] = []    # posición de ese valor
+    previous: List[int] = [-1] * len(sequence)
+    for pos, value in enumerate(sequence):
+        i = bisect_left(tails, value)
+        if i == len(tails):
+            tails.append(value)
+            tails_pos.append(pos)
+        else:
+            tails[i] = value
+            tails_pos[i] = pos
+        previous[pos] = tails_pos[i - 1] if i > 0 else -1
+    stable = set()
+    pos = tails_pos[-1] if tails_pos else -1
+    while pos != -1:
+        stable.add(pos)
+        pos = previous[pos]
+    return stable
+
+
+class IncrementalGitignoreGenerator:
+    """
+    Generates the same output as generate_gitignore_content, but memoizes
+    each rendered section keyed by (technology, template version).
+
+    Toggling one technology only loads and renders that section plus the
+    header; every other section is reused as-is. After each call to
+    generate(), 'last_changes' lists the section-level differences with
+    the previous output and 'last_edits' turns them into line patches
+    (None when the whole output must be replaced: first call, or from/to
+    an empty selection), so a caller showing the previous output can patch
+    only the sections that changed instead of re-reading and re-diffing it.
+    """
+
+    def __init__(
+        self,
+        template_loader_func: Callable[[str], str],
+        template_version_func: Optional[Callable[[str], Any]] = None
+    ):
+        """
+        Args:
+            template_loader_func: Returns a template's content. May raise
+                                  FileNotFoundError.
+            template_version_func: Returns a value that changes whenever a
+                                   template changes (e.g. its mtime). Without
+                                   it, templates are assumed immutable.
+        """
+        self.template_loader_func = template_loader_func
+        self.template_version_func = template_version_func
+        self._rendered: Dict[str, Tuple[Any, str]] = {}
+        self._sections: List[Tuple[str, str]] = []
+        self._header = ""
+        self.last_changes: List[SectionChange] = []
+        self.last_edits: Optional[List[LineEdit]] = None
+
+    @property
+    def sections(self) -> List[Tuple[str, str]]:
+        """(technology, rendered section) pairs of the last output, in order."""
+        return list(self._sections)
+
+    def _section(self, tech: str) -> str:
+        version = self.template_version_func(tech) if self.template_version_func else None
+        cached = self._rendered.get(tech)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        rendered = render_section(tech, self.template_loader_func(tech))
+        self._rendered[tech] = (version, rendered)
+        return rendered
+
+    def generate(self, selected_technologies: List[str]) -> str:
+        """
+        Returns the combined .gitignore content for 'selected_technologies'.
+
+        Raises:
+            FileNotFoundError: If a template file cannot be found by the loader.
+        """
+        new_sections = [(tech, self._section(tech)) for tech in selected_technologies]
+        new_header = render_header(selected_technologies) if selected_technologies else ""
+        self.last_changes = self._diff(self._sections, new_sections)
+        if self._sections and new_sections:
+            self.last_edits = self._edits(
+                self._header, new_header, self._sections, new_sections, self.last_changes
+            )
+        else:
+            # El mensaje de selección vacía no tiene secciones: se reemplaza todo.
+            self.last_edits = None
+        self._sections = new_sections
+        self._header = new_header
+
+        if not selected_technologies:
+            return EMPTY_SELECTION_MESSAGE
+        return new_header + "".join(rendered for _, rendered in new_sections)
+
+    @staticmethod
+    def _edits(
+        old_header: str, new_header: str,
+        old: List[Tuple[str, str]], new: List[Tuple[str, str]],
+        changes: List[SectionChange],
+    ) -> List[LineEdit]:
+        edits: List[LineEdit] = []
+        if old_header != new_header:
+            edits.append(LineEdit(0, _line_count(old_header), new_header))
+        base = _line_count(new_header)
+
+        # 1) Se quitan las secciones eliminadas y las movidas, de abajo hacia
+        #    arriba para que las posiciones de las anteriores sigan valiendo.
+        leaving = {c.technology for c in changes if c.kind in ('removed', 'moved')}
+        offsets, line = [], base
+        for _, rendered in old:
+            offsets.append(line)
+            line += _line_count(rendered)
+        kept = []
+        for i in range(len(old) - 1, -1, -1):
+            if old[i][0] in leaving:
+                edits.append(LineEdit(offsets[i], _line_count(old[i][1]), ""))
+            else:
+                kept.append(old[i])
+        kept.reverse()
+
+        # 2) Las que quedan ya están en el orden nuevo: se recorre la lista
+        #    nueva reemplazando las cambiadas e insertando nuevas y movidas.
+        k, line = 0, base
+        for tech, rendered in new:
+            if k < len(kept) and kept[k][0] == tech:
+                previous = kept[k][1]
+                if previous is not rendered and previous != rendered:
+                    edits.append(LineEdit(line, _line_count(previous), rendered))
+                k += 1
+            else:
+                edits.append(LineEdit(line, 0, rendered))
+            line += _line_count(rendered)
+        return edits
+
+    @staticmethod
+    def _diff(
+        old: List[Tuple[str, str]], new: List[Tuple[str, str]]
+    ) -> List[SectionChange]:
+        old_index = {tech: i for i, (tech, _) in enumerate(old)}
+        new_index = {tech: i for i, (tech, _) in enumerate(new)}
+        changes: List[SectionChange] = []
+
+        for i, (tech, _) in enumerate(old):
+            if tech not in new_index:
+                changes.append(SectionChange('removed', tech, i, None))
+
+        # Las secciones comunes que forman la subsecuencia creciente más larga
+        # se quedan en su sitio; el resto se considera movido.
+        common = [(tech, rendered) for tech, rendered in new if tech in old_index]
+        stable = _stable_positions([old_index[tech] for tech, _ in common])
+        for pos, (tech, rendered) in enumerate(common):
+            i, j = old_index[tech], new_index[tech]
+            if pos not in stable:
+                changes.append(SectionChange('moved', tech, i, j))
+            elif old[i][1] is not rendered and old[i][1] != rendered:
+                changes.append(SectionChange('changed', tech, i, j))
+
+        for j, (tech, _) in enumerate(new):
+            if tech not in old_index:
+                changes.append(SectionChange('added', tech, None, j))
+        return changes
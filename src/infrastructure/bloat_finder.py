@@ -0,0 +1,305 @@
+# src/infrastructure/bloat_finder.py
+
+import os
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from src.core.ignore_matcher import GitignoreMatcher
+from src.core.use_cases import generate_gitignore_content
+from src.infrastructure.file_analyzer import detect_technologies
+from src.infrastructure.gitignore_file import GITIGNORE_NAME, read_text
+from src.infrastructure.template_loader import get_template_content
+
+DEFAULT_TOP = 20
+# Entradas que una tarea de medición recorre antes de repartir el resto del
+# subárbol: pocas tareas grandes en vez de una por carpeta.
+SIZE_TASK_ENTRIES = 2000
+# Carpetas pendientes que se entregan juntas a una misma tarea.
+SIZE_TASK_DIRECTORIES = 32
+
+
+class BloatEntry(NamedTuple):
+    """A path the detected templates say should be ignored, with its size."""
+    path: str           # relativa a la raíz, separada por '/'
+    is_dir: bool
+    size: int           # bytes (st_size; los hard links se cuentan una vez)
+    files: int
+    rule: str           # regla de la plantilla que la ignora
+    covered: bool       # el .gitignore actual del proyecto ya la ignora
+
+    def as_dict(self) -> dict:
+        return self._asdict()
+
+
+class BloatReport:
+    """
+    Result of find_bloat().
+
+    Attributes:
+        technologies: Technologies whose templates were applied.
+        offenders: The largest ignorable paths, biggest first.
+        total_size: Bytes held by every ignorable path (not only the top).
+        total_files: Files held by every ignorable path.
+        offender_count: Number of ignorable paths found.
+        uncovered_size: Bytes the project's current .gitignore misses.
+        directories_scanned: Number of directories listed.
+        entries: Directory entries seen.
+        truncated: True if 'time_limit' stopped the walk early.
+        elapsed: Wall time in seconds.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.technologies: List[str] = []
+        self.offenders: List[BloatEntry] = []
+        self.total_size = 0
+        self.total_files = 0
+        self.offender_count = 0
+        self.uncovered_size = 0
+        self.directories_scanned = 0
+        self.entries = 0
+        self.truncated = False
+        self.elapsed = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "root": self.root,
+            "technologies": self.technologies,
+            "offenders": [entry.as_dict() for entry in self.offenders],
+            "total_size": self.total_size,
+            "total_files": self.total_files,
+            "offender_count": self.offender_count,
+            "uncovered_size": self.uncovered_size,
+            "directories_scanned": self.directories_scanned,
+            "entries": self.entries,
+            "truncated": self.truncated,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+class _Usage:
+    """Running totals of one ignorable directory while its subtree is sized."""
+    __slots__ = ("size", "files", "rule")
+
+    def __init__(self, rule: str):
+        self.size = 0
+        self.files = 0
+        self.rule = rule
+
+
+def _file_size(entry: os.DirEntry) -> int:
+    try:
+        return entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        return 0
+
+
+def _match_directory(
+    path: str, relative_dir: str, matcher: GitignoreMatcher
+) -> Tuple[List[Tuple[str, bool, str, int]], List[Tuple[str, str]], int]:
+    """
+    Worker task: lists one non-ignored directory and evaluates its entries.
+
+    Returns (ignorable entries as (relative, is_dir, rule, file size),
+    (absolute, relative) subdirectories to walk next, entries seen).
+    """
+    ignored: List[Tuple[str, bool, str, int]] = []
+    children: List[Tuple[str, str]] = []
+    count = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                count += 1
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir and entry.name == '.git':
+                    continue
+                relative = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                rule = matcher.winning_rule(relative, is_dir)
+                if rule is not None and not rule.negated:
+                    size = 0 if is_dir else _file_size(entry)
+                    ignored.append((relative, is_dir, rule.pattern, size))
+                elif is_dir:
+                    children.append((entry.path, relative))
+    except OSError:
+        pass
+    return ignored, children, count
+
+
+def _size_directories(paths: List[str]) -> Tuple[int, int, List[str], int, int, List[Tuple[int, int, int]]]:
+    """
+    Worker task: adds up the files below 'paths', inside an ignorable
+    subtree (no pattern is evaluated there). Subdirectories are walked
+    inline until SIZE_TASK_ENTRIES entries have been seen; whatever is
+    left is handed back so other workers can take it.
+
+    Returns (bytes, files, subdirectories still to size, directories
+    listed, entries seen, hard-linked files as (dev, inode, size) for the
+    coordinator to de-duplicate).
+    """
+    size = files = count = listed = 0
+    stack = list(paths)
+    linked: List[Tuple[int, int, int]] = []
+    while stack and count < SIZE_TASK_ENTRIES:
+        listed += 1
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    count += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    files += 1
+                    if st.st_nlink > 1:
+                        linked.append((st.st_dev, st.st_ino, st.st_size))
+                    else:
+                        size += st.st_size
+        except OSError:
+            pass
+    return size, files, stack, listed, count, linked
+
+
+def find_bloat(
+    project_path: str,
+    technologies: Optional[List[str]] = None,
+    top: int = DEFAULT_TOP,
+    max_workers: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    sniff_manifests: bool = False,
+) -> BloatReport:
+    """
+    Reports the space held by paths that the project's templates say
+    should be ignored (node_modules, __pycache__, .venv, build outputs...).
+
+    The technologies are chosen with detect_technologies() unless given.
+    Their combined template is compiled into a GitignoreMatcher and run
+    against a parallel os.scandir walk: every entry of a non-ignored
+    directory is evaluated once; an ignorable directory is not evaluated
+    any further, only sized. A sizing task walks its directories inline
+    until it has seen SIZE_TASK_ENTRIES entries and hands the rest back,
+    split into tasks of up to SIZE_TASK_DIRECTORIES directories, so a huge
+    node_modules is shared by all the workers without one task per folder.
+    '.git' and symlinked directories are never entered.
+
+    Args:
+        project_path: Root of the project.
+        technologies: Templates to apply (default: the detected ones).
+        top: Number of largest offenders to keep in the report.
+        max_workers: Thread pool size (default: a few per CPU, since the
+                     work is dominated by filesystem latency).
+        time_limit: Hard cap on wall time in seconds (None = no cap); the
+                    report is flagged as truncated.
+        sniff_manifests: Passed to detect_technologies().
+
+    Raises:
+        NotADirectoryError: If 'project_path' is not a directory.
+        FileNotFoundError: If a template file cannot be found.
+    """
+    if not os.path.isdir(project_path):
+        raise NotADirectoryError(project_path)
+
+    started = time.monotonic()
+    deadline = started + time_limit if time_limit is not None else None
+    report = BloatReport(project_path)
+
+    if technologies is None:
+        technologies, _ = detect_technologies(project_path, sniff_manifests=sniff_manifests)
+    report.technologies = list(technologies)
+    if not technologies:
+        report.elapsed = time.monotonic() - started
+        return report
+
+    matcher = GitignoreMatcher.from_text(
+        generate_gitignore_content(report.technologies, get_template_content)
+    )
+    current = GitignoreMatcher.from_text(
+        read_text(os.path.join(project_path, GITIGNORE_NAME)) or ''
+    )
+
+    ignored_files: List[BloatEntry] = []
+    usages: Dict[str, _Usage] = {}
+    seen_inodes: Set[Tuple[int, int]] = set()
+
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bloat")
+    # Las tareas terminadas llegan por una cola: con miles de tareas en
+    # vuelo, concurrent.futures.wait() (lineal en las pendientes) domina.
+    completed: "queue.Queue[Tuple[Future, str, Optional[str]]]" = queue.Queue()
+    in_flight = 0
+
+    def submit(kind: str, owner: Optional[str], func, *args):
+        nonlocal in_flight
+        in_flight += 1
+        future = executor.submit(func, *args)
+        future.add_done_callback(lambda f: completed.put((f, kind, owner)))
+
+    def size_subtrees(paths: List[str], owner: str):
+        for i in range(0, len(paths), SIZE_TASK_DIRECTORIES):
+            submit("size", owner, _size_directories, paths[i:i + SIZE_TASK_DIRECTORIES])
+
+    try:
+        submit("match", None, _match_directory, project_path, '', matcher)
+        while in_flight:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    report.truncated = True
+                    break
+            try:
+                future, kind, owner = completed.get(timeout=timeout)
+            except queue.Empty:
+                report.truncated = True
+                break
+            in_flight -= 1
+
+            if kind == "match":
+                ignored, children, count = future.result()
+                report.directories_scanned += 1
+                report.entries += count
+                for relative, is_dir, rule, size in ignored:
+                    if is_dir:
+                        usages[relative] = _Usage(rule)
+                        size_subtrees([os.path.join(project_path, relative)], relative)
+                    else:
+                        ignored_files.append(BloatEntry(
+                            relative, False, size, 1, rule, current.is_ignored(relative)
+                        ))
+                for path, relative in children:
+                    submit("match", None, _match_directory, path, relative, matcher)
+            else:
+                size, files, subdirs, listed, count, linked = future.result()
+                report.directories_scanned += listed
+                report.entries += count
+                usage = usages[owner]
+                for dev, inode, linked_size in linked:
+                    if (dev, inode) not in seen_inodes:
+                        seen_inodes.add((dev, inode))
+                        size += linked_size
+                usage.size += size
+                usage.files += files
+                size_subtrees(subdirs, owner)
+    finally:
+        # Lo que quede en cola se descarta; lo que esté en curso termina solo.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    offenders = ignored_files + [
+        BloatEntry(path, True, usage.size, usage.files, usage.rule, current.is_ignored(path, True))
+        for path, usage in usages.items()
+    ]
+    offenders.sort(key=lambda entry: (-entry.size, entry.path))
+    report.offender_count = len(offenders)
+    report.total_size = sum(entry.size for entry in offenders)
+    report.total_files = sum(entry.files for entry in offenders)
+    report.uncovered_size = sum(entry.size for entry in offenders if not entry.covered)
+    report.offenders = offenders[:top]
+    report.elapsed = time.monotonic() - started
+    return report
@@ -0,0 +1,100 @@
+# src/infrastructure/detection_profile.py
+
+from typing import Dict, List
+
+from src.infrastructure.directory_snapshot import ScanStats
+
+
+class RuleTiming:
+    """Time and filesystem calls attributed to one detection rule."""
+    __slots__ = ("category", "technology", "seconds", "fs_calls", "evaluated", "matched")
+
+    def __init__(self, category: str, technology: str):
+        self.category = category
+        self.technology = technology
+        self.seconds = 0.0
+        self.fs_calls = 0
+        self.evaluated = False
+        self.matched = False
+
+    def as_dict(self) -> dict:
+        return {
+            "category": self.category,
+            "technology": self.technology,
+            "time_ms": round(self.seconds * 1000, 4),
+            "fs_calls": self.fs_calls,
+            "evaluated": self.evaluated,
+            "matched": self.matched,
+        }
+
+
+class DetectionProfile:
+    """
+    Opt-in profiling data of one detect_technologies() run.
+
+    Pass an instance as detect_technologies(path, profile=...) to fill it.
+    'snapshot_seconds' covers listing the directory, 'index_seconds' the
+    shared pass over its entries, and each RuleTiming the work specific to
+    a rule: nested-path or prefix lookups (with the filesystem calls they
+    issue) and the evaluation of its condition. Rules that no entry could
+    fire are never evaluated and show up with evaluated=False.
+    """
+
+    def __init__(self):
+        self.stats = ScanStats()
+        self.total_seconds = 0.0
+        self.snapshot_seconds = 0.0
+        self.index_seconds = 0.0
+        self.rules: Dict[str, RuleTiming] = {}
+
+    def add_rule(self, category: str, technology: str):
+        self.rules.setdefault(technology, RuleTiming(category, technology))
+
+    def charge(self, technology: str, seconds: float, fs_calls: int,
+               evaluated: bool = False, matched: bool = False):
+        timing = self.rules[technology]
+        timing.seconds += seconds
+        timing.fs_calls += fs_calls
+        timing.evaluated = timing.evaluated or evaluated
+        timing.matched = timing.matched or matched
+
+    def by_category(self) -> Dict[str, dict]:
+        """Rule timings added up per category."""
+        categories: Dict[str, dict] = {}
+        for timing in self.rules.values():
+            entry = categories.setdefault(
+                timing.category, {"time_ms": 0.0, "fs_calls": 0, "detected": []}
+            )
+            entry["time_ms"] += timing.seconds * 1000
+            entry["fs_calls"] += timing.fs_calls
+            if timing.matched:
+                entry["detected"].append(timing.technology)
+        for entry in categories.values():
+            entry["time_ms"] = round(entry["time_ms"], 4)
+        return categories
+
+    def slowest(self, count: int = 3) -> List[RuleTiming]:
+        return sorted(self.rules.values(), key=lambda t: t.seconds, reverse=True)[:count]
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_seconds * 1000, 4),
+            "snapshot_ms": round(self.snapshot_seconds * 1000, 4),
+            "index_ms": round(self.index_seconds * 1000, 4),
+            "fs_calls": self.stats.as_dict(),
+            "categories": self.by_category(),
+            "rules": [timing.as_dict() for timing in self.rules.values()],
+        }
+
+    def summary(self) -> str:
+        """One-line human readable summary (GUI status area, CLI stderr)."""
+        slowest = ", ".join(
+            f"{t.technology} {t.seconds * 1000:.2f} ms/{t.fs_calls} llamadas"
+            for t in self.slowest() if t.seconds > 0
+        )
+        return (
+            f"Análisis: {self.total_seconds * 1000:.1f} ms, "
+            f"{self.stats.syscalls} llamadas al FS "
+            f"(listado {self.snapshot_seconds * 1000:.1f} ms, índice {self.index_seconds * 1000:.2f} ms)"
+            + (f" | Reglas más lentas: {slowest}" if slowest else "")
+        )
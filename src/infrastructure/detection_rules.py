@@ -0,0 +1,434 @@
+# src/infrastructure/detection_rules.py
+
+import hashlib
+import platform
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from src.infrastructure.directory_snapshot import DirectorySnapshot, extension_of
+from src.infrastructure.manifest_sniffer import ManifestSniffer
+
+if TYPE_CHECKING:
+    from src.infrastructure.detection_profile import DetectionProfile
+
+# --- Condiciones declarativas ---
+#
+# Una regla de detección es un árbol de condiciones construido con los
+# helpers de abajo y los operadores & (AND), | (OR) y ~ (NOT):
+#
+#     "NodeJsTs": name('package.json') & name('tsconfig.json'),
+#     "Node":     name('package.json') & ~name('tsconfig.json'),
+#
+# Las hojas (Atom) son hechos observables en un DirectorySnapshot. El
+# compilador indexa los átomos por nombre exacto y por extensión, de modo
+# que una sola pasada sobre las entradas dispara todas las reglas a la vez.
+
+
+class Atom(NamedTuple):
+    """A single observable fact about a directory."""
+    kind: str   # 'name', 'file', 'dir', 'ext', 'prefix', 'file_prefix', 'path', 'platform',
+                # 'manifest', 'dep'
+    value: str
+
+
+class Condition:
+    """Base class of the rule expression tree."""
+    __slots__ = ()
+
+    def __and__(self, other: "Condition") -> "Condition":
+        return AllOf(self, other)
+
+    def __or__(self, other: "Condition") -> "Condition":
+        return AnyOf(self, other)
+
+    def __invert__(self) -> "Condition":
+        return Not(self)
+
+    def atoms(self) -> Iterator[Atom]:
+        raise NotImplementedError
+
+    def evaluate(self, facts: Set[Atom]) -> bool:
+        raise NotImplementedError
+
+
+class Fact(Condition):
+    __slots__ = ("atom",)
+
+    def __init__(self, atom: Atom):
+        self.atom = atom
+
+    def atoms(self) -> Iterator[Atom]:
+        yield self.atom
+
+    def evaluate(self, facts: Set[Atom]) -> bool:
+        return self.atom in facts
+
+    def __repr__(self) -> str:
+        return f"{self.atom.kind}({self.atom.value!r})"
+
+
+class AllOf(Condition):
+    __slots__ = ("children",)
+
+    def __init__(self, *children: Condition):
+        self.children = children
+
+    def atoms(self) -> Iterator[Atom]:
+        for child in self.children:
+            yield from child.atoms()
+
+    def evaluate(self, facts: Set[Atom]) -> bool:
+        return all(child.evaluate(facts) for child in self.children)
+
+    def __repr__(self) -> str:
+        return "(" + " & ".join(map(repr, self.children)) + ")"
+
+
+class AnyOf(Condition):
+    __slots__ = ("children",)
+
+    def __init__(self, *children: Condition):
+        self.children = children
+
+    def atoms(self) -> Iterator[Atom]:
+        for child in self.children:
+            yield from child.atoms()
+
+    def evaluate(self, facts: Set[Atom]) -> bool:
+        return any(child.evaluate(facts) for child in self.children)
+
+    def __repr__(self) -> str:
+        return "(" + " | ".join(map(repr, self.children)) + ")"
+
+
+class Not(Condition):
+    __slots__ = ("child",)
+
+    def __init__(self, child: Condition):
+        self.child = child
+
+    def atoms(self) -> Iterator[Atom]:
+        return self.child.atoms()
+
+    def evaluate(self, facts: Set[Atom]) -> bool:
+        return not self.child.evaluate(facts)
+
+    def __repr__(self) -> str:
+        return f"~{self.child!r}"
+
+
+def _any(kind: str, values: Tuple[str, ...]) -> Condition:
+    facts = [Fact(Atom(kind, v)) for v in values]
+    return facts[0] if len(facts) == 1 else AnyOf(*facts)
+
+
+def name(*names: str) -> Condition:
+    """Any entry (file or directory) with one of these names. Accepts nested paths."""
+    return AnyOf(*[path(n) for n in names]) if len(names) > 1 else path(names[0])
+
+
+def path(relative_path: str) -> Condition:
+    relative_path = relative_path.strip('/')
+    if '/' in relative_path:
+        return Fact(Atom('path', relative_path))
+    return Fact(Atom('name', relative_path))
+
+
+def file(*names: str) -> Condition:
+    """A regular file with one of these names."""
+    return _any('file', names)
+
+
+def directory(*names: str) -> Condition:
+    """A directory with one of these names."""
+    return _any('dir', names)
+
+
+def ext(*extensions: str) -> Condition:
+    """Any entry whose name ends with one of these extensions (e.g. '.py')."""
+    return _any('ext', extensions)
+
+
+def prefix(value: str, files_only: bool = False) -> Condition:
+    """Any entry (optionally only regular files) whose name starts with 'value'."""
+    return Fact(Atom('file_prefix' if files_only else 'prefix', value))
+
+
+def platform_is(system: str) -> Condition:
+    """The host OS, as reported by platform.system() (e.g. 'Windows')."""
+    return Fact(Atom('platform', system))
+
+
+def has_manifest(ecosystem: str) -> Condition:
+    """A readable manifest of 'ecosystem' ('npm', 'pypi', 'composer') exists."""
+    return Fact(Atom('manifest', ecosystem))
+
+
+def depends_on(ecosystem: str, *packages: str) -> Condition:
+    """The ecosystem's manifests declare one of these packages (any kind of dependency)."""
+    return _any('dep', tuple(f"{ecosystem}:{package}" for package in packages))
+
+
+def sniffed(content: Condition, fallback: Condition) -> Condition:
+    """
+    'content' when the manifests its dependencies come from can be read,
+    else the name-based 'fallback' rule.
+    """
+    ecosystems = sorted({atom.value.split(':', 1)[0]
+                         for atom in content.atoms() if atom.kind == 'dep'})
+    available = AnyOf(*[has_manifest(e) for e in ecosystems]) if len(ecosystems) > 1 \
+        else has_manifest(ecosystems[0])
+    return (available & content) | (~available & fallback)
+
+
+# --- Compilación ---
+
+class CompiledRule(NamedTuple):
+    index: int
+    category: str
+    technology: str
+    condition: Condition
+
+
+class CompiledRuleSet:
+    """
+    Detection rules compiled into hash tables keyed by exact entry name and
+    by extension.
+
+    match() walks the snapshot entries once, collects the atoms that hold
+    and only evaluates the rules referencing those atoms (plus the few
+    rules that can hold with no atom at all, e.g. pure negations). The
+    cost is O(entries + fired rules) regardless of the size of the rule set.
+    """
+
+    def __init__(self, categorized_rules: Dict[str, Dict[str, Condition]]):
+        self.rules: List[CompiledRule] = []
+        self.categories: Dict[str, List[str]] = {}
+        self._file_names: Dict[str, List[Atom]] = {}
+        self._dir_names: Dict[str, List[Atom]] = {}
+        self._extensions: Dict[str, List[Atom]] = {}
+        self._scan_atoms: List[Atom] = []      # prefix/path/manifiestos: consultados al snapshot
+        self._sniffs_manifests = False
+        self._platform_facts: Set[Atom] = set()
+        self._rules_by_atom: Dict[Atom, List[int]] = {}
+        self._always_evaluate: List[int] = []
+
+        for category, rules in categorized_rules.items():
+            self.categories[category] = list(rules.keys())
+            for tech, condition in rules.items():
+                self._add_rule(category, tech, condition)
+
+        # Cambia si cambia cualquier regla (o el SO, por las reglas de plataforma).
+        signature = repr([(r.category, r.technology, r.condition) for r in self.rules])
+        self.version = hashlib.sha1(
+            (signature + platform.system()).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def _add_rule(self, category: str, tech: str, condition: Condition):
+        index = len(self.rules)
+        self.rules.append(CompiledRule(index, category, tech, condition))
+
+        rule_atoms = set(condition.atoms())
+        for atom in rule_atoms:
+            if atom not in self._rules_by_atom:
+                self._index_atom(atom)
+            self._rules_by_atom.setdefault(atom, []).append(index)
+
+        # Reglas que pueden cumplirse sin ningún átomo presente (p.ej. ~name(x))
+        # no se dispararían por índice: hay que evaluarlas siempre.
+        if condition.evaluate(set()):
+            self._always_evaluate.append(index)
+
+    def _index_atom(self, atom: Atom):
+        kind, value = atom
+        if kind in ('name', 'file'):
+            self._file_names.setdefault(value, []).append(atom)
+        if kind in ('name', 'dir'):
+            self._dir_names.setdefault(value, []).append(atom)
+        if kind == 'ext':
+            self._extensions.setdefault(value, []).append(atom)
+        if kind in ('prefix', 'file_prefix', 'path', 'manifest', 'dep'):
+            self._scan_atoms.append(atom)
+        if kind in ('manifest', 'dep'):
+            self._sniffs_manifests = True
+        if kind == 'platform' and platform.system() == value:
+            self._platform_facts.add(atom)
+
+    @property
+    def nested_directories(self) -> List[str]:
+        """Subdirectories whose contents some rule looks into (e.g. 'src')."""
+        return sorted({atom.value.rsplit('/', 1)[0]
+                       for atom in self._scan_atoms if atom.kind == 'path'})
+
+    @property
+    def technologies(self) -> List[str]:
+        return [rule.technology for rule in self.rules]
+
+    def collect_facts(self, snapshot: DirectorySnapshot) -> Set[Atom]:
+        """Single pass over the snapshot entries, returning the atoms that hold."""
+        facts = self._collect_entry_facts(snapshot)
+        sniffer = self._sniffer(snapshot)
+        for atom in self._scan_atoms:
+            if self._scan_atom_holds(snapshot, atom, sniffer):
+                facts.add(atom)
+        return facts
+
+    def _sniffer(self, snapshot: DirectorySnapshot):
+        # Un sniffer por escaneo: cada manifiesto se interpreta una sola vez
+        # aunque varias reglas pregunten por él.
+        return ManifestSniffer(snapshot) if self._sniffs_manifests else None
+
+    def _collect_entry_facts(self, snapshot: DirectorySnapshot) -> Set[Atom]:
+        """Atoms resolved through the name and extension hash tables."""
+        facts: Set[Atom] = set(self._platform_facts)
+        file_names, dir_names, extensions = self._file_names, self._dir_names, self._extensions
+
+        for entry_name in snapshot.files:
+            atoms = file_names.get(entry_name)
+            if atoms:
+                facts.update(atoms)
+            atoms = extensions.get(extension_of(entry_name))
+            if atoms:
+                facts.update(atoms)
+        for entry_name in snapshot.dirs:
+            atoms = dir_names.get(entry_name)
+            if atoms:
+                facts.update(atoms)
+            atoms = extensions.get(extension_of(entry_name))
+            if atoms:
+                facts.update(atoms)
+        return facts
+
+    @staticmethod
+    def _scan_atom_holds(snapshot: DirectorySnapshot, atom: Atom,
+                         sniffer: Optional[ManifestSniffer] = None) -> bool:
+        """Prefix, nested-path and manifest atoms, answered by the snapshot."""
+        kind, value = atom
+        if kind == 'path':
+            return snapshot.exists(value)
+        if kind == 'manifest':
+            return sniffer.has_manifest(value)
+        if kind == 'dep':
+            return sniffer.depends_on(*value.split(':', 1))
+        return snapshot.has_prefix(value, files_only=(kind == 'file_prefix'))
+
+    # --- Consultas incrementales (modo watch) ---
+
+    def entry_atoms(self, entry_name: str, is_dir: bool) -> Set[Atom]:
+        """
+        Atoms supported by a single top-level entry: the ones the entry pass
+        and the prefix lookups would collect for it. Platform and nested
+        path atoms are not included.
+        """
+        atoms: Set[Atom] = set()
+        table = self._dir_names if is_dir else self._file_names
+        atoms.update(table.get(entry_name, ()))
+        atoms.update(self._extensions.get(extension_of(entry_name), ()))
+        for atom in self._scan_atoms:
+            if atom.kind == 'prefix' or (atom.kind == 'file_prefix' and not is_dir):
+                if entry_name.startswith(atom.value):
+                    atoms.add(atom)
+        return atoms
+
+    def path_atoms(self, relative_path: str = '') -> List[Atom]:
+        """Nested path atoms at or below 'relative_path' ('' = all of them)."""
+        relative_path = relative_path.strip('/')
+        return [atom for atom in self._scan_atoms if atom.kind == 'path' and (
+            not relative_path or atom.value == relative_path
+            or atom.value.startswith(relative_path + '/'))]
+
+    @property
+    def platform_facts(self) -> Set[Atom]:
+        return set(self._platform_facts)
+
+    def rules_for_atoms(self, atoms) -> List[int]:
+        """Indexes (in rule order) of the rules referencing any of 'atoms'."""
+        indexes: Set[int] = set()
+        for atom in atoms:
+            indexes.update(self._rules_by_atom.get(atom, ()))
+        return sorted(indexes)
+
+    def result_of(self, indexes) -> Tuple[List[str], Dict[str, List[str]]]:
+        """The (all_detected, detected_by_category) pair for matched rule indexes."""
+        detected_by_category: Dict[str, List[str]] = {}
+        for index in sorted(indexes):
+            rule = self.rules[index]
+            detected_by_category.setdefault(rule.category, []).append(rule.technology)
+        return sorted({self.rules[i].technology for i in indexes}), detected_by_category
+
+    def candidates(self, facts: Set[Atom]) -> List[int]:
+        """Indexes (in rule order) of the rules that may hold given 'facts'."""
+        indexes: Set[int] = set(self._always_evaluate)
+        rules_by_atom = self._rules_by_atom
+        for atom in facts:
+            indexes.update(rules_by_atom.get(atom, ()))
+        return sorted(indexes)
+
+    def evaluate(self, facts: Set[Atom]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Evaluates the candidate rules against 'facts', grouped by category."""
+        all_detected: List[str] = []
+        detected_by_category: Dict[str, List[str]] = {}
+        for index in self.candidates(facts):
+            rule = self.rules[index]
+            if rule.condition.evaluate(facts):
+                detected_by_category.setdefault(rule.category, []).append(rule.technology)
+                all_detected.append(rule.technology)
+        return sorted(set(all_detected)), detected_by_category
+
+    def group(self, technologies) -> Dict[str, List[str]]:
+        """Groups technology names by category, in rule order."""
+        wanted = set(technologies)
+        grouped: Dict[str, List[str]] = {}
+        for rule in self.rules:
+            if rule.technology in wanted:
+                grouped.setdefault(rule.category, []).append(rule.technology)
+        return grouped
+
+    def match(self, snapshot: DirectorySnapshot) -> Tuple[List[str], Dict[str, List[str]]]:
+        return self.evaluate(self.collect_facts(snapshot))
+
+    def match_profiled(
+        self, snapshot: DirectorySnapshot, profile: "DetectionProfile"
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Same result as match(), recording into 'profile' the time and
+        filesystem calls spent on the shared entry pass and on each rule.
+        Kept separate so match() pays nothing for instrumentation.
+        """
+        stats = snapshot.stats
+        for rule in self.rules:
+            profile.add_rule(rule.category, rule.technology)
+
+        started = perf_counter()
+        facts = self._collect_entry_facts(snapshot)
+        profile.index_seconds += perf_counter() - started
+
+        sniffer = self._sniffer(snapshot)
+        for atom in self._scan_atoms:
+            calls_before = stats.syscalls
+            started = perf_counter()
+            if self._scan_atom_holds(snapshot, atom, sniffer):
+                facts.add(atom)
+            elapsed = perf_counter() - started
+            calls = stats.syscalls - calls_before
+            # El coste de un átomo se imputa a cada regla que lo usa.
+            for index in self._rules_by_atom[atom]:
+                profile.charge(self.rules[index].technology, elapsed, calls)
+
+        all_detected: List[str] = []
+        detected_by_category: Dict[str, List[str]] = {}
+        for index in self.candidates(facts):
+            rule = self.rules[index]
+            started = perf_counter()
+            matched = rule.condition.evaluate(facts)
+            profile.charge(rule.technology, perf_counter() - started, 0,
+                           evaluated=True, matched=matched)
+            if matched:
+                detected_by_category.setdefault(rule.category, []).append(rule.technology)
+                all_detected.append(rule.technology)
+        return sorted(set(all_detected)), detected_by_category
+
+
+def compile_rules(categorized_rules: Dict[str, Dict[str, Condition]]) -> CompiledRuleSet:
+    """Compiles the declarative rule dictionary into a CompiledRuleSet."""
+    return CompiledRuleSet(categorized_rules)
@@ -0,0 +1,163 @@
+# src/infrastructure/directory_snapshot.py
+
+import os
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set
+
+
+class ScanStats:
+    """
+    Counts the filesystem calls issued while analyzing a directory.
+
+    A single instance is shared by a snapshot and every child snapshot it
+    opens, so the totals cover the whole detection run.
+    """
+    __slots__ = ("scandir_calls", "stat_calls", "read_calls", "entries")
+
+    def __init__(self):
+        self.scandir_calls = 0
+        self.stat_calls = 0     # enlaces simbólicos seguidos y manifiestos con sniff
+        self.read_calls = 0     # manifiestos leídos (sólo con sniff_manifests)
+        self.entries = 0
+
+    @property
+    def syscalls(self) -> int:
+        """Total number of directory listings, stat calls and file reads."""
+        return self.scandir_calls + self.stat_calls + self.read_calls
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "scandir_calls": self.scandir_calls,
+            "stat_calls": self.stat_calls,
+            "read_calls": self.read_calls,
+            "entries": self.entries,
+            "syscalls": self.syscalls,
+        }
+
+    def __repr__(self) -> str:
+        return (f"ScanStats(scandir_calls={self.scandir_calls}, "
+                f"stat_calls={self.stat_calls}, read_calls={self.read_calls}, "
+                f"entries={self.entries})")
+
+
+def extension_of(name: str) -> str:
+    """Returns the suffix from the last dot (e.g. '.py'), or '' if there is none."""
+    dot = name.rfind('.')
+    return name[dot:] if dot != -1 else ''
+
+
+class DirectorySnapshot:
+    """
+    In-memory index of a single directory, taken with one os.scandir call.
+
+    Entries are indexed by exact name, by extension (suffix from the last
+    dot), by prefix (sorted names + bisect) and by file/dir type, so the
+    detection rules never touch the filesystem again. Nested lookups such
+    as 'public/index.html' open a child snapshot lazily, once per child.
+    """
+
+    def __init__(self, path: str, stats: Optional[ScanStats] = None):
+        self.path = path
+        self.stats = stats if stats is not None else ScanStats()
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = set()
+        self.symlinks: Set[str] = set()
+        self.by_extension: Dict[str, List[str]] = {}
+        self._sorted_names: List[str] = []
+        self._children: Dict[str, Optional["DirectorySnapshot"]] = {}
+
+    @classmethod
+    def scan(cls, path: str, stats: Optional[ScanStats] = None) -> "DirectorySnapshot":
+        """
+        Lists 'path' once and builds the indexes.
+
+        Raises:
+            OSError: If the directory cannot be listed (missing, not a
+                     directory, permissions...).
+        """
+        snapshot = cls(path, stats)
+        snapshot.stats.scandir_calls += 1
+        with os.scandir(path) as it:
+            for entry in it:
+                is_symlink = entry.is_symlink()
+                snapshot._add(entry.name, snapshot._entry_is_dir(entry, is_symlink))
+                if is_symlink:
+                    snapshot.symlinks.add(entry.name)
+        snapshot._sorted_names.sort()
+        return snapshot
+
+    def _entry_is_dir(self, entry: os.DirEntry, is_symlink: bool) -> bool:
+        # DirEntry.is_dir() is served from d_type on most platforms; for a
+        # symlink it follows the link with a stat, which is counted here.
+        # Filesystems without d_type also stat, but os.DirEntry does not
+        # expose that, so those calls are not counted.
+        if is_symlink:
+            self.stats.stat_calls += 1
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
+
+    def _add(self, name: str, is_dir: bool):
+        self.stats.entries += 1
+        (self.dirs if is_dir else self.files).add(name)
+        self._sorted_names.append(name)
+        ext = extension_of(name)
+        if ext:
+            self.by_extension.setdefault(ext, []).append(name)
+
+    # --- Consultas ---
+
+    @property
+    def names(self) -> List[str]:
+        """All entry names, sorted."""
+        return self._sorted_names
+
+    def exists(self, relative_path: str) -> bool:
+        """Equivalent to os.path.exists(join(path, relative_path))."""
+        parent, name = self._resolve(relative_path)
+        return parent is not None and (name in parent.files or name in parent.dirs)
+
+    def isfile(self, relative_path: str) -> bool:
+        parent, name = self._resolve(relative_path)
+        return parent is not None and name in parent.files
+
+    def isdir(self, relative_path: str) -> bool:
+        parent, name = self._resolve(relative_path)
+        return parent is not None and name in parent.dirs
+
+    def has_extension(self, *extensions: str) -> bool:
+        """True if any entry name ends with one of the given extensions."""
+        return any(ext in self.by_extension for ext in extensions)
+
+    def has_prefix(self, prefix: str, files_only: bool = False) -> bool:
+        """True if any entry (optionally only regular files) starts with 'prefix'."""
+        names = self._sorted_names
+        i = bisect_left(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            if not files_only or names[i] in self.files:
+                return True
+            i += 1
+        return False
+
+    def child(self, name: str) -> Optional["DirectorySnapshot"]:
+        """Snapshot of a direct subdirectory, or None if it cannot be listed."""
+        if name not in self._children:
+            child = None
+            if name in self.dirs:
+                try:
+                    child = DirectorySnapshot.scan(os.path.join(self.path, name), self.stats)
+                except OSError:
+                    child = None
+            self._children[name] = child
+        return self._children[name]
+
+    def _resolve(self, relative_path: str):
+        """Returns (snapshot of the parent directory, final name component)."""
+        parts = [p for p in relative_path.replace('\\', '/').split('/') if p]
+        snapshot: Optional[DirectorySnapshot] = self
+        for part in parts[:-1]:
+            snapshot = snapshot.child(part)
+            if snapshot is None:
+                return None, ''
+        return snapshot, parts[-1] if parts else ''
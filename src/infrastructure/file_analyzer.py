@@ -1,129 +1,179 @@
 # src/infrastructure/file_analyzer.py
-import os
-import platform
-from typing import List, Dict, Callable, Tuple
+from time import perf_counter
+from typing import List, Dict, Optional, Tuple
 
-DetectionRule = Callable[[str], bool]
+from src.infrastructure.directory_snapshot import DirectorySnapshot, ScanStats
+from src.infrastructure.detection_profile import DetectionProfile
+from src.infrastructure.detection_rules import (
+    CompiledRuleSet, Condition, compile_rules, name, directory, ext, prefix, platform_is,
+    depends_on, sniffed
+)
+
+# Las reglas son datos (condiciones declarativas), no funciones: se compilan
+# una sola vez en tablas indexadas por nombre de archivo y extensión.
+DetectionRule = Condition
 
 # Para añadir una nueva tecnología:
 # 1. Añade su plantilla .gitignore en la carpeta 'templates'.
 # 2. Añade una nueva entrada en este diccionario, bajo la
 #    categoría correcta. La clave debe ser el nombre del archivo
-#    de plantilla (sin extensión).
+#    de plantilla (sin extensión). Combina name(), directory(), ext(),
+#    prefix() y platform_is() con & (y), | (o) y ~ (no).
 CATEGORIZED_DETECTION_RULES: Dict[str, Dict[str, DetectionRule]] = {
     "Lenguajes": {
-        "Python": lambda path: any(f.endswith('.py') for f in os.listdir(path)) or \
-                               os.path.exists(os.path.join(path, 'requirements.txt')),
-        "Java": lambda path: os.path.exists(os.path.join(path, 'pom.xml')) or \
-                             ("build.gradle" in os.listdir(path) and any(f.endswith(".java") for f in os.listdir(path))),
-        "Kotlin": lambda path: any(f.endswith(('.kt', '.kts')) for f in os.listdir(path)),
-        "Go": lambda path: os.path.exists(os.path.join(path, 'go.mod')),
-        "Rust": lambda path: os.path.exists(os.path.join(path, 'Cargo.toml')),
-        "Ruby": lambda path: os.path.exists(os.path.join(path, 'Gemfile')),
-        "PHP": lambda path: os.path.exists(os.path.join(path, 'composer.json')) or \
-                            any(f.endswith('.php') for f in os.listdir(path)),
-        "Swift": lambda path: any(f.endswith('.swift') for f in os.listdir(path)),
-        "C++": lambda path: any(f.endswith(('.cpp', '.c', '.h', '.hpp')) for f in os.listdir(path)) or \
-                            os.path.exists(os.path.join(path, 'CMakeLists.txt')),
+        "Python": ext('.py') | name('requirements.txt'),
+        "Java": name('pom.xml') | (name('build.gradle') & ext('.java')),
+        "Kotlin": ext('.kt', '.kts'),
+        "Go": name('go.mod'),
+        "Rust": name('Cargo.toml'),
+        "Ruby": name('Gemfile'),
+        "PHP": name('composer.json') | ext('.php'),
+        "Swift": ext('.swift'),
+        "C++": ext('.cpp', '.c', '.h', '.hpp') | name('CMakeLists.txt'),
     },
     "Frameworks (Web y Fullstack)": {
-        
-        # --- INICIO DE LA CORRECCIÓN ---
         # La clave DEBE coincidir con el nombre del archivo de plantilla.
         # (Ej. "NodeJsTs" debe coincidir con "NodeJsTs.gitignore")
 
         # Regla para TypeScript: Detecta 'package.json' Y 'tsconfig.json'.
-        "NodeJsTs": lambda path: os.path.exists(os.path.join(path, 'package.json')) and \
-                                 os.path.exists(os.path.join(path, 'tsconfig.json')),
-        
+        "NodeJsTs": name('package.json') & name('tsconfig.json'),
+
         # Regla para JavaScript: Detecta 'package.json' pero NO 'tsconfig.json'.
         # Se coloca después de 'NodeJsTs' para que tenga menor prioridad.
-        "Node": lambda path: os.path.exists(os.path.join(path, 'package.json')) and \
-                             not os.path.exists(os.path.join(path, 'tsconfig.json')),
-        
-        # --- FIN DE LA CORRECCIÓN ---
-
-        "Angular": lambda path: os.path.exists(os.path.join(path, 'angular.json')),
-        "React": lambda path: os.path.exists(os.path.join(path, 'public/index.html')) and \
-                              os.path.exists(os.path.join(path, 'src/index.js')),
-        "Vue": lambda path: os.path.exists(os.path.join(path, 'vue.config.js')) or \
-                           os.path.exists(os.path.join(path, 'src/main.js')),
-        "Svelte": lambda path: os.path.exists(os.path.join(path, 'svelte.config.js')),
-        "NextJS": lambda path: os.path.exists(os.path.join(path, 'next.config.js')),
-        "Astro": lambda path: any(f.startswith('astro.config.') for f in os.listdir(path)),
-        "Django": lambda path: os.path.exists(os.path.join(path, 'manage.py')),
-        "Laravel": lambda path: os.path.exists(os.path.join(path, 'artisan')),
+        "Node": name('package.json') & ~name('tsconfig.json'),
+
+        "Angular": name('angular.json'),
+        "React": name('public/index.html') & name('src/index.js'),
+        "Vue": name('vue.config.js', 'src/main.js'),
+        "Svelte": name('svelte.config.js'),
+        "NextJS": name('next.config.js'),
+        "Astro": prefix('astro.config.'),
+        "Django": name('manage.py'),
+        "Laravel": name('artisan'),
     },
     "Frameworks (Móvil)": {
-        "Flutter": lambda path: os.path.exists(os.path.join(path, 'pubspec.yaml')),
-        "ReactNative": lambda path: os.path.exists(os.path.join(path, 'app.json')),
+        "Flutter": name('pubspec.yaml'),
+        "ReactNative": name('app.json'),
     },
     "Bases de Datos y ORMs": {
-        "Prisma": lambda path: os.path.isdir(os.path.join(path, 'prisma')),
-        "SQLite": lambda path: any(f.endswith(('.db', '.sqlite', '.sqlite3')) for f in os.listdir(path)),
-        "MySQL": lambda path: os.path.exists(os.path.join(path, 'my.cnf')) or any(f.endswith('.mysql') for f in os.listdir(path)),
-        "PostgreSQL": lambda path: os.path.exists(os.path.join(path, 'postgresql.conf')) or any(f.endswith('.pgdump') for f in os.listdir(path)),
-        "SQLServer": lambda path: any(f.endswith(('.mdf', '.ldf')) for f in os.listdir(path)),
-        "MongoDB": lambda path: os.path.exists(os.path.join(path, 'mongod.conf')),
-        "Redis": lambda path: os.path.exists(os.path.join(path, 'redis.conf')) or os.path.exists(os.path.join(path, 'dump.rdb')),
+        "Prisma": directory('prisma'),
+        "SQLite": ext('.db', '.sqlite', '.sqlite3'),
+        "MySQL": name('my.cnf') | ext('.mysql'),
+        "PostgreSQL": name('postgresql.conf') | ext('.pgdump'),
+        "SQLServer": ext('.mdf', '.ldf'),
+        "MongoDB": name('mongod.conf'),
+        "Redis": name('redis.conf', 'dump.rdb'),
     },
-
-    # --- NUEVA CATEGORÍA PARA SECRETOS ---
     "Secretos y Configuración": {
-        "DotEnv": lambda path: any(f.startswith('.env') for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))),
+        "DotEnv": prefix('.env', files_only=True),
     },
-    # --- FIN NUEVA CATEGORÍA ---
-
     "Motores de Videojuegos": {
-        "Unity": lambda path: os.path.isdir(os.path.join(path, 'Assets')) and \
-                              os.path.isdir(os.path.join(path, 'ProjectSettings')),
+        "Unity": directory('Assets') & directory('ProjectSettings'),
     },
     "IDEs y Plataformas": {
-        "VisualStudio": lambda path: any(f.endswith(('.sln', '.csproj', '.fsproj', '.vbproj')) for f in os.listdir(path)),
-        "VisualStudioCode": lambda path: os.path.isdir(os.path.join(path, '.vscode')),
-        "JetBrains": lambda path: os.path.isdir(os.path.join(path, '.idea')),
-        "Xcode": lambda path: os.path.isdir(os.path.join(path, '.xcodeproj')) or \
-                           os.path.isdir(os.path.join(path, '.xcworkspace')),
-        "AndroidStudio": lambda path: os.path.exists(os.path.join(path, 'settings.gradle')),
+        "VisualStudio": ext('.sln', '.csproj', '.fsproj', '.vbproj'),
+        "VisualStudioCode": directory('.vscode'),
+        "JetBrains": directory('.idea'),
+        "Xcode": directory('.xcodeproj', '.xcworkspace'),
+        "AndroidStudio": name('settings.gradle'),
     },
     "Sistemas Operativos": {
-        "Windows": lambda path: platform.system() == "Windows",
-        "macOS": lambda path: platform.system() == "Darwin",
+        "Windows": platform_is("Windows"),
+        "macOS": platform_is("Darwin"),
     },
 }
 
-def detect_technologies(project_path: str) -> Tuple[List[str], Dict[str, List[str]]]:
+# Con sniff_manifests=True, estas tecnologías se deciden por las dependencias
+# declaradas en los manifiestos (package.json, pyproject.toml,
+# requirements.txt, Pipfile, composer.json). Si el proyecto no tiene un
+# manifiesto legible de ese ecosistema, se usa la regla por nombres de arriba.
+MANIFEST_DETECTION_RULES: Dict[str, DetectionRule] = {
+    "NextJS": depends_on('npm', 'next'),
+    "React": depends_on('npm', 'react') & ~depends_on('npm', 'next', 'react-native', 'expo'),
+    "Vue": depends_on('npm', 'vue', 'nuxt'),
+    "Angular": depends_on('npm', '@angular/core'),
+    "ReactNative": depends_on('npm', 'react-native', 'expo'),
+    "Django": depends_on('pypi', 'django'),
+}
+
+
+def _with_manifest_rules(
+    rules: Dict[str, Dict[str, DetectionRule]], content_rules: Dict[str, DetectionRule]
+) -> Dict[str, Dict[str, DetectionRule]]:
+    return {
+        category: {
+            tech: sniffed(content_rules[tech], condition) if tech in content_rules else condition
+            for tech, condition in techs.items()
+        }
+        for category, techs in rules.items()
+    }
+
+
+COMPILED_RULES = compile_rules(CATEGORIZED_DETECTION_RULES)
+COMPILED_SNIFFING_RULES = compile_rules(
+    _with_manifest_rules(CATEGORIZED_DETECTION_RULES, MANIFEST_DETECTION_RULES)
+)
+
+
+def get_compiled_rules(sniff_manifests: bool = False) -> CompiledRuleSet:
+    """The rule set used by detect_technologies() for the given mode."""
+    return COMPILED_SNIFFING_RULES if sniff_manifests else COMPILED_RULES
+
+
+def detect_technologies(
+    project_path: str,
+    stats: Optional[ScanStats] = None,
+    profile: Optional[DetectionProfile] = None,
+    sniff_manifests: bool = False,
+) -> Tuple[List[str], Dict[str, List[str]]]:
     """
     Analyzes a directory to detect the technologies and tools used.
 
+    The directory is listed once into a DirectorySnapshot and the compiled
+    rule set fires every matching technology in a single pass over it.
+
+    Args:
+        project_path: The directory to analyze.
+        stats: Optional ScanStats that receives the number of filesystem
+               calls issued by this scan.
+        profile: Optional DetectionProfile that receives per-rule and
+                 per-category timings and filesystem calls. Without it,
+                 no instrumentation code runs.
+        sniff_manifests: Decide the technologies in MANIFEST_DETECTION_RULES
+                         from the dependencies declared in the project's
+                         manifests (one bounded read per manifest, cached
+                         by mtime) instead of from file names.
+
     Returns:
         A tuple containing:
         - all_detected: A flat list of all detected technology names.
         - detected_by_category: A dictionary mapping categories to lists
           of detected technologies.
     """
-    if not os.path.isdir(project_path):
+    rules = get_compiled_rules(sniff_manifests)
+    if profile is not None:
+        return _detect_profiled(project_path, profile, rules)
+
+    try:
+        snapshot = DirectorySnapshot.scan(project_path, stats)
+    except OSError:
+        # No existe, no es un directorio o no se puede listar.
         return [], {}
 
-    all_detected = []
-    detected_by_category: Dict[str, List[str]] = {}
+    return rules.match(snapshot)
+
 
+def _detect_profiled(
+    project_path: str, profile: DetectionProfile, rules: CompiledRuleSet
+) -> Tuple[List[str], Dict[str, List[str]]]:
+    """detect_technologies() with instrumentation; see DetectionProfile."""
+    started = perf_counter()
     try:
-        # Intenta listar los archivos una vez.
-        # Las reglas (lambdas) aún pueden fallar si hay problemas de permisos
-        # en subdirectorios, por eso el 'try' principal se mantiene.
-        
-        for category, rules in CATEGORIZED_DETECTION_RULES.items():
-            detected_in_category = []
-            for tech, rule in rules.items():
-                if rule(project_path):
-                    detected_in_category.append(tech)
-            
-            if detected_in_category:
-                detected_by_category[category] = detected_in_category
-                all_detected.extend(detected_in_category)
-
-    except (OSError, FileNotFoundError) as e:
-        print(f"Could not fully analyze path {project_path}: {e}")
-
-    return sorted(list(set(all_detected))), detected_by_category
\ No newline at end of file
+        snapshot = DirectorySnapshot.scan(project_path, profile.stats)
+    except OSError:
+        return [], {}
+    profile.snapshot_seconds = perf_counter() - started
+
+    result = rules.match_profiled(snapshot, profile)
+    profile.total_seconds = perf_counter() - started
+    return result
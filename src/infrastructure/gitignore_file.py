@@ -0,0 +1,124 @@
+# src/infrastructure/gitignore_file.py
+
+import os
+import stat
+import tempfile
+from typing import Callable, List, NamedTuple, Optional
+
+from src.core.gitignore_merge import MergeResult, merge_gitignore, normalize_newlines, with_newline
+
+GITIGNORE_NAME = ".gitignore"
+
+
+def read_text(path: str) -> Optional[str]:
+    """Content of a UTF-8 text file, or None if it does not exist."""
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _current_umask() -> int:
+    """The process umask, read without changing it where the OS allows it."""
+    try:
+        # Linux: leerla de /proc evita cambiarla (os.umask es global al
+        # proceso y otro hilo podría crear un archivo mientras tanto).
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def write_atomic(path: str, content: str):
+    """
+    Writes 'content' to 'path' atomically: a temporary file in the same
+    directory is written, flushed to disk and renamed over the target, so
+    readers see either the old or the new file, never a partial one. The
+    permission bits of an existing file are kept; a new one gets the same
+    bits open() would give it (0o666 minus the umask), since mkstemp
+    creates the temporary file as 0o600.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".gitignore-genius-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o666 & ~_current_umask())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path: str, content: str, current: Optional[str] = None) -> bool:
+    """
+    Atomically writes 'content' unless the file already holds exactly that,
+    leaving its mtime (and git's view of it) untouched. 'current' skips
+    re-reading a file the caller just read. Returns True if it wrote.
+    """
+    if current is None:
+        current = read_text(path)
+    if current == content:
+        return False
+    write_atomic(path, content)
+    return True
+
+
+class UpdateResult(NamedTuple):
+    path: str
+    written: bool
+    merge: MergeResult
+
+
+def update_gitignore_file(
+    project_path: str,
+    selected_technologies: List[str],
+    template_loader_func: Callable[[str], str],
+    transform: Optional[Callable[[str], str]] = None,
+) -> UpdateResult:
+    """
+    Merges 'selected_technologies' into the project's .gitignore (see
+    merge_gitignore) and writes it only if the result differs, ignoring
+    line endings: a CRLF file keeps CRLF and is not rewritten when only
+    its endings would change.
+
+    Args:
+        project_path: Directory holding the .gitignore (created if missing).
+        selected_technologies: Technologies the file should contain.
+        template_loader_func: Returns a template's content.
+        transform: Optional post-processing of the merged text
+                   (e.g. the optimized merge).
+
+    Raises:
+        FileNotFoundError: If a template file cannot be found by the loader.
+        OSError: If the file cannot be read or written.
+    """
+    path = os.path.join(project_path, GITIGNORE_NAME)
+    current = read_text(path)
+    merge = merge_gitignore(current or '', selected_technologies, template_loader_func)
+    content = merge.text
+    if transform:
+        content = with_newline(transform(normalize_newlines(content)), merge.newline)
+    if current is None and not content:
+        return UpdateResult(path, False, merge)
+    if current is not None and normalize_newlines(content) == normalize_newlines(current):
+        # Sólo difieren (o ni eso) los fines de línea: el archivo no se toca.
+        return UpdateResult(path, False, merge)
+    return UpdateResult(path, write_if_changed(path, content, current or ''), merge)
@@ -0,0 +1,80 @@
+# src/infrastructure/ignore_preview.py
+
+import os
+from typing import List, Optional
+
+from src.core.ignore_matcher import GitignoreMatcher
+
+DEFAULT_MAX_PREVIEW_ENTRIES = 200_000
+
+
+class IgnorePreview:
+    """
+    Which paths of a project a .gitignore would ignore.
+
+    Attributes:
+        ignored_dirs: Ignored directories (relative, '/'-separated). Their
+                      contents are not listed: git never looks inside them.
+        ignored_files: Ignored files outside of ignored directories.
+        entries_checked: Number of paths evaluated.
+        truncated: True if 'max_entries' stopped the walk early.
+    """
+
+    def __init__(self):
+        self.ignored_dirs: List[str] = []
+        self.ignored_files: List[str] = []
+        self.entries_checked = 0
+        self.truncated = False
+
+
+def preview_ignored(
+    project_path: str,
+    gitignore_text: str,
+    max_entries: Optional[int] = DEFAULT_MAX_PREVIEW_ENTRIES,
+    matcher: Optional[GitignoreMatcher] = None,
+) -> IgnorePreview:
+    """
+    Walks 'project_path' with os.scandir and evaluates every entry against
+    the compiled 'gitignore_text', without descending into ignored
+    directories (nor into '.git').
+
+    Args:
+        project_path: Root of the project.
+        gitignore_text: Content of the .gitignore to evaluate.
+        max_entries: Stop after evaluating this many paths (None = no cap).
+        matcher: A precompiled matcher (overrides 'gitignore_text').
+
+    Returns:
+        An IgnorePreview with the ignored directories and files, sorted.
+    """
+    matcher = matcher or GitignoreMatcher.from_text(gitignore_text)
+    preview = IgnorePreview()
+    stack = ['']
+
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(project_path, relative_dir)) as it:
+                entries = [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in it]
+        except OSError:
+            continue
+
+        for name, is_dir in entries:
+            if max_entries is not None and preview.entries_checked >= max_entries:
+                preview.truncated = True
+                stack.clear()
+                break
+            if is_dir and name == '.git':
+                continue
+            relative = f"{relative_dir}/{name}" if relative_dir else name
+            preview.entries_checked += 1
+            # El padre nunca está ignorado (no se desciende en ellos), así que
+            # basta con la decisión de las reglas sobre la propia ruta.
+            if matcher.match(relative, is_dir) is True:
+                (preview.ignored_dirs if is_dir else preview.ignored_files).append(relative)
+            elif is_dir:
+                stack.append(relative)
+
+    preview.ignored_dirs.sort()
+    preview.ignored_files.sort()
+    return preview
@@ -0,0 +1,201 @@
+# src/infrastructure/manifest_sniffer.py
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:  # pragma: no cover - Python 3.10
+    tomllib = None
+
+from src.infrastructure.directory_snapshot import DirectorySnapshot
+
+# Un manifiesto más grande que esto no se interpreta (se usan las reglas por
+# nombre): evita que un archivo enorme o generado ralentice el análisis.
+MAX_MANIFEST_BYTES = 256 * 1024
+DEFAULT_MAX_CACHED_MANIFESTS = 4096
+
+# Manifiestos de cada ecosistema, en orden de preferencia.
+ECOSYSTEM_MANIFESTS: Dict[str, Tuple[str, ...]] = {
+    'npm': ('package.json',),
+    'pypi': ('pyproject.toml', 'requirements.txt', 'Pipfile'),
+    'composer': ('composer.json',),
+}
+
+_REQUIREMENT_NAME = re.compile(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+
+
+def normalize_package(ecosystem: str, package: str) -> str:
+    """Canonical package name: case-insensitive, and PEP 503 for Python."""
+    package = package.strip().lower()
+    if ecosystem == 'pypi':
+        package = re.sub(r'[-_.]+', '-', package)
+    return package
+
+
+def _requirement_name(requirement: str) -> Optional[str]:
+    """'Django>=4.2; python_version>"3.8"' -> 'Django'."""
+    match = _REQUIREMENT_NAME.match(requirement)
+    return match.group(1) if match else None
+
+
+# --- Intérpretes (texto -> nombres de paquetes declarados) ---
+
+def parse_package_json(text: str) -> FrozenSet[str]:
+    data = json.loads(text)
+    names = set()
+    for section in ('dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies'):
+        names.update(data.get(section) or {})
+    return frozenset(normalize_package('npm', n) for n in names)
+
+
+def parse_composer_json(text: str) -> FrozenSet[str]:
+    data = json.loads(text)
+    names = set(data.get('require') or {}) | set(data.get('require-dev') or {})
+    return frozenset(normalize_package('composer', n) for n in names)
+
+
+def parse_requirements(text: str) -> FrozenSet[str]:
+    names = set()
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line or line.startswith('-'):
+            continue  # opciones como '-r otro.txt' o '-e .'
+        name = _requirement_name(line)
+        if name:
+            names.add(normalize_package('pypi', name))
+    return frozenset(names)
+
+
+def parse_pyproject(text: str) -> FrozenSet[str]:
+    data = tomllib.loads(text)
+    names = set()
+    project = data.get('project') or {}
+    requirements = list(project.get('dependencies') or [])
+    for group in (project.get('optional-dependencies') or {}).values():
+        requirements.extend(group)
+    names.update(filter(None, map(_requirement_name, requirements)))
+
+    poetry = (data.get('tool') or {}).get('poetry') or {}
+    names.update(poetry.get('dependencies') or {})
+    names.update(poetry.get('dev-dependencies') or {})
+    for group in (poetry.get('group') or {}).values():
+        names.update(group.get('dependencies') or {})
+    names.discard('python')
+    return frozenset(normalize_package('pypi', n) for n in names)
+
+
+def parse_pipfile(text: str) -> FrozenSet[str]:
+    data = tomllib.loads(text)
+    names = set(data.get('packages') or {}) | set(data.get('dev-packages') or {})
+    return frozenset(normalize_package('pypi', n) for n in names)
+
+
+MANIFEST_PARSERS: Dict[str, Tuple[Callable[[str], FrozenSet[str]], bool]] = {
+    # nombre -> (intérprete, admite contenido truncado)
+    'package.json': (parse_package_json, False),
+    'composer.json': (parse_composer_json, False),
+    'requirements.txt': (parse_requirements, True),
+    'pyproject.toml': (parse_pyproject, False),
+    'Pipfile': (parse_pipfile, False),
+}
+
+
+class ManifestCache:
+    """
+    Parsed manifests keyed by path and validated by (mtime, size).
+
+    An unchanged manifest costs one stat and no read; a new or modified one
+    is read once, at most MAX_MANIFEST_BYTES. Manifests that cannot be
+    parsed (invalid, too large, missing TOML support) are cached as None.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_CACHED_MANIFESTS):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, int, Optional[FrozenSet[str]]]]" = OrderedDict()
+
+    def dependencies(self, path: str, snapshot: DirectorySnapshot) -> Optional[FrozenSet[str]]:
+        """Declared packages of the manifest at 'path', or None if unusable."""
+        parser, accepts_truncated = MANIFEST_PARSERS[os.path.basename(path)]
+        stats = snapshot.stats
+        try:
+            stats.stat_calls += 1
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                self._entries.move_to_end(path)
+                return cached[2]
+
+        dependencies: Optional[FrozenSet[str]] = None
+        try:
+            stats.read_calls += 1
+            with open(path, 'rb') as f:
+                raw = f.read(MAX_MANIFEST_BYTES + 1)
+            truncated = len(raw) > MAX_MANIFEST_BYTES
+            if truncated and accepts_truncated:
+                raw = raw[:raw.rfind(b'\n', 0, MAX_MANIFEST_BYTES) + 1]
+            if not truncated or accepts_truncated:
+                dependencies = parser(raw.decode('utf-8', errors='replace'))
+        except (OSError, ValueError, TypeError, AttributeError):
+            # JSON/TOML inválido, estructura inesperada o sin tomllib.
+            dependencies = None
+
+        with self._lock:
+            self._entries[path] = (st.st_mtime_ns, st.st_size, dependencies)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return dependencies
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache = ManifestCache()
+
+
+class ManifestSniffer:
+    """
+    The manifests of one DirectorySnapshot, parsed lazily and at most once
+    per scan: every rule asking about the same ecosystem shares the result.
+    """
+
+    def __init__(self, snapshot: DirectorySnapshot, cache: Optional[ManifestCache] = None):
+        self.snapshot = snapshot
+        self.cache = cache or _default_cache
+        self._ecosystems: Dict[str, Optional[FrozenSet[str]]] = {}
+
+    def dependencies(self, ecosystem: str) -> Optional[FrozenSet[str]]:
+        """
+        Packages declared in the ecosystem's manifests present in the
+        directory, or None if none of them exists or can be parsed.
+        """
+        if ecosystem not in self._ecosystems:
+            found: Optional[FrozenSet[str]] = None
+            for manifest in ECOSYSTEM_MANIFESTS.get(ecosystem, ()):
+                if manifest not in self.snapshot.files:
+                    continue
+                parsed = self.cache.dependencies(
+                    os.path.join(self.snapshot.path, manifest), self.snapshot
+                )
+                if parsed is not None:
+                    found = parsed if found is None else found | parsed
+            self._ecosystems[ecosystem] = found
+        return self._ecosystems[ecosystem]
+
+    def has_manifest(self, ecosystem: str) -> bool:
+        return self.dependencies(ecosystem) is not None
+
+    def depends_on(self, ecosystem: str, package: str) -> bool:
+        dependencies = self.dependencies(ecosystem)
+        return dependencies is not None and normalize_package(ecosystem, package) in dependencies
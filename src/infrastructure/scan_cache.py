@@ -0,0 +1,276 @@
+# src/infrastructure/scan_cache.py
+
+import json
+import os
+import platform
+import sqlite3
+import stat
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.infrastructure.directory_snapshot import ScanStats
+from src.infrastructure.file_analyzer import COMPILED_RULES, detect_technologies, get_compiled_rules
+
+DEFAULT_MAX_CACHE_ENTRIES = 20_000
+# Aciertos que se guardan también en memoria (LRU, nunca más que la tabla).
+DEFAULT_MAX_MEMORY_ENTRIES = 256
+
+# Un acierto sólo reescribe 'last_used' si es más antiguo que esto (segundos),
+# para que los re-escaneos masivos no se conviertan en escrituras.
+LAST_USED_RESOLUTION = 3600
+
+# Manifiestos cuyo contenido puede cambiar sin que cambie el mtime del
+# directorio (editar un archivo no modifica la carpeta que lo contiene).
+MANIFEST_FILES = (
+    'package.json', 'tsconfig.json', 'Cargo.toml', 'go.mod', 'pyproject.toml',
+    'requirements.txt', 'Pipfile', 'composer.json', 'pom.xml', 'build.gradle',
+    'Gemfile', 'pubspec.yaml', 'app.json', 'angular.json',
+)
+
+DetectionResult = Tuple[List[str], Dict[str, List[str]]]
+# Copia inmutable de un DetectionResult: la que se guarda en memoria.
+FrozenResult = Tuple[Tuple[str, ...], Tuple[Tuple[str, Tuple[str, ...]], ...]]
+
+
+def _freeze(result: DetectionResult) -> FrozenResult:
+    all_detected, detected_by_category = result
+    return (tuple(all_detected),
+            tuple((category, tuple(techs)) for category, techs in detected_by_category.items()))
+
+
+def _thaw(frozen: FrozenResult) -> DetectionResult:
+    return list(frozen[0]), {category: list(techs) for category, techs in frozen[1]}
+
+
+def get_user_cache_dir() -> str:
+    """Per-user cache directory for GitIgnore Genius, following each OS' convention."""
+    system = platform.system()
+    if system == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif system == "Darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "GitIgnoreGenius")
+
+
+def directory_fingerprint(project_path: str) -> Optional[str]:
+    """
+    Cheap fingerprint of a project directory: its mtime and inode, the
+    mtime and size of the known manifests and the mtime of the
+    subdirectories the rules look into. A handful of stat calls, no
+    directory listing. Returns None if 'project_path' is not a directory.
+    """
+    try:
+        st = os.stat(project_path)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+
+    parts = [f"{st.st_mtime_ns}:{st.st_ino}"]
+    for name in MANIFEST_FILES:
+        try:
+            mst = os.stat(os.path.join(project_path, name))
+            parts.append(f"{mst.st_mtime_ns}:{mst.st_size}")
+        except OSError:
+            parts.append("-")
+    for name in COMPILED_RULES.nested_directories:
+        try:
+            parts.append(str(os.stat(os.path.join(project_path, name)).st_mtime_ns))
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+class ScanCache:
+    """
+    On-disk cache (SQLite) of detect_technologies results.
+
+    Entries are keyed by absolute path and are only valid while both the
+    directory fingerprint and the rule-set version match. The table is
+    bounded to 'max_entries' rows, evicting the least recently used ones.
+    The most recently used hits are also kept in memory (an LRU of at most
+    'max_memory_entries'), so repeated lookups of an unchanged project in
+    the same process cost the fingerprint stats plus a dict lookup. Memory
+    entries are stored frozen and every caller gets its own copy. Any
+    SQLite error, or a row that cannot be decoded (it is then deleted),
+    degrades to a cache miss.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_CACHE_ENTRIES,
+        rules_version: Optional[str] = None,
+        max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+    ):
+        self.db_path = db_path or os.path.join(get_user_cache_dir(), "scan_cache.sqlite3")
+        self.max_entries = max_entries
+        self.max_memory_entries = min(max_memory_entries, max_entries)
+        self.rules_version = rules_version or COMPILED_RULES.version
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._memory: "OrderedDict[str, Tuple[str, str, FrozenResult]]" = OrderedDict()
+
+    def _remember(self, key: str, fingerprint: str, rules_version: str, frozen: FrozenResult):
+        """Stores a memory entry as the most recent one, evicting the oldest (lock held)."""
+        self._memory[key] = (fingerprint, rules_version, frozen)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scans ("
+                " path TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " rules_version TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS scans_last_used ON scans(last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, project_path: str, fingerprint: str,
+            rules_version: Optional[str] = None) -> Optional[DetectionResult]:
+        """
+        Returns the cached result if it is still valid, else None.
+        'rules_version' overrides the cache's own (e.g. manifest sniffing).
+        """
+        key = os.path.abspath(project_path)
+        rules_version = rules_version or self.rules_version
+        with self._lock:
+            memory = self._memory.get(key)
+            if memory is not None and memory[0] == fingerprint and memory[1] == rules_version:
+                self._memory.move_to_end(key)
+                return _thaw(memory[2])
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT result, last_used FROM scans"
+                    " WHERE path = ? AND fingerprint = ? AND rules_version = ?",
+                    (key, fingerprint, rules_version)
+                ).fetchone()
+                if row is None:
+                    return None
+                data = json.loads(row[0])
+                result = (data["all_detected"], data["detected_by_category"])
+                if not isinstance(result[0], list) or not isinstance(result[1], dict):
+                    raise TypeError("unexpected cached result shape")
+                frozen = _freeze(result)
+                now = time.time()
+                if now - row[1] > LAST_USED_RESOLUTION:
+                    conn.execute("UPDATE scans SET last_used = ? WHERE path = ?", (now, key))
+                    conn.commit()
+            except sqlite3.Error:
+                return None
+            except (ValueError, KeyError, TypeError):
+                # Fila corrupta o de un formato anterior: se descarta como un fallo.
+                self._discard(key)
+                return None
+            self._remember(key, fingerprint, rules_version, frozen)
+            return result
+
+    def _discard(self, key: str):
+        """Deletes the row of 'key' (lock held); SQLite errors are ignored."""
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM scans WHERE path = ?", (key,))
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def put(self, project_path: str, fingerprint: str, result: DetectionResult,
+            rules_version: Optional[str] = None):
+        """Stores a result and evicts the least recently used rows beyond the bound."""
+        key = os.path.abspath(project_path)
+        rules_version = rules_version or self.rules_version
+        payload = json.dumps({"all_detected": result[0], "detected_by_category": result[1]})
+        frozen = _freeze(result)
+        with self._lock:
+            self._remember(key, fingerprint, rules_version, frozen)
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO scans VALUES (?, ?, ?, ?, ?)",
+                    (key, fingerprint, rules_version, payload, time.time())
+                )
+                (count,) = conn.execute("SELECT COUNT(*) FROM scans").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM scans WHERE path IN ("
+                        " SELECT path FROM scans ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            try:
+                self._connect().execute("DELETE FROM scans")
+                self._connect().commit()
+            except sqlite3.Error:
+                pass
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache: Optional[ScanCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_scan_cache() -> ScanCache:
+    """Returns the shared ScanCache of this process."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ScanCache()
+    return _default_cache
+
+
+def cached_detect_technologies(
+    project_path: str,
+    cache: Optional[ScanCache] = None,
+    stats: Optional[ScanStats] = None,
+    sniff_manifests: bool = False,
+) -> DetectionResult:
+    """
+    detect_technologies() answered from the scan cache when the project has
+    not changed since it was last analyzed.
+
+    The fingerprint is taken before scanning, so a change made during the
+    scan invalidates the stored entry on the next lookup. It covers the
+    manifests' mtime and size, and results with and without manifest
+    sniffing are told apart by their rule-set version.
+    """
+    cache = cache or get_scan_cache()
+    fingerprint = directory_fingerprint(project_path)
+    if fingerprint is None:
+        return [], {}
+
+    rules_version = get_compiled_rules(sniff_manifests).version if sniff_manifests else None
+    cached = cache.get(project_path, fingerprint, rules_version)
+    if cached is not None:
+        return cached
+
+    result = detect_technologies(project_path, stats, sniff_manifests=sniff_manifests)
+    cache.put(project_path, fingerprint, result, rules_version)
+    return result
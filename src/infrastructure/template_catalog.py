@@ -0,0 +1,78 @@
+# src/infrastructure/template_catalog.py
+
+from typing import Dict, List, Optional, Tuple
+
+from src.core.template_search import SearchEntry, TemplateSearchIndex
+from src.infrastructure.template_loader import TemplateRepository, get_template_repository
+
+# Categoría de las plantillas que no tienen regla de detección.
+UNCATEGORIZED = "Otras plantillas"
+
+# Nombres alternativos con los que se suele buscar una plantilla.
+# La clave debe coincidir con el nombre del archivo de plantilla.
+TEMPLATE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Node": ("JavaScript", "js", "npm", "yarn", "nodejs"),
+    "NodeJsTs": ("TypeScript", "ts", "tsc"),
+    "Python": ("py", "pip", "venv", "virtualenv"),
+    "C++": ("cpp", "C", "cmake"),
+    "Go": ("golang",),
+    "Rust": ("cargo",),
+    "Ruby": ("rb", "bundler", "rails"),
+    "Kotlin": ("kt", "gradle"),
+    "Java": ("maven", "jvm"),
+    "NextJS": ("next",),
+    "ReactNative": ("expo", "rn"),
+    "Flutter": ("dart",),
+    "PostgreSQL": ("postgres", "psql", "pg"),
+    "SQLServer": ("mssql", "sql server"),
+    "MongoDB": ("mongo",),
+    "DotEnv": ("env", "secrets", "secretos"),
+    "VisualStudioCode": ("vscode", "code"),
+    "VisualStudio": ("vs", "msbuild", "csharp", "dotnet"),
+    "JetBrains": ("IntelliJ", "PyCharm", "WebStorm", "idea", "Rider"),
+    "macOS": ("mac", "osx", "darwin", "DS_Store"),
+    "Windows": ("win", "Thumbs.db"),
+    "Unity": ("unity3d",),
+}
+
+
+def build_template_catalog(
+    repository: Optional[TemplateRepository] = None,
+) -> Dict[str, List[str]]:
+    """
+    Every available template grouped by category: the categories of
+    CATEGORIZED_DETECTION_RULES (in their order, only templates that exist)
+    followed by UNCATEGORIZED with the templates that have no rule.
+
+    A repository served from a TemplatePack uses the catalog stored in the
+    pack, so startup does not import (nor compile) the detection rules.
+    """
+    repository = repository or get_template_repository()
+    if repository.pack is not None and repository.pack.catalog:
+        return {category: list(names) for category, names in repository.pack.catalog.items()}
+
+    # Import diferido: las reglas sólo hacen falta para construir el catálogo.
+    from src.infrastructure.file_analyzer import CATEGORIZED_DETECTION_RULES
+    available = set(repository.names())
+    catalog: Dict[str, List[str]] = {}
+    listed = set()
+
+    for category, rules in CATEGORIZED_DETECTION_RULES.items():
+        names = [tech for tech in rules if tech in available]
+        if names:
+            catalog[category] = names
+            listed.update(names)
+
+    others = sorted(available - listed, key=str.lower)
+    if others:
+        catalog[UNCATEGORIZED] = others
+    return catalog
+
+
+def build_search_index(catalog: Dict[str, List[str]]) -> TemplateSearchIndex:
+    """Search index over the names, aliases and categories of a catalog."""
+    return TemplateSearchIndex(
+        SearchEntry(tech, category, TEMPLATE_ALIASES.get(tech, ()))
+        for category, names in catalog.items()
+        for tech in names
+    )
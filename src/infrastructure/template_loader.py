@@ -2,13 +2,230 @@
 
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
-def get_template_content(technology_name: str) -> str:
+from src.infrastructure.template_pack import TemplatePack, load_default_pack
+
+TEMPLATE_EXTENSION = ".gitignore"
+
+# Suficiente para mantener en memoria toda la biblioteca actual; sólo
+# entra en juego si el corpus de plantillas crece mucho.
+DEFAULT_MAX_CACHED_TEMPLATES = 256
+
+# En desarrollo, cada plantilla se re-valida (un stat) como mucho una vez
+# por intervalo. En builds congelados (PyInstaller) nunca.
+DEFAULT_REVALIDATE_INTERVAL = 2.0
+
+
+def is_frozen() -> bool:
+    """True when running inside a PyInstaller bundle."""
+    return bool(getattr(sys, 'frozen', False))
+
+
+def get_templates_dir() -> str:
     """
-    Retrieves the content of a specific .gitignore template.
+    Returns the directory holding the .gitignore templates.
 
     This function is designed to work both in a normal execution and when
     packaged by PyInstaller.
+    """
+    if is_frozen():
+        # Running in a PyInstaller bundle
+        base_path = sys._MEIPASS
+    else:
+        # Running in a normal Python environment
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, 'templates')
+
+
+class TemplateRepository:
+    """
+    Serves .gitignore templates from memory.
+
+    The templates directory is indexed once (one os.scandir) and each
+    template is read the first time it is requested. After that, lookups
+    do no file I/O: in frozen builds the contents are immutable, and in
+    development each entry is re-validated by mtime at most once every
+    'revalidate_interval' seconds so edited templates are picked up.
+    Contents live in a bounded LRU of 'max_cached' entries.
+
+    When a TemplatePack is given (by default, the one bundled in frozen
+    builds) templates are served from it instead: one memory-mapped file
+    rather than dozens of loose ones, and never re-validated.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Optional[str] = None,
+        max_cached: int = DEFAULT_MAX_CACHED_TEMPLATES,
+        revalidate_interval: Optional[float] = DEFAULT_REVALIDATE_INTERVAL,
+        immutable: Optional[bool] = None,
+        pack: Optional[TemplatePack] = None,
+    ):
+        """
+        Args:
+            templates_dir: Directory to serve (default: get_templates_dir()).
+            max_cached: Maximum number of template contents kept in memory.
+            revalidate_interval: Seconds between mtime checks of a cached
+                                 template. Ignored when immutable.
+            immutable: Never re-validate (default: True in frozen builds).
+            pack: Serve templates from this pack instead of 'templates_dir'.
+        """
+        self.pack = pack
+        self.templates_dir = templates_dir or get_templates_dir()
+        self.max_cached = max_cached
+        self.immutable = (is_frozen() or pack is not None) if immutable is None else immutable
+        self.revalidate_interval = revalidate_interval
+        self._lock = threading.RLock()
+        self._index: Optional[Dict[str, str]] = None
+        # name -> (content, mtime_ns, checked_at)
+        self._cache: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+
+    # --- Índice ---
+
+    def _get_index(self) -> Dict[str, str]:
+        if self._index is None:
+            if self.pack is not None:
+                self._index = {name: self.pack.path for name in self.pack.names()}
+                return self._index
+            index: Dict[str, str] = {}
+            try:
+                with os.scandir(self.templates_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(TEMPLATE_EXTENSION) and entry.is_file():
+                            index[entry.name[:-len(TEMPLATE_EXTENSION)]] = entry.path
+            except OSError:
+                pass
+            self._index = index
+        return self._index
+
+    def names(self) -> List[str]:
+        """Sorted names of all available templates."""
+        with self._lock:
+            return sorted(self._get_index())
+
+    def __contains__(self, technology_name: str) -> bool:
+        with self._lock:
+            return technology_name in self._get_index()
+
+    # --- Contenido ---
+
+    def get(self, technology_name: str) -> str:
+        """
+        Returns the content of a template.
+
+        Raises:
+            FileNotFoundError: If the template does not exist.
+            OSError: If there is an error reading the file.
+        """
+        return self._get_entry(technology_name)[0]
+
+    def version(self, technology_name: str) -> int:
+        """
+        Returns a value that changes whenever the template content changes
+        (its mtime in nanoseconds).
+
+        Raises:
+            FileNotFoundError: If the template does not exist.
+        """
+        return self._get_entry(technology_name)[1]
+
+    def _get_entry(self, technology_name: str) -> Tuple[str, int]:
+        with self._lock:
+            cached = self._cache.get(technology_name)
+            if cached is not None:
+                content, mtime_ns, checked_at = cached
+                if self._is_fresh(technology_name, mtime_ns, checked_at):
+                    self._cache.move_to_end(technology_name)
+                    return content, mtime_ns
+
+            if self.pack is not None:
+                content, mtime_ns = self.pack.get(technology_name)
+                self._store(technology_name, content, mtime_ns)
+                return content, mtime_ns
+
+            template_path = self._get_index().get(technology_name)
+            if template_path is None and not self.immutable:
+                # Quizás se añadió una plantilla nueva durante el desarrollo.
+                self._index = None
+                template_path = self._get_index().get(technology_name)
+            if template_path is None:
+                template_path = os.path.join(
+                    self.templates_dir, f"{technology_name}{TEMPLATE_EXTENSION}"
+                )
+                raise FileNotFoundError(
+                    2, "No such file or directory", template_path
+                )
+
+            # Let this raise FileNotFoundError or OSError if it fails.
+            # The UI layer will be responsible for catching it.
+            with open(template_path, 'r', encoding='utf-8') as f:
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                content = f.read()
+
+            self._store(technology_name, content, mtime_ns)
+            return content, mtime_ns
+
+    def _store(self, technology_name: str, content: str, mtime_ns: int):
+        self._cache[technology_name] = (content, mtime_ns, time.monotonic())
+        self._cache.move_to_end(technology_name)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _is_fresh(self, technology_name: str, mtime_ns: int, checked_at: float) -> bool:
+        if self.immutable or self.revalidate_interval is None:
+            return True
+        now = time.monotonic()
+        if now - checked_at < self.revalidate_interval:
+            return True
+        try:
+            current = os.stat(self._get_index()[technology_name]).st_mtime_ns
+        except (OSError, KeyError):
+            return False
+        if current != mtime_ns:
+            return False
+        content = self._cache[technology_name][0]
+        self._cache[technology_name] = (content, mtime_ns, now)
+        return True
+
+    def warm_up(self):
+        """Loads every template (or up to 'max_cached' of them) into memory."""
+        for name in self.names()[:self.max_cached]:
+            try:
+                self.get(name)
+            except OSError:
+                pass
+
+    def invalidate(self):
+        """Forgets the index and every cached template."""
+        with self._lock:
+            self._index = None
+            self._cache.clear()
+
+
+_default_repository: Optional[TemplateRepository] = None
+_default_repository_lock = threading.Lock()
+
+
+def get_template_repository() -> TemplateRepository:
+    """Returns the shared TemplateRepository used by get_template_content."""
+    global _default_repository
+    if _default_repository is None:
+        with _default_repository_lock:
+            if _default_repository is None:
+                _default_repository = TemplateRepository(pack=load_default_pack())
+    return _default_repository
+
+
+def get_template_content(technology_name: str) -> str:
+    """
+    Retrieves the content of a specific .gitignore template.
+
+    Templates are served from the shared in-memory TemplateRepository, so
+    only the first request for each one reads the disk.
 
     Args:
         technology_name: The name of the technology (e.g., 'Python', 'Node').
@@ -20,16 +237,9 @@ def get_template_content(technology_name: str) -> str:
         FileNotFoundError: If the template file cannot be found.
         OSError: If there is an error reading the file (e.g., permissions).
     """
-    if getattr(sys, 'frozen', False):
-        # Running in a PyInstaller bundle
-        base_path = sys._MEIPASS
-    else:
-        # Running in a normal Python environment
-        base_path = os.path.dirname(os.path.abspath(__file__))
+    return get_template_repository().get(technology_name)
 
-    template_path = os.path.join(base_path, 'templates', f"{technology_name}.gitignore")
 
-    # Let this raise FileNotFoundError or OSError if it fails.
-    # The UI layer will be responsible for catching it.
-    with open(template_path, 'r', encoding='utf-8') as f:
-        return f.read()
+def get_template_version(technology_name: str) -> int:
+    """Returns the current version (mtime) of a template. See TemplateRepository.version."""
+    return get_template_repository().version(technology_name)
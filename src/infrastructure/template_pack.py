@@ -0,0 +1,135 @@
+# src/infrastructure/template_pack.py
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Un único archivo con todas las plantillas y el catálogo (categorías de las
+# reglas de detección), generado al compilar con tools/build_template_pack.py.
+# Formato:
+#   PACK_MAGIC | longitud de la cabecera (uint32 LE) | cabecera JSON | contenidos
+# La cabecera indexa cada plantilla como [offset, longitud, versión]; los
+# contenidos se decodifican al pedirlos, directamente del archivo mapeado.
+PACK_NAME = "templates.pack"
+PACK_MAGIC = b"GIGPACK1"
+PACK_ENV_VAR = "GITIGNORE_GENIUS_PACK"
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+class TemplatePack:
+    """
+    Read-only view of a template pack, memory-mapped.
+
+    Opening it reads only the header (names, offsets, versions and the
+    catalog); each template is decoded the first time it is requested.
+    """
+
+    def __init__(self, path: str, entries: Dict[str, Tuple[int, int, int]],
+                 catalog: Dict[str, List[str]], data: mmap.mmap):
+        self.path = path
+        self.catalog = catalog
+        self._entries = entries
+        self._data = data
+
+    @classmethod
+    def open(cls, path: str) -> "TemplatePack":
+        """
+        Maps the pack at 'path' and parses its header.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If it is not a valid pack.
+        """
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = len(PACK_MAGIC) + _HEADER_LENGTH.size
+        if data[:len(PACK_MAGIC)] != PACK_MAGIC:
+            data.close()
+            raise ValueError(f"{path} no es un paquete de plantillas")
+        (header_length,) = _HEADER_LENGTH.unpack_from(data, len(PACK_MAGIC))
+        header = json.loads(data[start:start + header_length].decode('utf-8'))
+        base = start + header_length
+        entries = {
+            name: (base + offset, length, version)
+            for name, (offset, length, version) in header["templates"].items()
+        }
+        return cls(path, entries, header["catalog"], data)
+
+    def names(self) -> List[str]:
+        return sorted(self._entries)
+
+    def __contains__(self, technology_name: str) -> bool:
+        return technology_name in self._entries
+
+    def get(self, technology_name: str) -> Tuple[str, int]:
+        """
+        Returns (content, version) of a template.
+
+        Raises:
+            FileNotFoundError: If the pack has no such template.
+        """
+        entry = self._entries.get(technology_name)
+        if entry is None:
+            raise FileNotFoundError(
+                2, "No such template in pack", f"{self.path}:{technology_name}"
+            )
+        offset, length, version = entry
+        return self._data[offset:offset + length].decode('utf-8'), version
+
+
+def write_pack(path: str, templates: Dict[str, Tuple[str, int]], catalog: Dict[str, List[str]]):
+    """
+    Writes a pack with 'templates' (name -> (content, version)) and the
+    template 'catalog' (category -> names), replacing 'path' atomically.
+    """
+    blobs: List[bytes] = []
+    index: Dict[str, List[int]] = {}
+    offset = 0
+    for name in sorted(templates):
+        content, version = templates[name]
+        blob = content.encode('utf-8')
+        index[name] = [offset, len(blob), version]
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({"templates": index, "catalog": catalog},
+                        ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(PACK_MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temp_path, path)
+
+
+def get_pack_path() -> Optional[str]:
+    """
+    The pack to serve templates from, or None to use the loose files:
+    $GITIGNORE_GENIUS_PACK if set, otherwise the one bundled next to the
+    executable in frozen builds (if the build included it).
+    """
+    path = os.environ.get(PACK_ENV_VAR)
+    if path:
+        return path
+    if getattr(sys, 'frozen', False):
+        path = os.path.join(sys._MEIPASS, PACK_NAME)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def load_default_pack() -> Optional[TemplatePack]:
+    """Opens get_pack_path(), or returns None if there is none or it is unusable."""
+    path = get_pack_path()
+    if path is None:
+        return None
+    try:
+        return TemplatePack.open(path)
+    except (OSError, ValueError, KeyError):
+        return None
@@ -0,0 +1,227 @@
+# src/infrastructure/tree_scanner.py
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from src.infrastructure.directory_snapshot import DirectorySnapshot, ScanStats
+from src.infrastructure.detection_rules import CompiledRuleSet
+from src.infrastructure.file_analyzer import COMPILED_RULES, get_compiled_rules
+
+# Carpetas que nunca se recorren: dependencias, artefactos de build y
+# metadatos de VCS. Se descartan antes de listarlas.
+PRUNED_DIRECTORIES: FrozenSet[str] = frozenset({
+    'node_modules', '.git', '.hg', '.svn',
+    'venv', '.venv', '__pycache__',
+    'target', 'build',
+})
+
+DEFAULT_MAX_DEPTH = 4
+DEFAULT_MAX_ENTRIES = 500_000
+DEFAULT_TIME_LIMIT = 10.0
+
+# Intervalo mínimo entre dos notificaciones de progreso (segundos).
+PROGRESS_INTERVAL = 0.1
+
+
+class ScanProgress(NamedTuple):
+    """Snapshot of a running scan, passed to the progress callback."""
+    directories_scanned: int
+    entries: int
+    detected: List[str]
+
+
+class TreeScanResult:
+    """
+    Result of a recursive scan.
+
+    Attributes:
+        all_detected: Aggregate flat list of detected technologies.
+        detected_by_category: Aggregate detections grouped by category.
+        by_directory: Detections per directory, keyed by the path relative
+                      to the project root ('.' for the root itself). Only
+                      directories with at least one detection are listed,
+                      and host-wide rules (e.g. the OS) are left out.
+        directories_scanned: Number of directories listed.
+        stats: Filesystem calls issued by the whole scan.
+        truncated: True if a limit (depth excluded) stopped the walk early.
+        truncation_reason: 'max_entries', 'time_limit' or 'cancelled'
+                           when truncated.
+        elapsed: Wall time in seconds.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.all_detected: List[str] = []
+        self.detected_by_category: Dict[str, List[str]] = {}
+        self.by_directory: Dict[str, List[str]] = {}
+        self.directories_scanned = 0
+        self.stats = ScanStats()
+        self.truncated = False
+        self.truncation_reason: Optional[str] = None
+        self.elapsed = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "root": self.root,
+            "all_detected": self.all_detected,
+            "detected_by_category": self.detected_by_category,
+            "by_directory": self.by_directory,
+            "directories_scanned": self.directories_scanned,
+            "stats": self.stats.as_dict(),
+            "truncated": self.truncated,
+            "truncation_reason": self.truncation_reason,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+def _scan_directory(
+    path: str, depth: int, max_depth: int, pruned: FrozenSet[str],
+    rules: CompiledRuleSet = COMPILED_RULES
+) -> Tuple[List[str], List[str], ScanStats]:
+    """
+    Worker task: lists one directory and runs the compiled rules on it.
+
+    Returns (detected technologies, subdirectories to walk next, stats).
+    Each task keeps its own ScanStats; the coordinator adds them up.
+    """
+    stats = ScanStats()
+    try:
+        snapshot = DirectorySnapshot.scan(path, stats)
+    except OSError:
+        return [], [], stats
+
+    detected, _ = rules.match(snapshot)
+
+    children: List[str] = []
+    if depth < max_depth:
+        for name in snapshot.dirs:
+            if name in pruned or name in snapshot.symlinks:
+                continue
+            children.append(os.path.join(path, name))
+    return detected, children, stats
+
+
+def scan_tree(
+    project_path: str,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+    time_limit: Optional[float] = DEFAULT_TIME_LIMIT,
+    max_workers: Optional[int] = None,
+    pruned: FrozenSet[str] = PRUNED_DIRECTORIES,
+    progress: Optional[Callable[[ScanProgress], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    sniff_manifests: bool = False,
+) -> TreeScanResult:
+    """
+    Recursively analyzes a project (e.g. a monorepo) on a thread pool.
+
+    Every directory down to 'max_depth' levels below the root is listed
+    once with os.scandir and matched against the compiled rule set;
+    directories in 'pruned' and symlinked directories are never entered.
+    The walk stops early, keeping what it found so far, once 'max_entries'
+    entries have been seen or 'time_limit' seconds have elapsed.
+
+    Args:
+        project_path: Root of the tree to analyze.
+        max_depth: 0 analyzes only the root (like detect_technologies).
+        max_entries: Hard cap on directory entries seen (None = no cap).
+        time_limit: Hard cap on wall time in seconds (None = no cap).
+        max_workers: Thread pool size (default: a few per CPU, since the
+                     work is dominated by filesystem latency).
+        pruned: Directory names that are never walked.
+        progress: Called from the calling thread at most every
+                  PROGRESS_INTERVAL seconds (and once at the end) with a
+                  ScanProgress.
+        cancel_event: When set, the walk stops as soon as possible and the
+                      result is flagged as truncated ('cancelled').
+        sniff_manifests: Read each directory's manifests, as in
+                         detect_technologies().
+
+    Returns:
+        A TreeScanResult with per-directory and aggregate detections.
+    """
+    started = time.monotonic()
+    deadline = started + time_limit if time_limit is not None else None
+    result = TreeScanResult(project_path)
+
+    if not os.path.isdir(project_path):
+        return result
+
+    # Reglas que no dependen del directorio (p.ej. el SO): sólo en el agregado.
+    rules = get_compiled_rules(sniff_manifests)
+    ambient, _ = rules.match(DirectorySnapshot(project_path))
+    ambient_set: Set[str] = set(ambient)
+    aggregate: Set[str] = set(ambient)
+
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tree-scan")
+    pending: Dict[Future, Tuple[str, int]] = {}
+
+    def submit(path: str, depth: int):
+        future = executor.submit(_scan_directory, path, depth, max_depth, pruned, rules)
+        pending[future] = (path, depth)
+
+    last_progress = 0.0
+
+    def report():
+        progress(ScanProgress(result.directories_scanned, result.stats.entries, sorted(aggregate)))
+
+    try:
+        submit(project_path, 0)
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                result.truncated, result.truncation_reason = True, 'cancelled'
+                break
+
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    result.truncated, result.truncation_reason = True, 'time_limit'
+                    break
+            if cancel_event is not None:
+                # Despertar con regularidad para atender la cancelación.
+                timeout = PROGRESS_INTERVAL if timeout is None else min(timeout, PROGRESS_INTERVAL)
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, depth = pending.pop(future)
+                detected, children, stats = future.result()
+
+                result.directories_scanned += 1
+                result.stats.scandir_calls += stats.scandir_calls
+                result.stats.stat_calls += stats.stat_calls
+                result.stats.read_calls += stats.read_calls
+                result.stats.entries += stats.entries
+
+                local = [tech for tech in detected if tech not in ambient_set]
+                if local:
+                    relative = os.path.relpath(path, project_path).replace(os.sep, '/')
+                    result.by_directory[relative] = local
+                    aggregate.update(local)
+
+                if max_entries is not None and result.stats.entries >= max_entries:
+                    result.truncated, result.truncation_reason = True, 'max_entries'
+                    continue
+                for child in children:
+                    submit(child, depth + 1)
+
+            if result.truncated:
+                break
+            if progress is not None and time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                report()
+    finally:
+        # Lo que quede en cola se descarta; lo que esté en curso termina solo.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    result.by_directory = dict(sorted(result.by_directory.items()))
+    result.all_detected = sorted(aggregate)
+    result.detected_by_category = rules.group(aggregate)
+    result.elapsed = time.monotonic() - started
+    if progress is not None:
+        report()
+    return result
@@ -0,0 +1,452 @@
+# src/infrastructure/watcher.py
+
+import ctypes
+import ctypes.util
+import os
+import platform
+import select
+import stat
+import struct
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.infrastructure.detection_rules import Atom, CompiledRuleSet
+from src.infrastructure.directory_snapshot import DirectorySnapshot
+from src.infrastructure.file_analyzer import COMPILED_RULES
+
+# Espera (segundos) sin eventos antes de procesar un lote, y demora máxima
+# de un lote aunque sigan llegando eventos (p. ej. durante un 'git checkout').
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_MAX_BATCH_DELAY = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+
+DetectionResult = Tuple[List[str], Dict[str, List[str]]]
+# (ruta del proyecto, directorio relativo vigilado; '' es la raíz)
+WatchKey = Tuple[str, str]
+
+
+class IncrementalDetection:
+    """
+    detect_technologies() kept up to date one entry at a time.
+
+    The atoms supported by every top-level entry are remembered (with a
+    reference count per atom, since many files share an extension), so a
+    changed name only updates its own atoms. Only the rules referencing an
+    atom that appeared or disappeared are re-evaluated.
+    """
+
+    def __init__(self, project_path: str, rules: CompiledRuleSet = COMPILED_RULES):
+        self.project_path = project_path
+        self.rules = rules
+        self.rescan()
+
+    def rescan(self):
+        """Rebuilds the state from a full listing of the directory."""
+        self._entry_atoms: Dict[str, Set[Atom]] = {}
+        self._support: Counter = Counter()
+        self.facts: Set[Atom] = self.rules.platform_facts
+        try:
+            snapshot: Optional[DirectorySnapshot] = DirectorySnapshot.scan(self.project_path)
+        except OSError:
+            snapshot = None
+
+        if snapshot is not None:
+            for entry_name in snapshot.files:
+                self._set_entry(entry_name, self.rules.entry_atoms(entry_name, False))
+            for entry_name in snapshot.dirs:
+                self._set_entry(entry_name, self.rules.entry_atoms(entry_name, True))
+            for atom in self.rules.path_atoms():
+                if snapshot.exists(atom.value):
+                    self.facts.add(atom)
+
+        facts = self.facts
+        self.matched: Set[int] = {
+            index for index in self.rules.candidates(facts)
+            if self.rules.rules[index].condition.evaluate(facts)
+        }
+
+    @property
+    def result(self) -> DetectionResult:
+        return self.rules.result_of(self.matched)
+
+    def _set_entry(self, entry_name: str, atoms: Set[Atom]) -> Set[Atom]:
+        """Replaces the atoms of one entry; returns the atoms that flipped."""
+        old = self._entry_atoms.pop(entry_name, set())
+        if atoms:
+            self._entry_atoms[entry_name] = atoms
+        flipped: Set[Atom] = set()
+        for atom in old - atoms:
+            self._support[atom] -= 1
+            if not self._support[atom]:
+                del self._support[atom]
+                self.facts.discard(atom)
+                flipped.add(atom)
+        for atom in atoms - old:
+            self._support[atom] += 1
+            if self._support[atom] == 1:
+                self.facts.add(atom)
+                flipped.add(atom)
+        return flipped
+
+    def _current_atoms(self, entry_name: str) -> Set[Atom]:
+        full_path = os.path.join(self.project_path, entry_name)
+        try:
+            is_dir = stat.S_ISDIR(os.stat(full_path).st_mode)
+        except OSError:
+            # Un enlace roto cuenta como archivo, igual que en DirectorySnapshot.
+            if not os.path.lexists(full_path):
+                return set()
+            is_dir = False
+        return self.rules.entry_atoms(entry_name, is_dir)
+
+    def apply(self, changes: Dict[str, Set[str]]) -> bool:
+        """
+        Applies a batch of changed names ({relative dir: names}) and returns
+        True if the detected technologies changed.
+        """
+        flipped: Set[Atom] = set()
+        for relative_dir, names in changes.items():
+            for entry_name in names:
+                if not relative_dir:
+                    flipped |= self._set_entry(entry_name, self._current_atoms(entry_name))
+                relative = f"{relative_dir}/{entry_name}" if relative_dir else entry_name
+                for atom in self.rules.path_atoms(relative):
+                    holds = os.path.lexists(os.path.join(self.project_path, atom.value))
+                    if holds != (atom in self.facts):
+                        (self.facts.add if holds else self.facts.discard)(atom)
+                        flipped.add(atom)
+        if not flipped:
+            return False
+
+        before = set(self.matched)
+        for index in self.rules.rules_for_atoms(flipped):
+            if self.rules.rules[index].condition.evaluate(self.facts):
+                self.matched.add(index)
+            else:
+                self.matched.discard(index)
+        return self.matched != before
+
+
+# --- Fuentes de eventos ---
+
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_CLOEXEC = 0o2000000
+_IN_NONBLOCK = 0o4000
+_WATCH_MASK = (_IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Un evento es (clave vigilada, nombre cambiado); nombre None significa que
+# el propio directorio vigilado desapareció o se movió.
+Event = Tuple[WatchKey, Optional[str]]
+
+
+class _InotifyBackend:
+    """Linux inotify through ctypes: the thread sleeps until something changes."""
+    name = "inotify"
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wake_r, self._wake_w = os.pipe()
+        self._keys: Dict[int, WatchKey] = {}
+        self._wds: Dict[WatchKey, int] = {}
+
+    def add(self, key: WatchKey, directory: str) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            return False
+        self._keys[wd] = key
+        self._wds[key] = wd
+        return True
+
+    def remove(self, key: WatchKey):
+        wd = self._wds.pop(key, None)
+        if wd is not None:
+            self._keys.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def wake(self):
+        os.write(self._wake_w, b'\0')
+
+    def read(self, timeout: Optional[float]) -> Tuple[List[Event], bool]:
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            os.read(self._wake_r, 4096)
+        if self._fd not in ready:
+            return [], False
+
+        events: List[Event] = []
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                raw_name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length]
+                offset += _EVENT_HEADER.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                key = self._keys.get(wd)
+                if key is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    self._keys.pop(wd, None)
+                    if self._wds.get(key) == wd:
+                        del self._wds[key]
+                elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                    events.append((key, None))
+                else:
+                    events.append((key, os.fsdecode(raw_name.rstrip(b'\0'))))
+        return events, overflow
+
+    def close(self):
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+
+class _PollingBackend:
+    """
+    Portable fallback: one stat per watched directory and interval. A
+    directory is only listed again when its mtime changed.
+    """
+    name = "polling"
+
+    def __init__(self, interval: float = DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        # clave -> (ruta, mtime_ns o None si no existe, {nombre: es_directorio})
+        self._dirs: Dict[WatchKey, Tuple[str, Optional[int], Dict[str, bool]]] = {}
+
+    @staticmethod
+    def _listing(directory: str) -> Tuple[Optional[int], Dict[str, bool]]:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                return mtime, {entry.name: entry.is_dir() for entry in it}
+        except OSError:
+            return None, {}
+
+    def add(self, key: WatchKey, directory: str) -> bool:
+        with self._lock:
+            if key not in self._dirs:
+                self._dirs[key] = (directory,) + self._listing(directory)
+        return True
+
+    def remove(self, key: WatchKey):
+        with self._lock:
+            self._dirs.pop(key, None)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def read(self, timeout: Optional[float]) -> Tuple[List[Event], bool]:
+        self._wakeup.wait(self.interval if timeout is None else min(timeout, self.interval))
+        self._wakeup.clear()
+        events: List[Event] = []
+        with self._lock:
+            for key, (directory, mtime, listing) in list(self._dirs.items()):
+                try:
+                    current_mtime: Optional[int] = os.stat(directory).st_mtime_ns
+                except OSError:
+                    current_mtime = None
+                if current_mtime == mtime:
+                    continue
+                current_mtime, current = self._listing(directory)
+                self._dirs[key] = (directory, current_mtime, current)
+                for entry_name in listing.keys() | current.keys():
+                    if listing.get(entry_name) != current.get(entry_name):
+                        events.append((key, entry_name))
+        return events, False
+
+    def close(self):
+        pass
+
+
+def _create_backend(use_inotify: Optional[bool], poll_interval: float):
+    if use_inotify is not False and platform.system() == "Linux":
+        try:
+            return _InotifyBackend()
+        except (OSError, AttributeError, TypeError):
+            if use_inotify:
+                raise
+    return _PollingBackend(poll_interval)
+
+
+class ProjectWatcher:
+    """
+    Keeps the detection of many projects up to date from a single thread.
+
+    Each project's root (plus the nested directories some rule looks into,
+    e.g. 'src') is watched with inotify when available, or by polling the
+    directories' mtimes otherwise. Events are debounced into batches; each
+    batch updates an IncrementalDetection and, if the detected technologies
+    changed, calls on_change(project_path, all_detected, detected_by_category)
+    from the watcher thread. When idle, the thread is blocked in select()
+    (inotify) or wakes up once per poll interval to stat a few directories.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[str, List[str], Dict[str, List[str]]], None],
+        debounce: float = DEFAULT_DEBOUNCE,
+        max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: Optional[bool] = None,
+        rules: CompiledRuleSet = COMPILED_RULES,
+    ):
+        """
+        Args:
+            on_change: Callback for projects whose detection changed.
+            debounce: Quiet time that closes a batch of events.
+            max_batch_delay: Upper bound for a batch under a constant stream.
+            poll_interval: Seconds between checks of the polling fallback.
+            use_inotify: True forces inotify, False forces polling, None
+                         picks inotify when available.
+            rules: The compiled rule set to evaluate.
+        """
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_batch_delay = max_batch_delay
+        self.rules = rules
+        self._backend = _create_backend(use_inotify, poll_interval)
+        self._lock = threading.Lock()
+        self._projects: Dict[str, IncrementalDetection] = {}
+        self._pending: Dict[str, Dict[str, Set[str]]] = {}
+        self._rescan: Set[str] = set()
+        self._first_event = self._last_event = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Directorios vigilados de cada proyecto: la raíz y los anidados que
+        # consultan las reglas, con sus padres intermedios.
+        watched = {''}
+        for nested in rules.nested_directories:
+            parts = nested.split('/')
+            watched.update('/'.join(parts[:i]) for i in range(1, len(parts) + 1))
+        self._watched_dirs = sorted(watched)
+
+    @property
+    def backend(self) -> str:
+        """'inotify' or 'polling'."""
+        return self._backend.name
+
+    def add(self, project_path: str) -> DetectionResult:
+        """Starts watching 'project_path'; returns its current detection."""
+        project_path = os.path.abspath(project_path)
+        for relative_dir in self._watched_dirs:
+            self._backend.add((project_path, relative_dir),
+                              os.path.join(project_path, relative_dir))
+        detection = IncrementalDetection(project_path, self.rules)
+        with self._lock:
+            self._projects[project_path] = detection
+            return detection.result
+
+    def remove(self, project_path: str):
+        project_path = os.path.abspath(project_path)
+        with self._lock:
+            self._projects.pop(project_path, None)
+            self._pending.pop(project_path, None)
+        for relative_dir in self._watched_dirs:
+            self._backend.remove((project_path, relative_dir))
+
+    def result(self, project_path: str) -> Optional[DetectionResult]:
+        with self._lock:
+            detection = self._projects.get(os.path.abspath(project_path))
+            return detection.result if detection is not None else None
+
+    # --- Bucle de eventos ---
+
+    def start(self):
+        """Runs the event loop in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._backend.wake()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._backend.close()
+
+    def run(self):
+        """Runs the event loop in the calling thread until stop()."""
+        while not self._stop.is_set():
+            timeout = None
+            if self._pending or self._rescan:
+                deadline = min(self._last_event + self.debounce,
+                               self._first_event + self.max_batch_delay)
+                timeout = max(0.0, deadline - time.monotonic())
+            events, overflow = self._backend.read(timeout)
+            if self._stop.is_set():
+                break
+            if events or overflow:
+                self._record(events, overflow)
+            if (self._pending or self._rescan) and time.monotonic() >= min(
+                    self._last_event + self.debounce,
+                    self._first_event + self.max_batch_delay):
+                self._flush()
+
+    def _record(self, events: List[Event], overflow: bool):
+        now = time.monotonic()
+        if not (self._pending or self._rescan):
+            self._first_event = now
+        self._last_event = now
+        with self._lock:
+            if overflow:
+                # Se perdieron eventos: se re-escanea todo lo vigilado.
+                self._rescan.update(self._projects)
+            for (project_path, relative_dir), entry_name in events:
+                if project_path not in self._projects:
+                    continue
+                if entry_name is None:
+                    if not relative_dir:
+                        self._rescan.add(project_path)
+                        continue
+                    relative_dir, _, entry_name = relative_dir.rpartition('/')
+                self._pending.setdefault(project_path, {}).setdefault(
+                    relative_dir, set()).add(entry_name)
+
+                # Un directorio anidado que aparece (p. ej. 'src') se vigila.
+                relative = f"{relative_dir}/{entry_name}" if relative_dir else entry_name
+                if relative in self._watched_dirs:
+                    self._backend.add((project_path, relative),
+                                      os.path.join(project_path, relative))
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            rescan, self._rescan = self._rescan, set()
+            changed: List[Tuple[str, DetectionResult]] = []
+            for project_path in set(pending) | rescan:
+                detection = self._projects.get(project_path)
+                if detection is None:
+                    continue
+                if project_path in rescan:
+                    before = set(detection.matched)
+                    detection.rescan()
+                    modified = detection.matched != before
+                else:
+                    modified = detection.apply(pending[project_path])
+                if modified:
+                    changed.append((project_path, detection.result))
+        for project_path, (all_detected, detected_by_category) in changed:
+            self.on_change(project_path, all_detected, detected_by_category)
@@ -2,21 +2,60 @@
 
 import customtkinter as ctk
 from tkinter import filedialog, StringVar
+# tkinterdnd2 no puede diferirse: App hereda de DnDWrapper, porque la raíz
+# Tk no es un BaseWidget y no recibe los métodos dnd_* que el paquete añade
+# a los widgets. Importarlo es barato (tkinter ya está cargado); lo caro es
+# cargar tkdnd en Tcl, y eso se hace con la ventana visible (ver
+# _enable_drag_and_drop).
 from tkinterdnd2 import DND_FILES, TkinterDnD
-import pyperclip
+import importlib
 import os
-import platform
-from typing import Dict, List
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Sólo lo necesario para dibujar la primera ventana. La detección, el
+# escaneo, la vista previa, el optimizador, la escritura de archivos y el
+# portapapeles se importan al usarse (ver _preload_modules).
+from src.infrastructure.template_catalog import build_search_index, build_template_catalog
+from src.infrastructure.template_loader import get_template_content, get_template_version
+from src.core.use_cases import IncrementalGitignoreGenerator, LineEdit
+from src.interface.syntax_highlighting import HIGHLIGHT_TAGS, tag_ranges
+
+# Cada cuánto (ms) el hilo de la UI revisa la cola de resultados del análisis.
+ANALYSIS_POLL_MS = 50
+
+# Hasta este número de plantillas, todas las categorías empiezan desplegadas.
+CHECKLIST_EAGER_LIMIT = 120
+
+# Checkboxes visibles por página al desplegar una categoría (el resto se
+# muestra con "Mostrar más") y cuántos se crean por vuelta del bucle de Tk.
+CATEGORY_PAGE_SIZE = 40
+CHECKBOX_BATCH_SIZE = 10
+
+# Resultados de búsqueda visibles a la vez y espera (ms) tras la última tecla.
+SEARCH_RESULT_LIMIT = 30
+SEARCH_DEBOUNCE_MS = 40
+
+# Módulos que se difieren al iniciar y se precargan con la ventana visible.
+DEFERRED_MODULES = (
+    "src.infrastructure.scan_cache",      # file_analyzer y reglas de detección
+    "src.infrastructure.tree_scanner",
+    "src.core.pattern_optimizer",
+)
+
+def _preload_modules():
+    """Importa los DEFERRED_MODULES (corre en un hilo del pool)."""
+    for module in DEFERRED_MODULES:
+        importlib.import_module(module)
 
-from src.infrastructure.file_analyzer import CATEGORIZED_DETECTION_RULES, detect_technologies
-from src.infrastructure.template_loader import get_template_content
-from src.core.use_cases import generate_gitignore_content
 
 class App(ctk.CTk, TkinterDnD.DnDWrapper):
     """Clase principal de la aplicación GitIgnore Genius."""
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.TkdndVersion = TkinterDnD._require(self)
+        self.TkdndVersion = None
 
         self.title("GitIgnore Genius")
         self.geometry("800x700")
@@ -29,6 +68,33 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
 
         self.current_project_path = None
         self.checkbox_vars: Dict[str, StringVar] = {}
+        self.checklist_categories: Dict[str, dict] = {}
+        self.tech_categories: Dict[str, str] = {}
+        # Catálogo de plantillas (categorías de las reglas + plantillas sin
+        # regla) y su índice de búsqueda, construidos una vez al iniciar.
+        self.template_catalog = build_template_catalog()
+        self.search_index = build_search_index(self.template_catalog)
+        self.search_result_boxes: List[ctk.CTkCheckBox] = []
+        self.search_active = False
+        self._search_after_id: Optional[str] = None
+        self._edit_anchor_line: Optional[int] = None
+        # True si el textbox muestra la última salida (sin optimizar) del
+        # generador: sólo entonces se le pueden aplicar sus parches.
+        self._showing_generated_output = False
+        # --- Análisis en segundo plano ---
+        # El análisis corre en un pool de hilos; los resultados vuelven al hilo
+        # de Tk por una cola que se revisa con after(). Cada análisis tiene un
+        # id: los mensajes de análisis anteriores (cancelados) se descartan.
+        self.analysis_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="analysis")
+        self.analysis_queue: "queue.Queue" = queue.Queue()
+        self.analysis_id = 0
+        self.analysis_cancel_event: Optional[threading.Event] = None
+        self.analysis_polling = False
+
+        # Memoiza cada sección: un clic sólo renderiza la plantilla que cambió.
+        self.generator = IncrementalGitignoreGenerator(
+            get_template_content, get_template_version
+        )
 
         # --- Definición de Fuentes ---
         self.font_ui_large_bold = ctk.CTkFont(family="Segoe UI", size=20, weight="bold")
@@ -45,6 +111,18 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         self.DROP_TEXT_HOVER = "⏬\n\n¡Suelta la carpeta aquí para analizar!"
 
         self.create_widgets()
+        # Con la ventana ya visible se carga tkdnd y el análisis se importa
+        # en segundo plano: el primer drop no espera a los imports.
+        self.after_idle(self._enable_drag_and_drop)
+        self.after_idle(lambda: self.analysis_executor.submit(_preload_modules))
+
+    def _enable_drag_and_drop(self):
+        """Carga tkdnd en el intérprete Tcl y registra la ventana como destino."""
+        self.TkdndVersion = TkinterDnD._require(self)
+        self.drop_target_register(DND_FILES)
+        self.dnd_bind('<<Drop>>', self.handle_drop)
+        self.dnd_bind('<<DragEnter>>', self.on_enter_drop_zone)
+        self.dnd_bind('<<DragLeave>>', self.on_leave_drop_zone)
 
     def create_widgets(self):
         """Crea y configura todos los widgets de la UI."""
@@ -59,27 +137,76 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
             text_color=("gray20", "gray80"),
             cursor="hand2"
         )
-        self.drop_label.pack(fill="x", pady=(0, 20), ipady=20)
+        self.drop_label.pack(fill="x", pady=(0, 10), ipady=20)
+
+        self.options_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        self.options_frame.pack(fill="x", pady=(0, 10))
+
+        self.recursive_var = ctk.StringVar(value="off")
+        self.recursive_switch = ctk.CTkSwitch(
+            self.options_frame, text="Escaneo recursivo (monorepos)",
+            variable=self.recursive_var, onvalue="on", offvalue="off",
+            font=self.font_ui_normal
+        )
+        self.recursive_switch.pack(side="left")
+
+        self.profile_var = ctk.StringVar(value="off")
+        self.profile_switch = ctk.CTkSwitch(
+            self.options_frame, text="Perfil de detección",
+            variable=self.profile_var, onvalue="on", offvalue="off",
+            font=self.font_ui_normal
+        )
+        self.profile_switch.pack(side="left", padx=(20, 0))
+
+        self.sniff_var = ctk.StringVar(value="off")
+        self.sniff_switch = ctk.CTkSwitch(
+            self.options_frame, text="Leer manifiestos",
+            variable=self.sniff_var, onvalue="on", offvalue="off",
+            font=self.font_ui_normal
+        )
+        self.sniff_switch.pack(side="left", padx=(20, 0))
+
+        self.optimize_var = ctk.StringVar(value="off")
+        self.optimize_switch = ctk.CTkSwitch(
+            self.options_frame, text="Mezcla optimizada",
+            variable=self.optimize_var, onvalue="on", offvalue="off",
+            font=self.font_ui_normal, command=self.regenerate_content
+        )
+        self.optimize_switch.pack(side="left", padx=(20, 0))
 
         self.content_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.content_frame.pack(fill="both", expand=True)
         self.content_frame.grid_columnconfigure(0, weight=1)
         self.content_frame.grid_columnconfigure(1, weight=2)
-        self.content_frame.grid_rowconfigure(0, weight=1)
+        self.content_frame.grid_rowconfigure(1, weight=1)
+
+        self.search_var = ctk.StringVar(value="")
+        self.search_entry = ctk.CTkEntry(
+            self.content_frame, textvariable=self.search_var,
+            placeholder_text="Buscar plantilla (ej. py, vscode, postgres)...",
+            font=self.font_ui_normal
+        )
+        self.search_entry.grid(row=0, column=0, sticky="ew", padx=(0, 20), pady=(0, 10))
+        self.search_var.trace_add("write", self._on_search_changed)
+        self.search_entry.bind("<Return>", self._toggle_first_search_result)
+        self.search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
 
         self.checklist_frame = ctk.CTkScrollableFrame(
             self.content_frame, label_text="Plantillas Disponibles",
             label_font=self.font_ui_normal_bold # Fuente aplicada
         )
-        self.checklist_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 20))
-        self.populate_checklist(detected_by_category={})
+        self.checklist_frame.grid(row=1, column=0, sticky="nsew", padx=(0, 20))
+        self.build_checklist()
+        self.search_results_frame = ctk.CTkFrame(self.checklist_frame, fg_color="transparent")
         
         self.result_textbox = ctk.CTkTextbox(
             self.content_frame, font=self.font_mono, # Fuente de código aplicada
             corner_radius=10, border_width=2,
             state="normal"
         )
-        self.result_textbox.grid(row=0, column=1, sticky="nsew")
+        self.result_textbox.grid(row=0, column=1, rowspan=2, sticky="nsew")
+        self.result_textbox.bind("<KeyPress>", self._on_editor_key_press)
+        self.result_textbox.bind("<KeyRelease>", self._on_editor_key_release)
 
         # --- Configuración de Tags para Resaltado de Sintaxis ---
         
@@ -104,11 +231,18 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
             self.main_frame, text="", text_color="#E63946",
             font=self.font_ui_status # Fuente aplicada
         )
-        self.status_label.pack(fill="x", pady=(10, 10))
+        self.status_label.pack(fill="x", pady=(10, 0))
+
+        # Resumen del perfil de detección (sólo si el interruptor está activo).
+        self.profile_label = ctk.CTkLabel(
+            self.main_frame, text="", text_color=("gray30", "gray70"),
+            font=self.font_ui_normal, wraplength=740, justify="left"
+        )
+        self.profile_label.pack(fill="x", pady=(0, 10))
 
         self.button_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.button_frame.pack(fill="x")
-        self.button_frame.grid_columnconfigure((0, 1), weight=1)
+        self.button_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
 
         self.copy_button = ctk.CTkButton(
             self.button_frame, text="Copy to Clipboard",
@@ -122,64 +256,305 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
             font=self.font_ui_normal_bold, # Fuente aplicada
             command=self.save_to_file
         )
-        self.save_button.grid(row=0, column=1, padx=(10, 0), sticky="ew")
+        self.save_button.grid(row=0, column=1, padx=10, sticky="ew")
+
+        self.update_button = ctk.CTkButton(
+            self.button_frame, text="Update .gitignore",
+            font=self.font_ui_normal_bold,
+            command=self.update_existing_file
+        )
+        self.update_button.grid(row=0, column=2, padx=10, sticky="ew")
+
+        self.preview_button = ctk.CTkButton(
+            self.button_frame, text="Preview Ignored...",
+            font=self.font_ui_normal_bold,
+            command=self.preview_ignored_files
+        )
+        self.preview_button.grid(row=0, column=3, padx=(10, 0), sticky="ew")
 
         # --- Bindings ---
-        self.drop_target_register(DND_FILES)
-        self.dnd_bind('<<Drop>>', self.handle_drop)
         self.drop_label.bind("<Button-1>", self.handle_click_browse)
-        self.dnd_bind('<<DragEnter>>', self.on_enter_drop_zone)
-        self.dnd_bind('<<DragLeave>>', self.on_leave_drop_zone)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.show_welcome_message()
 
-    def populate_checklist(self, detected_by_category: Dict[str, List[str]]):
-        """(Re)Crea los checkboxes de plantillas, agrupados por categoría."""
-        for widget in self.checklist_frame.winfo_children():
-            widget.destroy()
-        self.checkbox_vars.clear()
+    def build_checklist(self):
+        """
+        Crea la lista de plantillas una sola vez.
 
-        all_rules = CATEGORIZED_DETECTION_RULES.copy()
+        Cada tecnología tiene su StringVar desde el principio, pero los
+        checkboxes de una categoría sólo se crean al desplegarla, de página
+        en página (CATEGORY_PAGE_SIZE) y por tandas con after(). Con una
+        biblioteca pequeña todas empiezan desplegadas; con una grande, sólo
+        las que tienen detecciones.
+        """
+        categories = self.template_catalog
+        total = sum(len(tech_names) for tech_names in categories.values())
+        start_expanded = total <= CHECKLIST_EAGER_LIMIT
+
+        for category, tech_names in categories.items():
+            header = ctk.CTkButton(
+                self.checklist_frame, text=category, anchor="w",
+                font=self.font_ui_normal_bold, # Fuente aplicada
+                fg_color="transparent", hover_color=("gray80", "gray25"),
+                text_color=("gray10", "gray90"),
+                command=lambda c=category: self._toggle_category(c)
+            )
+            header.pack(fill="x", pady=(10, 5))
+            container = ctk.CTkFrame(self.checklist_frame, fg_color="transparent")
+
+            for tech_name in tech_names:
+                self.checkbox_vars[tech_name] = ctk.StringVar(value="off")
+                self.tech_categories[tech_name] = category
+
+            self.checklist_categories[category] = {
+                "header": header, "container": container,
+                "tech_names": tech_names, "expanded": False,
+                # Orden en que los checkboxes muestran las tecnologías, cuántos
+                # deben verse y los ya creados (se reutilizan al reordenar).
+                "order": list(tech_names), "shown": 0, "boxes": [],
+                "more_button": None, "batch_after_id": None,
+            }
+            if start_expanded:
+                self._set_category_expanded(category, True)
+            else:
+                self._refresh_category_header(category)
 
-        for category, rules in all_rules.items():
-            category_label = ctk.CTkLabel(
-                self.checklist_frame, text=category,
-                font=self.font_ui_normal_bold # Fuente aplicada
+    def populate_checklist(self, detected_by_category: Dict[str, List[str]]):
+        """
+        Marca las tecnologías detectadas reutilizando los widgets existentes:
+        sólo cambian las variables cuyo valor es distinto. En cada categoría
+        las marcadas pasan al principio, para que se vean sin paginar.
+        """
+        detected = {tech for techs in detected_by_category.values() for tech in techs}
+        for tech_name, var in self.checkbox_vars.items():
+            value = "on" if tech_name in detected else "off"
+            if var.get() != value:
+                var.set(value)
+
+        for category, entry in self.checklist_categories.items():
+            entry["order"] = self._category_order(entry)
+            if category in detected_by_category:
+                selected = sum(self.checkbox_vars[t].get() == "on" for t in entry["tech_names"])
+                entry["shown"] = max(entry["shown"], selected)
+                self._set_category_expanded(category, True)
+            else:
+                if entry["boxes"]:
+                    self._render_category(category)
+                self._refresh_category_header(category)
+
+    def _category_order(self, entry: dict) -> List[str]:
+        """Tecnologías de la categoría con las marcadas primero (orden estable)."""
+        selected, rest = [], []
+        for tech_name in entry["tech_names"]:
+            (selected if self.checkbox_vars[tech_name].get() == "on" else rest).append(tech_name)
+        return selected + rest
+
+    def _toggle_category(self, category: str):
+        self._set_category_expanded(category, not self.checklist_categories[category]["expanded"])
+
+    def _set_category_expanded(self, category: str, expanded: bool):
+        """Despliega o pliega una categoría; al desplegarla muestra al menos una página."""
+        entry = self.checklist_categories[category]
+        if expanded:
+            page = min(CATEGORY_PAGE_SIZE, len(entry["tech_names"]))
+            entry["shown"] = max(entry["shown"], page)
+            self._render_category(category)
+
+        # Durante una búsqueda las categorías están ocultas; se vuelven a
+        # mostrar (con este estado) en _show_categories().
+        if not self.search_active:
+            if expanded and not entry["expanded"]:
+                entry["container"].pack(fill="x", after=entry["header"])
+            elif not expanded and entry["expanded"]:
+                entry["container"].pack_forget()
+        entry["expanded"] = expanded
+        self._refresh_category_header(category)
+
+    def _show_more(self, category: str):
+        """Muestra la siguiente página de checkboxes de la categoría."""
+        entry = self.checklist_categories[category]
+        entry["shown"] = min(entry["shown"] + CATEGORY_PAGE_SIZE, len(entry["tech_names"]))
+        self._render_category(category)
+
+    def _render_category(self, category: str):
+        """
+        Hace que los checkboxes de la categoría muestren sus primeras
+        entry["shown"] tecnologías en entry["order"]. Los ya creados se
+        reutilizan cambiando su texto y variable; los que faltan se crean
+        (la primera tanda ahora, el resto con after()).
+        """
+        entry = self.checklist_categories[category]
+        for checkbox, tech_name in zip(entry["boxes"], entry["order"]):
+            if checkbox.cget("text") != tech_name:
+                checkbox.configure(text=tech_name, variable=self.checkbox_vars[tech_name])
+        if len(entry["boxes"]) < entry["shown"] and entry["batch_after_id"] is None:
+            self._build_checkbox_batch(category)
+        else:
+            self._refresh_more_button(category)
+
+    def _build_checkbox_batch(self, category: str):
+        """Crea hasta CHECKBOX_BATCH_SIZE checkboxes y agenda la tanda siguiente."""
+        entry = self.checklist_categories[category]
+        entry["batch_after_id"] = None
+        boxes = entry["boxes"]
+        stop = min(entry["shown"], len(boxes) + CHECKBOX_BATCH_SIZE)
+        for tech_name in entry["order"][len(boxes):stop]:
+            checkbox = ctk.CTkCheckBox(
+                entry["container"], text=tech_name, variable=self.checkbox_vars[tech_name],
+                onvalue="on", offvalue="off",
+                font=self.font_ui_normal, # Fuente aplicada
+                command=lambda c=category: self._on_checkbox_toggled(c)
             )
-            category_label.pack(fill="x", pady=(10, 5))
-
-            for tech_name in rules.keys():
-                var = ctk.StringVar(value="off")
-                if tech_name in detected_by_category.get(category, []):
-                    var.set("on")
-                
-                checkbox = ctk.CTkCheckBox(
-                    self.checklist_frame, text=tech_name, variable=var,
-                    onvalue="on", offvalue="off",
-                    font=self.font_ui_normal, # Fuente aplicada
-                    command=self.regenerate_content
-                )
-                checkbox.pack(fill="x", padx=20)
-                self.checkbox_vars[tech_name] = var
+            checkbox.pack(fill="x", padx=20)
+            boxes.append(checkbox)
+        if len(boxes) < entry["shown"]:
+            entry["batch_after_id"] = self.after(0, lambda: self._build_checkbox_batch(category))
+        self._refresh_more_button(category)
+
+    def _refresh_more_button(self, category: str):
+        """Deja el botón "Mostrar más" al final de la categoría, o lo oculta."""
+        entry = self.checklist_categories[category]
+        remaining = len(entry["tech_names"]) - entry["shown"]
+        button = entry["more_button"]
+        if remaining <= 0 or len(entry["boxes"]) < entry["shown"]:
+            # Sin más páginas, o con una tanda todavía en curso.
+            if button is not None:
+                button.pack_forget()
+            return
+        if button is None:
+            button = entry["more_button"] = ctk.CTkButton(
+                entry["container"], anchor="w", font=self.font_ui_normal,
+                fg_color="transparent", hover_color=("gray80", "gray25"),
+                text_color=("gray10", "gray90"),
+                command=lambda c=category: self._show_more(c)
+            )
+        text = f"Mostrar más ({remaining} restantes)"
+        if button.cget("text") != text:
+            button.configure(text=text)
+        button.pack_forget()
+        button.pack(fill="x", padx=20)
+
+    def _refresh_category_header(self, category: str):
+        """Actualiza el encabezado: flecha y cuántas plantillas están marcadas."""
+        entry = self.checklist_categories[category]
+        selected = sum(self.checkbox_vars[t].get() == "on" for t in entry["tech_names"])
+        arrow = "▾" if entry["expanded"] else "▸"
+        text = f"{arrow} {category} ({selected}/{len(entry['tech_names'])})"
+        if entry["header"].cget("text") != text:
+            entry["header"].configure(text=text)
+
+    def _on_checkbox_toggled(self, category: str):
+        self._refresh_category_header(category)
+        self.regenerate_content()
+
+    # --- Búsqueda de plantillas ---
+
+    def _on_search_changed(self, *args):
+        """Agrupa las pulsaciones seguidas en una sola búsqueda."""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self):
+        """
+        Muestra los resultados del índice en lugar de las categorías. Los
+        checkboxes de resultados se reutilizan entre búsquedas: sólo cambian
+        su texto y su variable (la misma StringVar que en la categoría).
+        """
+        self._search_after_id = None
+        query = self.search_var.get().strip()
+        if not query:
+            self._show_categories()
+            return
+
+        results = self.search_index.search(query, SEARCH_RESULT_LIMIT)
+        if not self.search_active:
+            self.search_active = True
+            for entry in self.checklist_categories.values():
+                entry["header"].pack_forget()
+                entry["container"].pack_forget()
+            self.search_results_frame.pack(fill="x")
+
+        while len(self.search_result_boxes) < len(results):
+            checkbox = ctk.CTkCheckBox(
+                self.search_results_frame, text="", onvalue="on", offvalue="off",
+                font=self.font_ui_normal
+            )
+            self.search_result_boxes.append(checkbox)
+
+        for checkbox, result in zip(self.search_result_boxes, results):
+            tech_name = result.entry.name
+            checkbox.configure(
+                text=f"{tech_name}  ·  {result.entry.category}",
+                variable=self.checkbox_vars[tech_name],
+                command=lambda c=result.entry.category: self._on_checkbox_toggled(c)
+            )
+            checkbox.pack(fill="x", padx=20)
+        for checkbox in self.search_result_boxes[len(results):]:
+            checkbox.pack_forget()
+
+    def _show_categories(self):
+        """Sale del modo búsqueda restaurando las categorías en su orden."""
+        if not self.search_active:
+            return
+        self.search_active = False
+        self.search_results_frame.pack_forget()
+        for entry in self.checklist_categories.values():
+            entry["header"].pack(fill="x", pady=(10, 5))
+            if entry["expanded"]:
+                entry["container"].pack(fill="x")
+
+    def _toggle_first_search_result(self, event=None):
+        """Enter en el buscador marca o desmarca el primer resultado."""
+        results = self.search_index.search(self.search_var.get(), 1)
+        if not results:
+            return
+        tech_name = results[0].entry.name
+        var = self.checkbox_vars[tech_name]
+        var.set("off" if var.get() == "on" else "on")
+        self._on_checkbox_toggled(self.tech_categories[tech_name])
+
+    def _apply_syntax_highlighting(self, first_line: int = 1, last_line: Optional[int] = None,
+                                   lines: Optional[List[str]] = None):
+        """
+        Aplica resaltado de sintaxis a las líneas [first_line, last_line]
+        (numeración de Tk, 1-based; por defecto todo el texto). Si quien
+        llama ya conoce esas líneas las pasa en 'lines' y no se releen.
 
-    def _apply_syntax_highlighting(self):
-        """Aplica resaltado de sintaxis al contenido del textbox."""
-        self._clear_all_tags()
-        
-        lines = self.result_textbox.get("1.0", "end-1c").split("\n")
-        
-        for i, line in enumerate(lines):
-            line_start = f"{i + 1}.0"
-            line_end = f"{i + 1}.end"
-            
-            stripped_line = line.strip()
-            
-            if stripped_line.startswith("#===") or stripped_line.startswith("#---"):
-                self.result_textbox.tag_add("header", line_start, line_end)
-            elif stripped_line.startswith("#"):
-                self.result_textbox.tag_add("comment", line_start, line_end)
+        Las líneas contiguas con el mismo tag se agrupan en un único rango y
+        cada tag se aplica con una sola llamada a Tcl.
+        """
+        end_index = f"{last_line}.end" if last_line is not None else "end-1c"
+        region_start = f"{first_line}.0"
+
+        for tag in HIGHLIGHT_TAGS:
+            self.result_textbox.tag_remove(tag, region_start, end_index)
+
+        if lines is None:
+            lines = self.result_textbox.get(region_start, end_index).split("\n")
+        # tag_add con varios rangos a la vez sólo existe en el Text de Tk.
+        text_widget = self.result_textbox._textbox
+        for tag, indices in tag_ranges(lines, first_line).items():
+            if indices:
+                text_widget.tag_add(tag, *indices)
             # El texto normal usará la fuente base 'self.font_mono' del textbox
 
+    def _on_editor_key_press(self, event=None):
+        """Recuerda la línea donde empieza una edición del usuario."""
+        self._edit_anchor_line = int(self.result_textbox.index("insert").split(".")[0])
+
+    def _on_editor_key_release(self, event=None):
+        """Re-resalta sólo la región editada (desde el ancla hasta el cursor)."""
+        current_line = int(self.result_textbox.index("insert").split(".")[0])
+        anchor_line = self._edit_anchor_line or current_line
+        # Una línea de margen cubre los saltos de línea borrados o insertados.
+        first = max(1, min(anchor_line, current_line) - 1)
+        last = max(anchor_line, current_line) + 1
+        last_text_line = int(self.result_textbox.index("end-1c").split(".")[0])
+        self._apply_syntax_highlighting(first, min(last, last_text_line))
+        self._edit_anchor_line = None
+
     def _clear_all_tags(self):
         """Limpia todos los tags de resaltado del textbox."""
         self.result_textbox.tag_remove("comment", "1.0", "end")
@@ -197,11 +572,22 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         ]
         
         try:
-            gitignore_text = generate_gitignore_content(
-                selected_techs, get_template_content
-            )
-            self.update_ui_with_result(gitignore_text)
-            self._apply_syntax_highlighting() # Aplica el resaltado
+            gitignore_text = self.generator.generate(selected_techs)
+            switch_text = "Mezcla optimizada"
+            optimize = self.optimize_var.get() == "on" and bool(selected_techs)
+            if optimize:
+                from src.core.pattern_optimizer import optimize_gitignore
+                # Quita reglas duplicadas o cubiertas por otras posteriores;
+                # el resultado ignora exactamente las mismas rutas.
+                optimized = optimize_gitignore(gitignore_text)
+                gitignore_text = optimized.text
+                switch_text = f"Mezcla optimizada (-{optimized.removed_count} reglas)"
+            if self.optimize_switch.cget("text") != switch_text:
+                self.optimize_switch.configure(text=switch_text)
+            # Los parches del generador sólo valen para su salida sin optimizar.
+            edits = None if optimize else self.generator.last_edits
+            self.update_ui_with_result(gitignore_text, edits) # Aplica también el resaltado
+            self._showing_generated_output = not optimize
         except FileNotFoundError as e:
             error_msg = f"Error: {e}. Desmarca la plantilla."
             self.status_label.configure(text=error_msg)
@@ -211,6 +597,7 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
     def show_welcome_message(self):
         """Muestra el mensaje de bienvenida con la fuente de UI."""
         self._clear_all_tags()
+        self._showing_generated_output = False
         self.result_textbox.delete("1.0", "end")
         welcome_text = (
             "¡Bienvenido a GitIgnore Genius! 🚀\n\n"
@@ -256,30 +643,129 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
 
     def process_project_path(self, project_path: str):
         """
-        Función central para analizar un project_path (desde drop o clic)
-        y actualizar la UI.
+        Función central para analizar un project_path (desde drop o clic).
+
+        El análisis se lanza en segundo plano y la ventana sigue respondiendo;
+        si había otro análisis en curso, se cancela.
         """
         self.current_project_path = project_path
         self.status_label.configure(text="")
-        
+
+        if self.analysis_cancel_event is not None:
+            self.analysis_cancel_event.set()
+        self.analysis_id += 1
+        self.analysis_cancel_event = threading.Event()
+
         self.drop_label.configure(text=f"Analizando: {os.path.basename(project_path)}...")
-        self.update_idletasks()
-        
+
+        self.profile_label.configure(text="")
+        self.analysis_executor.submit(
+            self._run_analysis, self.analysis_id, project_path,
+            self.recursive_var.get() == "on", self.profile_var.get() == "on",
+            self.sniff_var.get() == "on", self.analysis_cancel_event
+        )
+        if not self.analysis_polling:
+            self.analysis_polling = True
+            self.after(ANALYSIS_POLL_MS, self._poll_analysis_queue)
+
+    def _run_analysis(self, analysis_id: int, project_path: str, recursive: bool,
+                      profile: bool, sniff_manifests: bool, cancel_event: threading.Event):
+        """Corre en un hilo del pool: no debe tocar widgets, sólo la cola."""
+        from src.infrastructure.detection_profile import DetectionProfile
+        from src.infrastructure.file_analyzer import detect_technologies
+        from src.infrastructure.scan_cache import cached_detect_technologies
+        from src.infrastructure.tree_scanner import scan_tree
         try:
-            all_detected, detected_by_category = detect_technologies(project_path)
-            
-            self.populate_checklist(detected_by_category)
-            self.regenerate_content()
-            
-            if all_detected:
-                self.drop_label.configure(text=f"¡Listo! Detectadas: {', '.join(all_detected)}")
+            profile_summary = None
+            if recursive:
+                result = scan_tree(
+                    project_path,
+                    progress=lambda p: self.analysis_queue.put((analysis_id, "progress", p)),
+                    cancel_event=cancel_event, sniff_manifests=sniff_manifests
+                )
+                if result.truncation_reason == "cancelled":
+                    return
+                outcome = (result.all_detected, result.detected_by_category)
+                if profile:
+                    profile_summary = (
+                        f"Escaneo recursivo: {result.elapsed * 1000:.0f} ms, "
+                        f"{result.directories_scanned} carpetas, {result.stats.syscalls} llamadas al FS "
+                        "(el perfil por regla sólo está disponible sin escaneo recursivo)"
+                    )
+            elif profile:
+                # Perfilar un acierto de caché no mide nada: se escanea siempre.
+                detection_profile = DetectionProfile()
+                outcome = detect_technologies(
+                    project_path, profile=detection_profile, sniff_manifests=sniff_manifests
+                )
+                profile_summary = detection_profile.summary()
             else:
-                 self.drop_label.configure(text="No se detectó tecnología (puedes elegir manualmente)")
-            
+                outcome = cached_detect_technologies(project_path, sniff_manifests=sniff_manifests)
+            self.analysis_queue.put((analysis_id, "done", (*outcome, profile_summary)))
         except Exception as e:
-            self.show_error_message(f"Error inesperado al analizar: {str(e)}")
-        
-        self.after(2500, lambda: self.on_leave_drop_zone(None))
+            self.analysis_queue.put((analysis_id, "error", e))
+
+    def _poll_analysis_queue(self):
+        """Consume los mensajes del análisis en curso desde el hilo de Tk."""
+        latest_progress = None
+        finished = False
+        while True:
+            try:
+                analysis_id, kind, payload = self.analysis_queue.get_nowait()
+            except queue.Empty:
+                break
+            if analysis_id != self.analysis_id:
+                continue  # Mensaje de un análisis cancelado.
+            if kind == "progress":
+                latest_progress = payload
+            elif kind == "done":
+                finished = True
+                self._finish_analysis(*payload)
+            else:
+                finished = True
+                self.show_error_message(f"Error inesperado al analizar: {str(payload)}")
+
+        if latest_progress is not None and not finished:
+            name = os.path.basename(self.current_project_path or "")
+            detected = ", ".join(latest_progress.detected) or "nada aún"
+            self.drop_label.configure(
+                text=f"Analizando: {name}... {latest_progress.directories_scanned} carpetas\n"
+                     f"Detectado: {detected}"
+            )
+
+        if finished:
+            self.analysis_polling = False
+            finished_id = self.analysis_id
+            self.after(2500, lambda: self._reset_drop_zone(finished_id))
+        else:
+            self.after(ANALYSIS_POLL_MS, self._poll_analysis_queue)
+
+    def _finish_analysis(self, all_detected: List[str], detected_by_category: Dict[str, List[str]],
+                         profile_summary: Optional[str] = None):
+        """Aplica el resultado de un análisis terminado a la UI."""
+        self.populate_checklist(detected_by_category)
+        self.regenerate_content()
+        self.profile_label.configure(text=profile_summary or "")
+
+        if all_detected:
+            self.drop_label.configure(text=f"¡Listo! Detectadas: {', '.join(all_detected)}")
+        else:
+            self.drop_label.configure(text="No se detectó tecnología (puedes elegir manualmente)")
+
+    def _reset_drop_zone(self, analysis_id: int):
+        """Restaura la drop zone, salvo que ya haya empezado otro análisis."""
+        if analysis_id == self.analysis_id and not self.analysis_polling:
+            self.on_leave_drop_zone(None)
+
+    def on_close(self):
+        """Cancela cualquier análisis en curso y cierra la ventana."""
+        if self.analysis_cancel_event is not None:
+            self.analysis_cancel_event.set()
+        self.analysis_executor.shutdown(wait=False, cancel_futures=True)
+        for entry in self.checklist_categories.values():
+            if entry["batch_after_id"] is not None:
+                self.after_cancel(entry["batch_after_id"])
+        self.destroy()
 
     def show_error_message(self, message: str):
         """Muestra un error y resetea la UI."""
@@ -288,14 +774,35 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         self.drop_label.configure(text=self.DROP_TEXT_DEFAULT)
         self.populate_checklist(detected_by_category={})
 
-    def update_ui_with_result(self, text: str):
-        """Muestra el contenido generado en el textbox."""
-        self._clear_all_tags()
-        self.result_textbox.delete("1.0", "end")
-        self.result_textbox.insert("1.0", text)
+    def update_ui_with_result(self, text: str, edits: Optional[List[LineEdit]] = None):
+        """
+        Muestra el contenido generado en el textbox.
+
+        Si el textbox muestra la salida anterior del generador (sin ediciones
+        del usuario), se aplican sólo los parches 'edits' de las secciones
+        que cambiaron, sin releer el texto. Si no, se reemplaza todo.
+        """
+        patchable = (edits is not None and self._showing_generated_output
+                     and not self.result_textbox.edit_modified())
+        if patchable:
+            for edit in edits:
+                first_line = edit.line + 1
+                if edit.delete:
+                    self.result_textbox.delete(f"{first_line}.0", f"{first_line + edit.delete}.0")
+                if edit.text:
+                    self.result_textbox.insert(f"{first_line}.0", edit.text)
+                    lines = edit.text.split("\n")[:-1]
+                    self._apply_syntax_highlighting(first_line, first_line + len(lines) - 1, lines)
+        else:
+            self.result_textbox.delete("1.0", "end")
+            self.result_textbox.insert("1.0", text)
+            self._apply_syntax_highlighting(1, None, text.split("\n"))
+        # Las inserciones propias también marcan el texto como modificado.
+        self.result_textbox.edit_modified(False)
 
     def copy_to_clipboard(self):
         """Copia el contenido del textbox (que puede estar editado)."""
+        import pyperclip  # diferido: no hace falta para abrir la ventana
         content = self.result_textbox.get("1.0", "end-1c")
         pyperclip.copy(content)
         self.copy_button.configure(text="✅ Copied!", fg_color="#107C41")
@@ -314,10 +821,11 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         )
         
         if file_path:
+            from src.infrastructure.gitignore_file import write_if_changed
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
+                # Escritura atómica; si el archivo ya es idéntico no se toca.
+                write_if_changed(file_path, content)
+
                 self.save_button.configure(text="✅ Saved!", fg_color="#107C41")
                 self.copy_button.configure(text="Copy to Clipboard", fg_color=self.DROP_HOVER_BG_COLOR)
                 self.after(2000, lambda: self.save_button.configure(text="Save to File...", fg_color=self.DROP_HOVER_BG_COLOR))
@@ -325,5 +833,98 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
             except OSError as e:
                 self.show_error_message(f"Error al guardar: {e}")
 
+    def update_existing_file(self):
+        """
+        Actualiza el .gitignore del proyecto sección por sección: sólo se
+        reescriben las secciones '# Begin: <tec>' que cambiaron y se
+        conservan las reglas escritas a mano.
+        """
+        if not self.current_project_path:
+            self.status_label.configure(text="Primero analiza una carpeta de proyecto.")
+            return
+
+        selected_techs = [
+            tech for tech, var in self.checkbox_vars.items() if var.get() == "on"
+        ]
+        from src.core.pattern_optimizer import optimize_gitignore
+        from src.infrastructure.gitignore_file import update_gitignore_file
+
+        transform = None
+        if self.optimize_var.get() == "on":
+            transform = lambda text: optimize_gitignore(text).text
+        try:
+            result = update_gitignore_file(
+                self.current_project_path, selected_techs, get_template_content, transform
+            )
+        except FileNotFoundError as e:
+            self.status_label.configure(text=f"Error: {e}. Desmarca la plantilla.")
+            return
+        except OSError as e:
+            self.status_label.configure(text=f"Error al actualizar: {e}")
+            return
+
+        merge = result.merge
+        if not result.written:
+            self.status_label.configure(text=".gitignore ya estaba al día: no se modificó.")
+            return
+        changes = [
+            f"{label}: {', '.join(techs)}"
+            for label, techs in (("añadidas", merge.added), ("actualizadas", merge.updated),
+                                 ("quitadas", merge.removed))
+            if techs
+        ]
+        self.status_label.configure(
+            text=f".gitignore actualizado ({'; '.join(changes) or 'formato'})."
+        )
+        self.update_button.configure(text="✅ Updated!", fg_color="#107C41")
+        self.after(2000, lambda: self.update_button.configure(text="Update .gitignore", fg_color=self.DROP_HOVER_BG_COLOR))
+
+    def preview_ignored_files(self):
+        """
+        Muestra qué archivos y carpetas del proyecto ignoraría el contenido
+        actual del textbox. El recorrido corre en segundo plano.
+        """
+        if not self.current_project_path:
+            self.status_label.configure(text="Primero analiza una carpeta de proyecto.")
+            return
+
+        from src.infrastructure.ignore_preview import preview_ignored
+
+        content = self.result_textbox.get("1.0", "end-1c")
+        self.preview_button.configure(text="Calculando...", state="disabled")
+        future = self.analysis_executor.submit(
+            preview_ignored, self.current_project_path, content
+        )
+        self._wait_for_future(future, self._show_ignored_preview)
 
+    def _wait_for_future(self, future, callback):
+        """Llama a callback(future) en el hilo de Tk cuando el future termina."""
+        if future.done():
+            callback(future)
+        else:
+            self.after(ANALYSIS_POLL_MS, lambda: self._wait_for_future(future, callback))
 
+    def _show_ignored_preview(self, future):
+        """Abre una ventana con el resultado de preview_ignored."""
+        self.preview_button.configure(text="Preview Ignored...", state="normal")
+        try:
+            preview = future.result()
+        except Exception as e:
+            self.status_label.configure(text=f"Error en la vista previa: {e}")
+            return
+
+        lines = [f"{path}/" for path in preview.ignored_dirs] + preview.ignored_files
+        summary = (
+            f"# {len(preview.ignored_dirs)} carpetas y {len(preview.ignored_files)} archivos "
+            f"ignorados ({preview.entries_checked} rutas evaluadas)"
+        )
+        if preview.truncated:
+            summary += "\n# Recorrido truncado: el proyecto es demasiado grande."
+
+        window = ctk.CTkToplevel(self)
+        window.title(f"Ignorados en {os.path.basename(self.current_project_path)}")
+        window.geometry("600x500")
+        textbox = ctk.CTkTextbox(window, font=self.font_mono)
+        textbox.pack(fill="both", expand=True, padx=10, pady=10)
+        textbox.insert("1.0", summary + "\n\n" + "\n".join(lines))
+        textbox.configure(state="disabled")
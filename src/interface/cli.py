@@ -0,0 +1,384 @@
+# src/interface/cli.py
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Este módulo NO debe importar customtkinter, tkinterdnd2 ni pyperclip:
+# es la entrada headless para servidores de build y auditorías en lote.
+# Lo propio de watch, bloat y serve (watcher, bloat_finder, http_server) se
+# importa en su _cmd_*: 'analyze' y --help no lo cargan. Por eso sus
+# opciones tienen default=None y el valor por defecto lo pone el módulo.
+from src.infrastructure.detection_profile import DetectionProfile
+from src.infrastructure.file_analyzer import detect_technologies
+from src.infrastructure.gitignore_file import GITIGNORE_NAME, update_gitignore_file, write_if_changed
+from src.infrastructure.scan_cache import cached_detect_technologies
+from src.infrastructure.template_loader import get_template_content
+from src.core.pattern_optimizer import optimize_gitignore
+from src.core.use_cases import generate_gitignore_content
+
+
+def _generate(all_detected: List[str], optimize: bool) -> Tuple[str, Optional[int]]:
+    """Generated .gitignore and, when optimizing, the number of rules removed."""
+    content = generate_gitignore_content(all_detected, get_template_content)
+    if optimize and all_detected:
+        optimized = optimize_gitignore(content)
+        return optimized.text, optimized.removed_count
+    return content, None
+
+
+def _write_gitignore(path: str, content: str) -> bool:
+    """Atomic write; an identical .gitignore is left untouched. True if written."""
+    return write_if_changed(os.path.join(path, GITIGNORE_NAME), content)
+
+
+def _optimized_text(text: str) -> str:
+    return optimize_gitignore(text).text
+
+
+def _analyze_repo(path: str, write: bool, include_content: bool,
+                  use_cache: bool = True, profile: bool = False,
+                  optimize: bool = False, sniff_manifests: bool = False,
+                  update: bool = False) -> dict:
+    """
+    Worker task (runs in a child process): analyzes one repository and
+    optionally writes (or updates in place) its .gitignore. Never raises;
+    errors are reported in the returned record.
+    """
+    record = {"path": path}
+    if not os.path.isdir(path):
+        record["error"] = "NotADirectoryError: no es un directorio"
+        return record
+    try:
+        if profile:
+            # Perfilar un acierto de caché no mide nada: siempre se escanea.
+            detection_profile = DetectionProfile()
+            all_detected, detected_by_category = detect_technologies(
+                path, profile=detection_profile, sniff_manifests=sniff_manifests
+            )
+            record["profile"] = detection_profile.as_dict()
+            record["profile_summary"] = detection_profile.summary()
+        elif use_cache:
+            all_detected, detected_by_category = cached_detect_technologies(
+                path, sniff_manifests=sniff_manifests
+            )
+        else:
+            all_detected, detected_by_category = detect_technologies(
+                path, sniff_manifests=sniff_manifests
+            )
+        record["detected"] = all_detected
+        record["detected_by_category"] = detected_by_category
+
+        if write or include_content:
+            content, rules_removed = _generate(all_detected, optimize)
+            if rules_removed is not None:
+                record["rules_removed"] = rules_removed
+            if include_content:
+                record["content"] = content
+            if write and all_detected:
+                record["written"] = _write_gitignore(path, content)
+        if update and all_detected:
+            result = update_gitignore_file(
+                path, all_detected, get_template_content,
+                _optimized_text if optimize else None
+            )
+            record["written"] = result.written
+            record["sections"] = {
+                "added": result.merge.added, "updated": result.merge.updated,
+                "removed": result.merge.removed, "unchanged": len(result.merge.unchanged),
+            }
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def _iter_paths(paths: List[str], read_stdin: bool) -> Iterator[str]:
+    for path in paths:
+        if path == "-":
+            read_stdin = True
+        else:
+            yield path
+    if read_stdin:
+        for line in sys.stdin:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def analyze_many(
+    paths: Iterable[str],
+    jobs: int = 0,
+    write: bool = False,
+    include_content: bool = False,
+    chunksize: int = 16,
+    use_cache: bool = True,
+    profile: bool = False,
+    optimize: bool = False,
+    sniff_manifests: bool = False,
+    update: bool = False,
+) -> Iterator[dict]:
+    """
+    Analyzes many repositories, fanning out across a process pool.
+
+    Args:
+        paths: Repository paths.
+        jobs: Number of worker processes (0 = one per CPU; 1 = in-process).
+        write: Write the generated .gitignore into each repository.
+        include_content: Include the generated .gitignore in each record.
+        chunksize: Paths sent to a worker per round trip.
+        use_cache: Answer unchanged repositories from the scan cache.
+        profile: Attach per-rule timings and filesystem calls to each record.
+        optimize: Drop duplicate and subsumed rules from the generated content.
+        sniff_manifests: Decide frameworks from the dependencies declared in
+                         each repository's manifests.
+        update: Merge the detected sections into each repository's existing
+                .gitignore, keeping hand-written rules (see merge_gitignore).
+
+    Yields:
+        One result record per path, in input order.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for path in paths:
+            yield _analyze_repo(path, write, include_content, use_cache, profile, optimize,
+                                sniff_manifests, update)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        paths = list(paths)
+        yield from executor.map(
+            _analyze_repo, paths,
+            [write] * len(paths), [include_content] * len(paths),
+            [use_cache] * len(paths), [profile] * len(paths), [optimize] * len(paths),
+            [sniff_manifests] * len(paths), [update] * len(paths),
+            chunksize=chunksize
+        )
+
+
+def _cmd_analyze(args: argparse.Namespace) -> int:
+    paths = list(_iter_paths(args.paths, args.stdin))
+    if not paths:
+        print("No se indicó ninguna ruta (usa argumentos o --stdin).", file=sys.stderr)
+        return 2
+
+    if args.write and args.update:
+        print("--write y --update son excluyentes.", file=sys.stderr)
+        return 2
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    started = time.perf_counter()
+    count = errors = 0
+    try:
+        for record in analyze_many(paths, args.jobs, args.write,
+                                   args.include_content, args.chunksize,
+                                   use_cache=not args.no_cache, profile=args.profile,
+                                   optimize=args.optimize, sniff_manifests=args.sniff,
+                                   update=args.update):
+            count += 1
+            if args.profile and "profile_summary" in record:
+                print(f"{record['path']}: {record['profile_summary']}", file=sys.stderr)
+            errors += "error" in record
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"{count} repos analizados en {elapsed:.2f}s ({rate:.1f} repos/s), "
+          f"{errors} con errores", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _default(value, default):
+    return default if value is None else value
+
+
+def _cmd_watch(args: argparse.Namespace) -> int:
+    from src.infrastructure.watcher import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, ProjectWatcher
+
+    paths = [os.path.abspath(p) for p in _iter_paths(args.paths, args.stdin)]
+    missing = [p for p in paths if not os.path.isdir(p)]
+    if not paths or missing:
+        print(f"Rutas inválidas: {', '.join(missing) or '(ninguna)'}", file=sys.stderr)
+        return 2
+
+    def emit(path: str, all_detected: List[str], detected_by_category: Dict[str, List[str]]):
+        record = {"path": path, "detected": all_detected,
+                  "detected_by_category": detected_by_category, "time": time.time()}
+        try:
+            if args.write and all_detected:
+                content, rules_removed = _generate(all_detected, args.optimize)
+                record["written"] = _write_gitignore(path, content)
+                if rules_removed is not None:
+                    record["rules_removed"] = rules_removed
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    watcher = ProjectWatcher(
+        emit, debounce=_default(args.debounce, DEFAULT_DEBOUNCE),
+        poll_interval=_default(args.interval, DEFAULT_POLL_INTERVAL),
+        use_inotify=False if args.poll else None
+    )
+    for path in paths:
+        emit(path, *watcher.add(path))
+    print(f"Vigilando {len(paths)} proyectos ({watcher.backend}). Ctrl+C para salir.",
+          file=sys.stderr)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return 0
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _cmd_bloat(args: argparse.Namespace) -> int:
+    from src.infrastructure.bloat_finder import DEFAULT_TOP, find_bloat
+
+    paths = list(_iter_paths(args.paths, args.stdin))
+    if not paths:
+        print("No se indicó ninguna ruta (usa argumentos o --stdin).", file=sys.stderr)
+        return 2
+
+    errors = 0
+    for path in paths:
+        try:
+            report = find_bloat(path, top=_default(args.top, DEFAULT_TOP), max_workers=args.workers or None,
+                                time_limit=args.time_limit, sniff_manifests=args.sniff)
+        except Exception as e:
+            errors += 1
+            print(json.dumps({"path": path, "error": f"{type(e).__name__}: {e}"},
+                             ensure_ascii=False), flush=True)
+            continue
+        print(json.dumps(report.as_dict(), ensure_ascii=False), flush=True)
+
+        truncated = " (truncado)" if report.truncated else ""
+        print(f"{path}: {_format_size(report.total_size)} en {report.offender_count} rutas "
+              f"ignorables, {_format_size(report.uncovered_size)} sin cubrir por el .gitignore "
+              f"actual ({report.entries} entradas en {report.elapsed:.2f}s){truncated}",
+              file=sys.stderr)
+        for entry in report.offenders:
+            mark = " " if entry.covered else "!"
+            name = entry.path + ("/" if entry.is_dir else "")
+            print(f"  {mark} {_format_size(entry.size):>10}  {name}  [{entry.rule}]", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from src.interface.http_server import (
+        DEFAULT_HOST, DEFAULT_MAX_CACHED_OUTPUTS, DEFAULT_PORT, GitignoreService, create_server
+    )
+
+    service = GitignoreService(max_cached=_default(args.cache_size, DEFAULT_MAX_CACHED_OUTPUTS))
+    server = create_server(_default(args.host, DEFAULT_HOST), _default(args.port, DEFAULT_PORT),
+                           service, quiet=not args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Sirviendo {len(service.names)} plantillas en http://{host}:{port}/api/<tecnologías> "
+          f"(Ctrl+C para salir)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gitignore-genius",
+        description="GitIgnore Genius sin interfaz gráfica."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser(
+        "analyze", help="Detecta tecnologías en uno o muchos repositorios (JSON lines)."
+    )
+    analyze.add_argument("paths", nargs="*", help="Rutas de repositorios ('-' lee de stdin).")
+    analyze.add_argument("--stdin", action="store_true", help="Lee rutas de stdin, una por línea.")
+    analyze.add_argument("-j", "--jobs", type=int, default=0,
+                         help="Procesos en paralelo (0 = uno por CPU).")
+    analyze.add_argument("-o", "--output", help="Archivo JSON lines de salida (por defecto stdout).")
+    analyze.add_argument("--write", action="store_true",
+                         help="Escribe el .gitignore generado en cada repositorio.")
+    analyze.add_argument("--update", action="store_true",
+                         help="Actualiza el .gitignore existente por secciones, conservando "
+                              "las reglas propias; no reescribe archivos sin cambios.")
+    analyze.add_argument("--include-content", action="store_true",
+                         help="Incluye el .gitignore generado en cada registro.")
+    analyze.add_argument("--no-cache", action="store_true",
+                         help="No usa la caché de análisis (siempre re-escanea).")
+    analyze.add_argument("--profile", action="store_true",
+                         help="Mide tiempo y llamadas al FS por regla y categoría (implica --no-cache).")
+    analyze.add_argument("--optimize", action="store_true",
+                         help="Elimina reglas duplicadas o cubiertas por otras más amplias.")
+    analyze.add_argument("--sniff", action="store_true",
+                         help="Lee package.json, pyproject.toml, etc. para decidir los frameworks.")
+    analyze.add_argument("--chunksize", type=int, default=16, help=argparse.SUPPRESS)
+    analyze.set_defaults(func=_cmd_analyze)
+
+    watch = commands.add_parser(
+        "watch", help="Vigila proyectos y re-detecta al aparecer o desaparecer archivos."
+    )
+    watch.add_argument("paths", nargs="*", help="Rutas de proyectos ('-' lee de stdin).")
+    watch.add_argument("--stdin", action="store_true", help="Lee rutas de stdin, una por línea.")
+    watch.add_argument("--write", action="store_true",
+                       help="Reescribe el .gitignore de cada proyecto cuando cambia su detección.")
+    watch.add_argument("--optimize", action="store_true",
+                       help="Elimina reglas duplicadas o cubiertas por otras más amplias.")
+    watch.add_argument("--debounce", type=float, default=None,
+                       help="Segundos sin eventos antes de procesar un lote.")
+    watch.add_argument("--poll", action="store_true",
+                       help="Usa sondeo en lugar de inotify.")
+    watch.add_argument("--interval", type=float, default=None,
+                       help="Segundos entre sondeos (con --poll o sin inotify).")
+    watch.set_defaults(func=_cmd_watch)
+
+    bloat = commands.add_parser(
+        "bloat", help="Mide el espacio que ocupan las rutas que las plantillas detectadas ignorarían."
+    )
+    bloat.add_argument("paths", nargs="*", help="Rutas de proyectos ('-' lee de stdin).")
+    bloat.add_argument("--stdin", action="store_true", help="Lee rutas de stdin, una por línea.")
+    bloat.add_argument("--top", type=int, default=None,
+                       help="Rutas más pesadas a listar por proyecto.")
+    bloat.add_argument("-w", "--workers", type=int, default=0,
+                       help="Hilos del recorrido (0 = automático).")
+    bloat.add_argument("--time-limit", type=float, default=None,
+                       help="Segundos máximos por proyecto (el informe queda truncado).")
+    bloat.add_argument("--sniff", action="store_true",
+                       help="Lee package.json, pyproject.toml, etc. para decidir los frameworks.")
+    bloat.set_defaults(func=_cmd_bloat)
+
+    serve = commands.add_parser(
+        "serve", help="Servidor HTTP local: GET /api/<tec1,tec2,...> devuelve el .gitignore."
+    )
+    serve.add_argument("--host", default=None)
+    serve.add_argument("--port", type=int, default=None)
+    serve.add_argument("--cache-size", type=int, default=None,
+                       help="Resultados combinados guardados en memoria (LRU).")
+    serve.add_argument("-v", "--verbose", action="store_true", help="Registra cada petición.")
+    serve.set_defaults(func=_cmd_serve)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
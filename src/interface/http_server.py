@@ -0,0 +1,228 @@
+# src/interface/http_server.py
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Igual que cli.py: nada de customtkinter, tkinterdnd2 ni pyperclip aquí.
+from src.core.pattern_optimizer import optimize_gitignore
+from src.core.use_cases import generate_gitignore_content
+from src.infrastructure.template_catalog import build_template_catalog
+from src.infrastructure.template_loader import TemplateRepository, get_template_repository
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_MAX_CACHED_OUTPUTS = 1024
+CACHE_CONTROL = "public, max-age=300"
+# Por debajo de este tamaño no compensa comprimir.
+GZIP_MIN_SIZE = 512
+
+
+class RenderedOutput(NamedTuple):
+    """A combined .gitignore ready to be sent, in plain and gzip form."""
+    body: bytes
+    gzipped: Optional[bytes]
+    etag: str
+
+
+class GitignoreService:
+    """
+    The HTTP-independent part of the server: canonicalizes selections and
+    keeps an LRU of rendered outputs.
+
+    Selections are matched case-insensitively, de-duplicated and put in
+    catalog order, so 'python,node', 'Node,PYTHON' and 'node,python,node'
+    share one cache entry, one ETag and one output. Entries are keyed by
+    the template versions too, so an edited template (in development) is
+    never served stale.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[TemplateRepository] = None,
+        max_cached: int = DEFAULT_MAX_CACHED_OUTPUTS,
+    ):
+        self.repository = repository or get_template_repository()
+        self.max_cached = max_cached
+        self._lock = threading.Lock()
+        self._outputs: "OrderedDict[tuple, RenderedOutput]" = OrderedDict()
+        self.hits = self.misses = 0
+        self.reload()
+
+    def reload(self):
+        """Re-reads the list of templates (new or removed files)."""
+        catalog = build_template_catalog(self.repository)
+        ordered = [tech for techs in catalog.values() for tech in techs]
+        with self._lock:
+            self._order: Dict[str, int] = {tech: i for i, tech in enumerate(ordered)}
+            self._by_lower: Dict[str, str] = {tech.lower(): tech for tech in ordered}
+            self._outputs.clear()
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._by_lower.values(), key=str.lower)
+
+    def canonicalize(self, raw: str) -> Tuple[List[str], List[str]]:
+        """Returns (known technologies in catalog order, unknown names)."""
+        selected, unknown = set(), []
+        for part in raw.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            tech = self._by_lower.get(part.lower())
+            if tech is None:
+                unknown.append(part)
+            else:
+                selected.add(tech)
+        return sorted(selected, key=self._order.__getitem__), unknown
+
+    def render(self, technologies: List[str], optimize: bool = False) -> RenderedOutput:
+        """
+        Rendered output for a canonical selection, from the LRU if possible.
+
+        Raises:
+            FileNotFoundError: If a template disappeared since reload().
+        """
+        versions = tuple(self.repository.version(tech) for tech in technologies)
+        key = (tuple(technologies), versions, optimize)
+        with self._lock:
+            output = self._outputs.get(key)
+            if output is not None:
+                self._outputs.move_to_end(key)
+                self.hits += 1
+                return output
+            self.misses += 1
+
+        # Se renderiza fuera del lock: dos peticiones iguales simultáneas
+        # pueden renderizar dos veces, pero ninguna bloquea a las demás.
+        text = generate_gitignore_content(technologies, self.repository.get)
+        if optimize:
+            text = optimize_gitignore(text).text
+        body = text.encode('utf-8')
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+        output = RenderedOutput(body, gzipped, '"' + hashlib.sha1(body).hexdigest()[:20] + '"')
+
+        with self._lock:
+            self._outputs[key] = output
+            while len(self._outputs) > self.max_cached:
+                self._outputs.popitem(last=False)
+        return output
+
+
+class GitignoreRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET/HEAD /api/<tech,tech,...>[?optimize=1]  -> combined .gitignore
+    GET/HEAD /api/list                          -> available templates
+    """
+    protocol_version = "HTTP/1.1"   # keep-alive: todas las respuestas llevan Content-Length
+    # Cabeceras y cuerpo van en dos escrituras: sin esto, Nagle + ACK
+    # retrasado añaden ~40 ms a cada respuesta keep-alive.
+    disable_nagle_algorithm = True
+    server_version = "GitIgnoreGenius"
+    service: GitignoreService       # asignado por create_server()
+    quiet = True
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body: bool):
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        if not path.startswith("/api/"):
+            self._send_text(404, "Ruta no encontrada. Usa /api/<tecnologías> o /api/list.\n", send_body)
+            return
+        selection = path[len("/api/"):].strip('/')
+
+        if selection.lower() == "list":
+            body = ",".join(self.service.names).encode('utf-8') + b"\n"
+            self._send(200, RenderedOutput(body, None, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'),
+                       send_body)
+            return
+
+        technologies, unknown = self.service.canonicalize(selection)
+        if unknown or not technologies:
+            message = (f"Plantillas desconocidas: {', '.join(unknown)}\n" if unknown
+                       else "No se indicó ninguna plantilla.\n")
+            self._send_text(404, message + "Consulta /api/list.\n", send_body)
+            return
+
+        optimize = parse_qs(url.query).get("optimize", ["0"])[-1].lower() in ("1", "true", "yes")
+        try:
+            output = self.service.render(technologies, optimize)
+        except OSError as e:
+            self._send_text(500, f"Error al leer plantillas: {e}\n", send_body)
+            return
+        self._send(200, output, send_body)
+
+    def _send(self, status: int, output: RenderedOutput, send_body: bool):
+        body, encoding, etag = output.body, None, output.etag
+        if output.gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", ""):
+            # Cada representación tiene su propio ETag fuerte.
+            body, encoding, etag = output.gzipped, "gzip", output.etag[:-1] + '-gz"'
+
+        if self._etag_matches(etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _etag_matches(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        candidates = [tag.strip() for tag in header.split(',')]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    def _send_text(self, status: int, text: str, send_body: bool):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def create_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    service: Optional[GitignoreService] = None,
+    quiet: bool = True,
+) -> ThreadingHTTPServer:
+    """
+    A ThreadingHTTPServer (one thread per connection) bound to host:port.
+    Call serve_forever() on it; port 0 picks a free port.
+    """
+    handler = type("Handler", (GitignoreRequestHandler,), {
+        "service": service or GitignoreService(),
+        "quiet": quiet,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
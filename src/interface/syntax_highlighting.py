@@ -0,0 +1,51 @@
+# src/interface/syntax_highlighting.py
+
+from typing import Dict, List, Optional
+
+# Funciones puras (sin Tk) usadas por App para resaltar el editor: agrupan
+# las líneas contiguas con el mismo tag en un único rango, de modo que cada
+# tag se aplica con una sola llamada. Qué líneas cambiaron lo dice el
+# generador (IncrementalGitignoreGenerator.last_edits).
+
+HIGHLIGHT_TAGS = ("comment", "header")
+
+
+def classify_line(line: str) -> Optional[str]:
+    """Returns the highlight tag of a line ('header', 'comment') or None."""
+    stripped_line = line.strip()
+    if stripped_line.startswith("#===") or stripped_line.startswith("#---"):
+        return "header"
+    if stripped_line.startswith("#"):
+        return "comment"
+    return None
+
+
+def tag_ranges(
+    lines: List[str], first_line: int = 1
+) -> Dict[str, List[str]]:
+    """
+    Groups adjacent lines with the same tag into ranges.
+
+    Args:
+        lines: The lines to classify.
+        first_line: Tk line number (1-based) of lines[0].
+
+    Returns:
+        A mapping tag -> flat list of Tk indices [start1, end1, start2, end2, ...],
+        ready to be passed to a single Text.tag_add call.
+    """
+    ranges: Dict[str, List[str]] = {tag: [] for tag in HIGHLIGHT_TAGS}
+    run_tag: Optional[str] = None
+    run_start = 0
+
+    for offset, line in enumerate(lines):
+        tag = classify_line(line)
+        if tag != run_tag:
+            if run_tag is not None:
+                ranges[run_tag] += [f"{first_line + run_start}.0",
+                                    f"{first_line + offset - 1}.end"]
+            run_tag, run_start = tag, offset
+    if run_tag is not None:
+        ranges[run_tag] += [f"{first_line + run_start}.0",
+                            f"{first_line + len(lines) - 1}.end"]
+    return ranges
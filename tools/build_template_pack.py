@@ -0,0 +1,45 @@
+# tools/build_template_pack.py
+#
+# Genera el paquete de plantillas (src/infrastructure/template_pack.py) que
+# el ejecutable carga al iniciar en lugar de las plantillas sueltas: todas
+# las plantillas más el catálogo por categorías, en un único archivo.
+#
+#     python -m tools.build_template_pack build/templates.pack
+
+import argparse
+import os
+import sys
+
+from src.infrastructure.template_catalog import build_template_catalog
+from src.infrastructure.template_loader import TemplateRepository, get_templates_dir
+from src.infrastructure.template_pack import PACK_NAME, TemplatePack, write_pack
+
+
+def build(output: str, templates_dir: str) -> TemplatePack:
+    # Sin paquete ni caché acotada: se leen los archivos sueltos actuales.
+    repository = TemplateRepository(templates_dir, max_cached=10**6, immutable=True)
+    names = repository.names()
+    templates = {name: (repository.get(name), repository.version(name)) for name in names}
+    write_pack(output, templates, build_template_catalog(repository))
+
+    pack = TemplatePack.open(output)
+    for name in names:
+        if pack.get(name) != templates[name]:
+            raise SystemExit(f"El paquete no coincide con la plantilla {name}")
+    return pack
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el paquete de plantillas.")
+    parser.add_argument('output', nargs='?', default=os.path.join('build', PACK_NAME))
+    parser.add_argument('--templates-dir', default=get_templates_dir())
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    pack = build(args.output, args.templates_dir)
+    print(f"{args.output}: {len(pack.names())} plantillas, {len(pack.catalog)} categorías, "
+          f"{os.path.getsize(args.output)} bytes", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()